@@ -0,0 +1,46 @@
+# coding: utf-8
+"""
+    benchmarks
+    ~~~~~~~~~~
+
+    Microbenchmarks for relief. Each module in this package can be run with
+    ``python -m benchmarks.<module>`` from the root of the repository.
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from __future__ import print_function
+
+import timeit
+
+
+def bench(label, function, number=100000, repeat=3):
+    """
+    Calls `function` `number` times, `repeat` times over and prints the best
+    time per call.
+    """
+    best = min(timeit.repeat(function, number=number, repeat=repeat))
+    print(u"%-50s %12.3f µs" % (label, best / number * 1e6))
+    return best / number
+
+
+def measure_memory(label, function):
+    """
+    Calls `function` once and prints the size of the memory allocated by it,
+    that has not been freed once it returns, including the returned object.
+    """
+    try:
+        import tracemalloc
+    except ImportError: # < 3.4
+        print(u"%-50s %12s" % (label, u"n/a"))
+        return None
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    print(u"%-50s %12.1f KiB" % (label, size / 1024.0))
+    return size
@@ -0,0 +1,34 @@
+# coding: utf-8
+"""
+    benchmarks.attributes
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Compares attribute access on containers with attribute access on instances
+    of a plain class.
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from relief import List, Dict, Integer
+
+from benchmarks import bench
+
+
+class Plain(object):
+    def __init__(self):
+        self._state = None
+
+
+def main():
+    plain = Plain()
+    bench("plain instance._state", lambda: plain._state, number=1000000)
+    for label, element in [
+        ("List", List.of(Integer)([1, 2, 3])),
+        ("Dict", Dict.of(Integer, Integer)({1: 1}))
+    ]:
+        bench("%s._state" % label, lambda: element._state, number=1000000)
+        bench("%s.value" % label, lambda: element.value)
+
+
+if __name__ == "__main__":
+    main()
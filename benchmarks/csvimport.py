@@ -0,0 +1,80 @@
+# coding: utf-8
+"""
+    benchmarks.csvimport
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from __future__ import print_function
+
+import io
+import csv
+import time
+
+from relief import Form, Integer, Unicode, Float
+from relief.validation import GreaterThan, LongerThan
+from relief.csvimport import import_csv
+
+
+Record = Form.of([
+    ("id", Integer),
+    ("name", Unicode.validated_by([LongerThan(0)])),
+    ("email", Unicode),
+    ("age", Integer.validated_by([GreaterThan(0)])),
+    ("score", Float)
+])
+
+ROWS = 100000
+
+
+def make_csv(rows):
+    lines = [u"id,name,email,age,score"]
+    for i in range(rows):
+        lines.append(u"%d,name %d,user%d@example.com,%d,%d.5" % (
+            i, i, i, i % 90 + 1, i % 100
+        ))
+    return u"\r\n".join(lines) + u"\r\n"
+
+
+def dict_reader(content, validate):
+    for row in csv.DictReader(io.StringIO(content)):
+        form = Record(row)
+        if validate:
+            form.validate()
+
+
+def importer(content, validate, reuse):
+    for row in import_csv(
+            Record, io.StringIO(content), validate=validate, reuse=reuse
+        ):
+        pass
+
+
+def report(label, function):
+    start = time.time()
+    function()
+    duration = time.time() - start
+    print(u"%-50s %12.0f rows/s" % (label, ROWS / duration))
+
+
+def main():
+    content = make_csv(ROWS)
+    for validate in [False, True]:
+        suffix = u", validated" if validate else u""
+        report(
+            u"csv.DictReader, Record(row)" + suffix,
+            lambda: dict_reader(content, validate)
+        )
+        report(
+            u"import_csv(reuse=False)" + suffix,
+            lambda: importer(content, validate, False)
+        )
+        report(
+            u"import_csv()" + suffix,
+            lambda: importer(content, validate, True)
+        )
+
+
+if __name__ == "__main__":
+    main()
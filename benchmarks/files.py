@@ -0,0 +1,61 @@
+# coding: utf-8
+"""
+    benchmarks.files
+    ~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from __future__ import print_function
+
+import os
+import re
+import tempfile
+
+from relief import BytesFile
+from relief.schema.files import FileContent
+from relief.validation import ShorterThan, LongerThan, MatchesRegex
+
+from benchmarks import bench
+
+
+def peak_memory(label, function):
+    try:
+        import tracemalloc
+    except ImportError: # < 3.4
+        return
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    print(u"%-50s %12.1f KiB" % (u"peak memory of " + label, peak / 1024.0))
+
+
+def main():
+    fd, path = tempfile.mkstemp()
+    try:
+        with os.fdopen(fd, "wb") as file:
+            for _ in range(64):
+                file.write(b"x" * (1024 * 1024))
+        for label, validator in [
+            ("ShorterThan(1024)", ShorterThan(1024)),
+            ("LongerThan(1024)", LongerThan(1024)),
+            ("MatchesRegex(b'x+$')", MatchesRegex(re.compile(b"x+$")))
+        ]:
+            Validated = BytesFile.validated_by([validator])
+            label = u"validate 64 MiB BytesFile, %s" % label
+            validate = lambda: Validated(FileContent(path)).validate()
+            bench(label, validate, number=1)
+            peak_memory(label, validate)
+        label = u"length and SHA-256 of 64 MiB FileContent"
+        hexdigest = lambda: FileContent(path).hexdigest()
+        bench(label, hexdigest, number=1)
+        peak_memory(label, hexdigest)
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
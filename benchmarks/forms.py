@@ -0,0 +1,76 @@
+# coding: utf-8
+"""
+    benchmarks.forms
+    ~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from __future__ import print_function
+
+from relief import Form, Integer
+from relief.schema.masks import FieldMask
+from relief.validation import ItemsEqual
+
+from benchmarks import bench, measure_memory
+
+
+def wide_form(width):
+    return Form.of(
+        ("field_%d" % i, Integer.using(default=0)) for i in range(width)
+    )
+
+
+def main():
+    WideForm = wide_form(200)
+    full = dict(("field_%d" % i, b"1") for i in range(200))
+    partial = dict(("field_%d" % i, b"1") for i in range(0, 200, 20))
+
+    element = WideForm()
+    bench(
+        "Form(200 fields).set_from_raw(200 keys)",
+        lambda: element.set_from_raw(full),
+        number=1000
+    )
+    bench(
+        "Form(200 fields).unserialize(200 keys)",
+        lambda: element.unserialize(full),
+        number=10000
+    )
+    element = WideForm.using(sparse=True)()
+    bench(
+        "sparse Form(200 fields).set_from_raw(10 keys)",
+        lambda: element.set_from_raw(partial),
+        number=10000
+    )
+
+    WideForm = wide_form(1500)
+    LazyWideForm = WideForm.using(lazy=True)
+    bench("Form(1500 fields)()", WideForm, number=20)
+    bench("lazy Form(1500 fields)()", LazyWideForm, number=20)
+    element = LazyWideForm()
+    bench(
+        "lazy Form(1500 fields) access 10 fields",
+        lambda: [element["field_%d" % i] for i in range(0, 1500, 150)],
+        number=10000
+    )
+    element = WideForm()
+    mask = FieldMask(["field_1", "field_500", "field_1000"])
+    bench("Form(1500 fields).validate()", element.validate, number=100)
+    bench(
+        "Form(1500 fields).validate(only=3 fields)",
+        lambda: element.validate(only=mask),
+        number=10000
+    )
+    validator = ItemsEqual(("a", "field_1"), ("b", "field_2"))
+    bench(
+        "ItemsEqual on Form(1500 fields)",
+        lambda: validator(element, {}),
+        number=10000
+    )
+    measure_memory("Form(1500 fields)()", WideForm)
+    measure_memory("lazy Form(1500 fields)()", LazyWideForm)
+
+
+if __name__ == "__main__":
+    main()
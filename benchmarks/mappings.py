@@ -0,0 +1,39 @@
+# coding: utf-8
+"""
+    benchmarks.mappings
+    ~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from relief import Dict, Unicode, Integer
+
+from benchmarks import bench, measure_memory
+
+
+def main():
+    raw_value = dict((u"key-%d" % i, b"%d" % i) for i in range(100000))
+    for label, element_cls in [
+        ("Dict", Dict.of(Unicode, Integer)),
+        ("compact Dict", Dict.of(Unicode, Integer).using(compact=True))
+    ]:
+        measure_memory(
+            "%s(100000 items)" % label,
+            lambda: element_cls(raw_value)
+        )
+        bench(
+            "%s(100000 items)" % label,
+            lambda: element_cls(raw_value),
+            number=1
+        )
+        element = element_cls(raw_value)
+        bench("%s(100000 items).value" % label, lambda: element.value, number=1)
+        bench(
+            "%s(100000 items).validate()" % label,
+            lambda: element.validate(),
+            number=1
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# coding: utf-8
+"""
+    benchmarks.multipart
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from __future__ import print_function
+
+import time
+
+from relief import Form, Unicode, BytesFile
+from relief.multipart import decode
+
+
+Upload = Form.of({"title": Unicode, "attachment": BytesFile})
+
+CHUNK = b"x" * 1023 + b"\r"
+
+
+class Body(object):
+    """
+    A file object returning a multipart body with an attachment of `size`
+    bytes, without holding it in memory.
+    """
+    def __init__(self, size):
+        self.parts = [
+            b"--boundary\r\n"
+            b'Content-Disposition: form-data; name="title"\r\n\r\n'
+            b"upload\r\n"
+            b"--boundary\r\n"
+            b'Content-Disposition: form-data; name="attachment"; '
+            b'filename="upload.bin"\r\n\r\n'
+        ]
+        self.remaining = size // len(CHUNK)
+        self.end = b"\r\n--boundary--\r\n"
+
+    def read(self, size):
+        if self.parts:
+            return self.parts.pop()
+        if self.remaining:
+            count = min(self.remaining, max(size // len(CHUNK), 1))
+            self.remaining -= count
+            return CHUNK * count
+        end, self.end = self.end, b""
+        return end
+
+
+def main():
+    try:
+        import tracemalloc
+    except ImportError: # < 3.4
+        tracemalloc = None
+    for megabytes in [1, 16, 256]:
+        size = megabytes * 1024 * 1024
+        if tracemalloc is not None:
+            tracemalloc.start()
+        start = time.time()
+        upload = decode(Upload(), Body(size), b"boundary")
+        duration = time.time() - start
+        label = u"decode %d MiB upload" % megabytes
+        print(u"%-50s %12.1f MiB/s" % (label, megabytes / duration))
+        if tracemalloc is not None:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(u"%-50s %12.1f KiB" % (
+                u"peak memory of " + label, peak / 1024.0
+            ))
+        upload.attachment.value.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# coding: utf-8
+"""
+    benchmarks.paths
+    ~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from __future__ import print_function
+
+from relief import Form, List, Integer, path
+
+from benchmarks import bench
+
+
+def main():
+    Item = Form.of([("price", Integer)])
+    Order = Form.of([("order", Form.of([("items", List.of(Item))]))])
+    element = Order({"order": {"items": [{"price": i} for i in range(100)]}})
+
+    bench(
+        "element['order']['items'][3]['price']",
+        lambda: element["order"]["items"][3]["price"]
+    )
+    compiled = path("order.items[3].price", Order)
+    bench("path('order.items[3].price', Order).element()",
+          lambda: compiled.element(element))
+    uncompiled = path("order.items[3].price")
+    bench("path('order.items[3].price').element()",
+          lambda: uncompiled.element(element))
+    wildcard = path("order.items[*].price", Order)
+    bench(
+        "path('order.items[*].price', Order).values() (100)",
+        lambda: list(wildcard.values(element)),
+        number=10000
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# coding: utf-8
+"""
+    benchmarks.pickling
+    ~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from __future__ import print_function
+
+import pickle
+
+from relief import Form, Dict, List, Integer, Unicode
+
+from benchmarks import bench
+
+
+Item = Form.of({"name": Unicode, "price": Integer, "tags": List.of(Unicode)})
+Order = Form.of({
+    "number": Integer,
+    "items": List.of(Item),
+    "attributes": Dict.of(Unicode, Unicode).using(compact=True)
+})
+
+
+def make_order(count):
+    order = Order({
+        "number": 1,
+        "items": [
+            {"name": u"item %d" % i, "price": i, "tags": [u"a", u"b"]}
+            for i in range(count)
+        ],
+        "attributes": dict((u"key %d" % i, u"value") for i in range(count))
+    })
+    order.validate()
+    return order
+
+
+def main():
+    protocol = pickle.HIGHEST_PROTOCOL
+    schema = pickle.dumps(Order, protocol)
+    print(u"%-50s %12d B" % (u"pickled size of Order", len(schema)))
+    bench(
+        "pickle.loads(pickle.dumps(Order))",
+        lambda: pickle.loads(pickle.dumps(Order, protocol)),
+        number=1000
+    )
+    for count in [1, 100]:
+        order = make_order(count)
+        data = pickle.dumps(order, protocol)
+        value = pickle.dumps(order.value, protocol)
+        print(u"%-50s %12d B" % (
+            u"pickled size of Order(%d items)" % count, len(data)
+        ))
+        print(u"%-50s %12d B" % (
+            u"pickled size of Order(%d items).value" % count, len(value)
+        ))
+        bench(
+            "pickle.dumps(Order(%d items))" % count,
+            lambda: pickle.dumps(order, protocol),
+            number=100
+        )
+        bench(
+            "pickle.loads(Order(%d items))" % count,
+            lambda: pickle.loads(data),
+            number=100
+        )
+        bench(
+            "Order(%d items).value, validated" % count,
+            lambda: Order(pickle.loads(value)).validate(),
+            number=100
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# coding: utf-8
+"""
+    benchmarks.scalars
+    ~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import uuid
+import decimal
+
+from relief import (
+    Integer, Float, Complex, Decimal, Unicode, Date, DateTime, Time, UUID,
+    Enum
+)
+from relief.validation import ContainedIn, GreaterThan
+from relief._isoformat import (
+    date_fromisoformat, datetime_fromisoformat, time_fromisoformat
+)
+
+from benchmarks import bench
+
+
+def converted_by(parse):
+    """
+    Returns a :class:`Unicode` validated by a validator that converts the
+    value with `parse`, which is how these values had to be handled before
+    dedicated elements existed.
+    """
+    def validator(element, context):
+        try:
+            element.converted = parse(element.value)
+        except (ValueError, TypeError):
+            return False
+        return True
+    return Unicode.validated_by([validator])
+
+
+def main():
+    for element_cls, native, raw in [
+        (Integer, 12345, b"12345"),
+        (Float, 123.45, b"123.45"),
+        (Complex, 1 + 2j, b"1+2j")
+    ]:
+        element = element_cls()
+        name = element_cls.__name__
+        bench(
+            "%s.set_from_raw(bytes)" % name,
+            lambda: element.set_from_raw(raw)
+        )
+        bench(
+            "%s.set_from_raw(%s)" % (name, type(native).__name__),
+            lambda: element.set_from_raw(native)
+        )
+        bench(
+            "%s.set_from_raw(invalid bytes)" % name,
+            lambda: element.set_from_raw(b"spam")
+        )
+
+    for element_cls, parse, raw in [
+        (Decimal, decimal.Decimal, b"1234.56"),
+        (Date, date_fromisoformat, b"2013-10-19"),
+        (DateTime, datetime_fromisoformat, b"2013-10-19T12:30:15"),
+        (Time, time_fromisoformat, b"12:30:15"),
+        (UUID, uuid.UUID, b"12345678-1234-5678-1234-567812345678")
+    ]:
+        element = element_cls()
+        two_step = converted_by(parse)()
+        name = element_cls.__name__
+        bench(
+            "%s.set_from_raw(bytes) + validate()" % name,
+            lambda: (element.set_from_raw(raw), element.validate())
+        )
+        bench(
+            "Unicode.set_from_raw(bytes) + converting validate()",
+            lambda: (two_step.set_from_raw(raw), two_step.validate())
+        )
+
+    statuses = [u"status-%d" % i for i in range(50)]
+    element = Enum.of(dict((status, status) for status in statuses))()
+    contained_in = Unicode.validated_by([ContainedIn(statuses)])()
+    bench(
+        "Enum.set_from_raw(bytes) + validate()",
+        lambda: (element.set_from_raw(b"status-49"), element.validate())
+    )
+    bench(
+        "Unicode.set_from_raw(bytes) + ContainedIn validate()",
+        lambda: (
+            contained_in.set_from_raw(b"status-49"), contained_in.validate()
+        )
+    )
+
+    Validated = Integer.validated_by([GreaterThan(0)])
+    raw_values = [str(i % 1000).encode("ascii") for i in range(100000)]
+    for label, element in [
+        ("Integer", Validated()),
+        ("memoized Integer", Validated.using(memoize=1000)())
+    ]:
+        def set_and_validate():
+            for raw_value in raw_values:
+                element.set_from_raw(raw_value)
+                element.validate()
+        bench(
+            "%s.set_from_raw(bytes) + validate() (100k)" % label,
+            set_and_validate,
+            number=3
+        )
+
+
+if __name__ == "__main__":
+    main()
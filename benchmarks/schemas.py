@@ -0,0 +1,53 @@
+# coding: utf-8
+"""
+    benchmarks.schemas
+    ~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from __future__ import print_function
+
+from relief import Form, Integer
+from relief.schema.registry import SchemaRegistry
+
+from benchmarks import bench
+
+
+def form_source(count, width):
+    lines = ["from relief import Form, Integer, Unicode, List"]
+    for i in range(count):
+        lines.append("class Form%d(Form):" % i)
+        for j in range(width):
+            lines.append(
+                "    field_%d = Integer.using(default=%d)" % (j, j)
+                if j % 2 else
+                "    field_%d = List.of(Unicode)" % j
+            )
+        lines.append("    def validate_field_0(self, element, context):")
+        lines.append("        return True")
+    return "\n".join(lines)
+
+
+def main():
+    source = form_source(100, 20)
+    code = compile(source, "<schemas>", "exec")
+    # eval() executes code compiled in exec mode on Python 2 and 3 alike.
+    bench(
+        "define 100 Form classes (20 fields)",
+        lambda: eval(code, {}),
+        number=20
+    )
+
+    members = dict(("field_%d" % i, Integer) for i in range(20))
+    registry = SchemaRegistry()
+    bench("Form.of(20 fields)", lambda: Form.of(members), number=1000)
+    bench(
+        "SchemaRegistry.of(Form, 20 fields)",
+        lambda: registry.of(Form, members),
+        number=1000
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# coding: utf-8
+"""
+    benchmarks.sequences
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from relief import List, Unicode
+from relief.validation import (
+    LengthWithinRange, MatchesRegex, ProbablyAnEmailAddress, IsURL
+)
+
+from benchmarks import bench
+
+
+def main():
+    raw_value = [u"tag-%d" % i for i in range(5000)]
+    for label, element_cls in [
+        ("List", List.of(Unicode)),
+        ("indexed List", List.of(Unicode).using(indexed=True))
+    ]:
+        element = element_cls(raw_value)
+        bench(
+            "%s(5000 items): last item in list" % label,
+            lambda: u"tag-4999" in element,
+            number=100
+        )
+        bench(
+            "%s(5000 items).index(last item, 2500)" % label,
+            lambda: element.index(u"tag-4999", 2500),
+            number=100
+        )
+
+    raw_value = [u"user%d@example.com" % i for i in range(100000)]
+    for validator in [
+        LengthWithinRange(1, 30), MatchesRegex(u"[a-z0-9]+@"),
+        ProbablyAnEmailAddress(), IsURL()
+    ]:
+        element = List.of(Unicode.validated_by([validator]))(raw_value)
+        bench(
+            "List(100000 items).validate(), %s" % validator.__class__.__name__,
+            element.validate,
+            number=1
+        )
+
+
+if __name__ == "__main__":
+    main()
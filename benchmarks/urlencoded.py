@@ -0,0 +1,89 @@
+# coding: utf-8
+"""
+    benchmarks.urlencoded
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from relief import Form, List, Integer, Unicode
+from relief.urlencoded import decode, parse
+
+from benchmarks import bench
+
+
+Item = Form.of({"name": Unicode, "price": Integer})
+Order = Form.of({
+    "number": Integer,
+    "customer": Form.of({"name": Unicode, "email": Unicode}),
+    "items": List.of(Item)
+})
+
+Section = Form.of([("field%d" % i, Unicode) for i in range(10)])
+Profile = Form.of([("section%d" % i, Section) for i in range(10)])
+
+
+def unflatten(pairs):
+    """
+    Turns flattened keys into a nested structure, the way it's done by hand.
+    """
+    result = {}
+    for key, value in pairs:
+        target = result
+        steps = []
+        for segment in key.split(u"."):
+            name, _, index = segment.partition(u"-")
+            steps.append(name)
+            if index:
+                steps.append(int(index))
+        for step, next_step in zip(steps, steps[1:]):
+            if isinstance(target, list):
+                while len(target) <= step:
+                    target.append(None)
+                if target[step] is None:
+                    target[step] = [] if isinstance(next_step, int) else {}
+                target = target[step]
+            else:
+                target = target.setdefault(
+                    step, [] if isinstance(next_step, int) else {}
+                )
+        if isinstance(target, list):
+            target.append(value)
+        else:
+            target[steps[-1]] = value
+    return result
+
+
+def main():
+    for count in [1, 100]:
+        data = u"&".join(
+            [u"number=1&customer.name=Spam&customer.email=spam%40example.com"] +
+            [u"items-%d.name=item+%d&items-%d.price=%d" % (i, i, i, i)
+             for i in range(count)]
+        ).encode("ascii")
+        bench(
+            "unflatten, Order.set_from_raw(%d items)" % count,
+            lambda: Order().set_from_raw(unflatten(parse(data))),
+            number=100
+        )
+        bench(
+            "decode(Order(), %d items)" % count,
+            lambda: decode(Order(), data),
+            number=100
+        )
+    data = u"&".join(
+        u"section%d.field%d=spam" % (i, j) for i in range(10) for j in range(10)
+    ).encode("ascii")
+    bench(
+        "unflatten, Profile.set_from_raw(100 fields)",
+        lambda: Profile().set_from_raw(unflatten(parse(data))),
+        number=100
+    )
+    bench(
+        "decode(Profile(), 100 fields)", lambda: decode(Profile(), data),
+        number=100
+    )
+
+
+if __name__ == "__main__":
+    main()
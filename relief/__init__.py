@@ -6,14 +6,7 @@
     :copyright: 2013 by Daniel Neuhäuser
     :license: BSD, see LICENSE.rst for details
 """
-from relief.constants import Unspecified, NotUnserializable
-from relief.schema.core import Element
-from relief.schema.meta import Maybe
-from relief.schema.scalars import (
-    Boolean, Integer, Float, Complex, Unicode, Bytes
-)
-from relief.schema.mappings import Dict, OrderedDict, Form
-from relief.schema.sequences import Tuple, List
+import sys
 
 
 __version__ = "2.1.0"
@@ -24,13 +17,82 @@ __all__ = [
     # constants
     "Unspecified", "NotUnserializable",
     # core
-    "Element",
+    "Element", "ValidationContext",
     # scalars
-    "Boolean", "Integer", "Float", "Complex", "Unicode", "Bytes",
+    "Boolean", "Integer", "Float", "Complex", "Decimal", "Unicode", "Bytes",
+    "Date", "DateTime", "Time", "UUID", "Enum",
+    # files
+    "BytesFile", "UnicodeFile",
     # mappings
     "Dict", "OrderedDict", "Form",
     # sequences
     "Tuple", "List",
     # meta
-    "Maybe"
+    "Maybe",
+    # paths
+    "path"
 ]
+
+
+#: Maps the names in :data:`__all__` to the modules defining them. The modules
+#: are imported when one of their names is first accessed, so that importing
+#: :mod:`relief` is cheap for applications that only use some of them.
+_modules = {
+    # constants
+    "Unspecified": "relief.constants",
+    "NotUnserializable": "relief.constants",
+    # core
+    "Element": "relief.schema.core",
+    "ValidationContext": "relief.schema.core",
+    # scalars
+    "Boolean": "relief.schema.scalars",
+    "Integer": "relief.schema.scalars",
+    "Float": "relief.schema.scalars",
+    "Complex": "relief.schema.scalars",
+    "Decimal": "relief.schema.scalars",
+    "Unicode": "relief.schema.scalars",
+    "Bytes": "relief.schema.scalars",
+    "Date": "relief.schema.scalars",
+    "DateTime": "relief.schema.scalars",
+    "Time": "relief.schema.scalars",
+    "UUID": "relief.schema.scalars",
+    "Enum": "relief.schema.scalars",
+    # files
+    "BytesFile": "relief.schema.files",
+    "UnicodeFile": "relief.schema.files",
+    # mappings
+    "Dict": "relief.schema.mappings",
+    "OrderedDict": "relief.schema.mappings",
+    "Form": "relief.schema.mappings",
+    # sequences
+    "Tuple": "relief.schema.sequences",
+    "List": "relief.schema.sequences",
+    # meta
+    "Maybe": "relief.schema.meta",
+    # paths
+    "path": "relief.schema.paths"
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _modules[name]
+    except KeyError:
+        raise AttributeError(
+            "module %r has no attribute %r" % (__name__, name)
+        )
+    value = getattr(__import__(module_name, None, None, [name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_modules))
+
+
+if sys.version_info < (3, 7):
+    # Modules cannot define __getattr__ before 3.7, so everything is imported
+    # upfront.
+    for _name in __all__:
+        __getattr__(_name)
+    del _name
@@ -7,7 +7,6 @@
     :license: BSD, see LICENSE.rst for details
 """
 import sys
-import inspect
 from functools import wraps
 try:
     from collections import Counter
@@ -17,19 +16,34 @@ try:
     from collections import OrderedDict
 except ImportError: # < 2.7
     from ordereddict import OrderedDict
+try:
+    import copyreg
+except ImportError: # 2.x
+    import copy_reg as copyreg
 
 
 PY2 = sys.version_info[0] == 2
 
 
 if PY2:
+    import inspect
+
     def itervalues(d):
         return d.itervalues()
 
     def iteritems(d):
         return d.iteritems()
 
+    def viewkeys(d):
+        try:
+            return d.viewkeys()
+        except AttributeError: # < 2.7
+            return set(d)
+
     text_type = unicode
+    integer_types = (int, long)
+
+    intern = intern
 
     class Prepareable(type):
         def __new__(cls, name, bases, attributes):
@@ -78,7 +92,13 @@ else:
     def iteritems(d):
         return iter(d.items())
 
+    def viewkeys(d):
+        return d.keys()
+
     text_type = str
+    integer_types = (int, )
+
+    intern = sys.intern
 
     Prepareable = type
 
@@ -106,7 +126,7 @@ def implements_bool(cls):
 
 
 __all__ = [
-    'Counter', 'OrderedDict', 'itervalues', 'iteritems', 'text_type',
-    'Prepareable', 'add_native_itermethods', 'with_metaclass',
-    'implements_bool'
+    'Counter', 'OrderedDict', 'itervalues', 'iteritems', 'viewkeys',
+    'text_type', 'integer_types', 'intern', 'Prepareable',
+    'add_native_itermethods', 'with_metaclass', 'implements_bool', 'copyreg'
 ]
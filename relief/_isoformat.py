@@ -0,0 +1,157 @@
+# coding: utf-8
+"""
+    relief._isoformat
+    ~~~~~~~~~~~~~~~~~
+
+    Parses ISO 8601 strings using the ``fromisoformat()`` methods of
+    :mod:`datetime`, where they exist. The accepted grammar depends on the
+    version of Python:
+
+    - 3.11 and later accept most of ISO 8601, as documented for
+      :meth:`datetime.datetime.fromisoformat`.
+    - 3.7 to 3.10 accept only the formats emitted by ``isoformat()``, with
+      ``Z`` additionally accepted as a UTC offset.
+    - Older versions fall back to :meth:`datetime.datetime.strptime`, which
+      accepts ``YYYY-MM-DD`` dates, ``HH[:MM[:SS[.ffffff]]]`` times and
+      either joined by ``T`` or a space, followed by an optional ``Z`` or
+      ``+HH:MM[:SS]`` UTC offset.
+
+    This is separate from :mod:`relief._compat`, so that :mod:`datetime` is
+    only imported once a temporal element is used.
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import sys
+import datetime
+from functools import wraps
+
+
+try:
+    timezone = datetime.timezone
+except AttributeError: # 2.x
+    class timezone(datetime.tzinfo):
+        def __init__(self, offset):
+            self._offset = offset
+
+        def utcoffset(self, dt):
+            return self._offset
+
+        def dst(self, dt):
+            return None
+
+        def tzname(self, dt):
+            seconds = self._offset.days * 86400 + self._offset.seconds
+            if not seconds:
+                return "UTC"
+            sign = "-" if seconds < 0 else "+"
+            minutes, seconds = divmod(abs(seconds), 60)
+            return "UTC%s%02d:%02d" % (sign, minutes // 60, minutes % 60)
+
+        def __getinitargs__(self):
+            return (self._offset, )
+
+        def __eq__(self, other):
+            if not isinstance(other, timezone):
+                return NotImplemented
+            return self._offset == other._offset
+
+        def __ne__(self, other):
+            return not self == other
+
+        def __hash__(self):
+            return hash(self._offset)
+
+        def __repr__(self):
+            return "%s.%s(%r)" % (
+                self.__module__, self.__class__.__name__, self._offset
+            )
+
+
+def _strptime(string, formats):
+    for format in formats:
+        try:
+            return datetime.datetime.strptime(string, format)
+        except ValueError:
+            pass
+    raise ValueError("invalid isoformat string: %r" % string)
+
+
+def _split_utc_offset(string):
+    # Splits a trailing UTC offset, ``Z`` or ``+HH:MM[:SS]``, off string and
+    # returns the rest and a tzinfo, which is None without an offset.
+    if string.endswith("Z"):
+        return string[:-1], timezone(datetime.timedelta(0))
+    for length in [6, 9]:
+        offset = string[-length:]
+        if len(string) > length and offset[0] in "+-" and offset[3] == ":" \
+                and (length == 6 or offset[6] == ":"):
+            parts = offset[1:].split(":")
+            if not all(len(part) == 2 and part.isdigit() for part in parts):
+                raise ValueError("invalid UTC offset: %r" % offset)
+            seconds = int(parts[0]) * 3600 + int(parts[1]) * 60
+            if length == 9:
+                seconds += int(parts[2])
+            if seconds >= 86400:
+                raise ValueError("invalid UTC offset: %r" % offset)
+            if offset[0] == "-":
+                seconds = -seconds
+            return string[:-length], timezone(
+                datetime.timedelta(seconds=seconds)
+            )
+    return string, None
+
+
+def _strptime_date_fromisoformat(string):
+    return _strptime(string, ["%Y-%m-%d"]).date()
+
+
+def _strptime_datetime_fromisoformat(string):
+    string, tzinfo = _split_utc_offset(string)
+    if tzinfo is not None and len(string) <= 10:
+        raise ValueError("UTC offset without a time: %r" % string)
+    result = _strptime(string, [
+        "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M",
+        "%Y-%m-%dT%H", "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%d %H:%M", "%Y-%m-%d %H", "%Y-%m-%d"
+    ])
+    if tzinfo is not None:
+        result = result.replace(tzinfo=tzinfo)
+    return result
+
+
+def _strptime_time_fromisoformat(string):
+    string, tzinfo = _split_utc_offset(string)
+    result = _strptime(string, ["%H:%M:%S.%f", "%H:%M:%S", "%H:%M", "%H"])
+    return result.time().replace(tzinfo=tzinfo)
+
+
+def _zulu(fromisoformat):
+    # fromisoformat() only accepts Z as a UTC offset since 3.11.
+    @wraps(fromisoformat)
+    def zulu_fromisoformat(string):
+        if string.endswith("Z"):
+            string = string[:-1] + "+00:00"
+        return fromisoformat(string)
+    return zulu_fromisoformat
+
+
+if sys.version_info >= (3, 11):
+    date_fromisoformat = datetime.date.fromisoformat
+    datetime_fromisoformat = datetime.datetime.fromisoformat
+    time_fromisoformat = datetime.time.fromisoformat
+elif hasattr(datetime.date, "fromisoformat"):
+    date_fromisoformat = datetime.date.fromisoformat
+    datetime_fromisoformat = _zulu(datetime.datetime.fromisoformat)
+    time_fromisoformat = _zulu(datetime.time.fromisoformat)
+else: # < 3.7
+    # Approximates the formats accepted by fromisoformat() on 3.7 to 3.10.
+    date_fromisoformat = _strptime_date_fromisoformat
+    datetime_fromisoformat = _strptime_datetime_fromisoformat
+    time_fromisoformat = _strptime_time_fromisoformat
+
+
+__all__ = [
+    'timezone', 'date_fromisoformat', 'datetime_fromisoformat',
+    'time_fromisoformat'
+]
@@ -28,6 +28,10 @@ class Unspecified(object):
     def __repr__(self):
         return self.__class__.__name__
 
+    def __reduce__(self):
+        # Pickled by name, so that unpickling returns the same object.
+        return self.__class__.__name__
+
 
 @as_singleton
 @implements_bool
@@ -46,3 +50,7 @@ class NotUnserializable(object):
 
     def __repr__(self):
         return self.__class__.__name__
+
+    def __reduce__(self):
+        # Pickled by name, so that unpickling returns the same object.
+        return self.__class__.__name__
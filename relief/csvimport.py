@@ -0,0 +1,186 @@
+# coding: utf-8
+"""
+    relief.csvimport
+    ~~~~~~~~~~~~~~~~
+
+    Imports the rows of CSV files into forms, as they are read.
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import csv
+from collections import namedtuple
+
+from relief.schema.core import ValidationContext
+
+
+class Row(namedtuple("Row", ["line", "element", "is_valid", "errors"])):
+    """
+    The result of importing a row: The number of the `line` the row starts
+    on, the form `element` set from it, whether the form `is_valid` and the
+    ``(path, error)`` tuples of the `errors` noted during validation. If the
+    row has not been validated, `is_valid` is `None`.
+
+    .. versionadded:: 2.2.0
+    """
+    __slots__ = ()
+
+
+class CSVImporter(object):
+    """
+    Imports rows, given as lists of fields, of a CSV file with the given
+    `header` into forms of `schema`.
+
+    The columns of the `header` are mapped to the members of `schema` with
+    the same name, once, when the importer is created. `columns` may map the
+    names of columns to other members. Columns that are not mapped to a member
+    are ignored. :exc:`ValueError` is raised if two columns are mapped to the
+    same member or, unless `schema` is :attr:`~relief.Form.sparse`, if there
+    is no column for a member.
+
+    The members of each form are set directly from the fields of a row, the
+    dictionary of the fields only becomes the raw value of the form and is not
+    unserialized again. Unless `reuse` is `False`, one form is created and set
+    from every row, instead of creating a form for each row. The form returned
+    for a row is then the same form for all rows, it has to be used before
+    the next row is imported and must not be kept. Pass ``reuse=False`` to
+    keep the forms of rows, e.g. to collect them in a list.
+
+    If `validate` is `True`, each form is validated with `context`, which
+    defaults to a new :class:`~relief.ValidationContext` used for all rows.
+
+    Rows with fewer fields than the header are imported as if the missing
+    fields were absent from a raw value: The members are set to their default
+    value, if `schema` is sparse, otherwise the form is not unserializable.
+    Fields beyond the header are ignored.
+
+    .. versionadded:: 2.2.0
+    """
+    def __init__(self, schema, header, columns=None, reuse=True,
+                 validate=True, context=None):
+        if columns is None:
+            columns = {}
+        indices = []
+        names = []
+        for index, column in enumerate(header):
+            name = columns.get(column, column)
+            if name not in schema.member_schema:
+                continue
+            if name in names:
+                raise ValueError(
+                    "column %r is mapped to %r, which has a column already" % (
+                        column, name
+                    )
+                )
+            indices.append(index)
+            names.append(name)
+        missing = [name for name in schema.member_schema if name not in names]
+        if missing and not schema.sparse:
+            raise ValueError("no columns for %s" % ", ".join(missing))
+        #: The schema of the forms rows are imported into.
+        self.schema = schema
+        #: The indices of the fields that are imported and the names of the
+        #: members they are imported into.
+        self.indices = indices
+        self.names = names
+        self.validate = validate
+        self.context = ValidationContext() if context is None else context
+        # Fields can be used as they are, if they are in the order of the
+        # members, without other columns in between.
+        self._in_order = indices == list(range(len(indices)))
+        self._width = indices[-1] + 1 if indices else 0
+        self._complete = not missing
+        self._form = self._elements = None
+        if reuse:
+            self._form = schema()
+            self._elements = [self._form[name] for name in names]
+
+    def import_row(self, row, line=None):
+        """
+        Imports the list of fields `row`, which starts on `line`, and returns
+        a :class:`Row`.
+        """
+        form = self._form
+        if form is None:
+            form = self.schema()
+            elements = [form[name] for name in self.names]
+        else:
+            elements = self._elements
+        if len(row) >= self._width:
+            if not self._in_order:
+                row = [row[index] for index in self.indices]
+            for element, field in zip(elements, row):
+                element.set_from_raw(field)
+            form._set_from_decoded_members(
+                dict(zip(self.names, row)), complete=self._complete
+            )
+        else:
+            raw_value = {}
+            # Members of a reused form still have the values of the previous
+            # row, those of a new form that is not sparse have their default.
+            reset = self.schema.sparse or self._form is not None
+            for index, name, element in zip(self.indices, self.names, elements):
+                if index < len(row):
+                    element.set_from_raw(row[index])
+                    raw_value[name] = row[index]
+                elif reset:
+                    element._set_default_value()
+            form._set_from_decoded_members(raw_value)
+        if not self.validate:
+            return Row(line, form, None, [])
+        if self._form is not None:
+            # Errors noted on the elements while validating previous rows
+            # are discarded.
+            for element in elements:
+                if element.errors:
+                    element.errors = []
+            if form.errors:
+                form.errors = []
+        errors = []
+        is_valid = form.validate(self.context, errors)
+        return Row(line, form, is_valid, errors)
+
+
+def import_csv(schema, file, columns=None, reuse=True, validate=True,
+               context=None, dialect="excel", **fmtparams):
+    """
+    Reads the CSV file object `file` with :func:`csv.reader`, whose first
+    row is the header, and returns an iterator over the :class:`Row` results
+    of importing each of the following rows into a form of `schema` with a
+    :class:`CSVImporter`::
+
+        >>> from relief import Form, Integer, Unicode
+        >>> Person = Form.of({"name": Unicode, "age": Integer})
+        >>> with open("people.csv", newline="") as file:
+        ...     for row in import_csv(Person, file):
+        ...         if not row.is_valid:
+        ...             print(row.line, row.errors)
+
+    Rows are read as they are needed, blank lines are skipped.
+    :exc:`ValueError` is raised as soon as the header has been read, if it
+    cannot be mapped to `schema`. `columns`, `reuse`, `validate` and `context`
+    are passed to :class:`CSVImporter`, `dialect` and further keyword
+    arguments to :func:`csv.reader`. As the form is reused for every row by
+    default, each :class:`Row` has to be used before the next one is read.
+
+    .. versionadded:: 2.2.0
+    """
+    reader = csv.reader(file, dialect, **fmtparams)
+    for header in reader:
+        if header:
+            break
+    else:
+        return
+    importer = CSVImporter(
+        schema, header, columns=columns, reuse=reuse, validate=validate,
+        context=context
+    )
+    import_row = importer.import_row
+    line = reader.line_num + 1
+    for row in reader:
+        if row:
+            yield import_row(row, line)
+        line = reader.line_num + 1
+
+
+__all__ = ["CSVImporter", "Row", "import_csv"]
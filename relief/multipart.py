@@ -0,0 +1,313 @@
+# coding: utf-8
+"""
+    relief.multipart
+    ~~~~~~~~~~~~~~~~
+
+    Decodes ``multipart/form-data`` request bodies into forms, as they are
+    received.
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import re
+from tempfile import SpooledTemporaryFile
+
+from relief.schema.meta import Maybe
+from relief.schema.scalars import Unicode
+from relief.schema.sequences import List
+from relief.schema.files import BytesFile
+from relief._compat import text_type, iteritems
+
+
+_PREAMBLE, _DELIMITER, _HEADERS, _BODY, _EPILOGUE = range(5)
+
+_parameter_re = re.compile(r"""
+    ;\s*(?P<name>[^\s=;]+)\s*=\s*
+    (?:"(?P<quoted>(?:[^"\\]|\\.)*)"|(?P<token>[^;]*))
+""", re.VERBOSE)
+
+_escape_re = re.compile(r"\\(.)")
+
+
+def _parse_header(value):
+    """
+    Returns the value of a header such as ``Content-Type``, without its
+    parameters, and a dictionary of the parameters.
+    """
+    index = value.find(u";")
+    if index == -1:
+        return value.strip(), {}
+    parameters = {}
+    for match in _parameter_re.finditer(value, index):
+        if match.group("quoted") is None:
+            parameter = match.group("token").strip()
+        else:
+            parameter = _escape_re.sub(r"\1", match.group("quoted"))
+        parameters[match.group("name").lower()] = parameter
+    return value[:index].strip(), parameters
+
+
+def get_boundary(content_type):
+    """
+    Returns the boundary of a ``multipart/form-data`` body from the value of
+    its ``Content-Type`` header.
+
+    Raises :exc:`ValueError` if `content_type` is not ``multipart/form-data``
+    or has no boundary.
+
+    .. versionadded:: 2.2.0
+    """
+    mimetype, parameters = _parse_header(content_type)
+    if mimetype.lower() != u"multipart/form-data":
+        raise ValueError("%r is not multipart/form-data" % content_type)
+    if not parameters.get("boundary"):
+        raise ValueError("%r has no boundary" % content_type)
+    return parameters["boundary"]
+
+
+def _unwrap(schema):
+    while issubclass(schema, Maybe):
+        schema = schema.member_schema
+    return schema
+
+
+class MultipartDecoder(object):
+    """
+    Decodes a ``multipart/form-data`` body with the given `boundary`, which is
+    passed to :meth:`feed` in chunks of any size, into `form`.
+
+    Each member of `form` is set from its part as soon as the part has been
+    received, members whose schema is a :class:`~relief.List` are set from
+    all parts with their name. Parts whose name is not a member of `form` are
+    skipped. Once the body is complete, :meth:`close` sets `form` itself, as
+    :meth:`~relief.Form.set_from_raw` would have.
+
+    The content of parts for :class:`~relief.BytesFile` and
+    :class:`~relief.UnicodeFile` elements is written to a
+    :class:`~tempfile.SpooledTemporaryFile`, which is kept in memory until it
+    is larger than `spool_size` bytes. Members are set from
+    these files, positioned at the start. Other parts are held in memory and
+    the members are set from byte strings, :exc:`ValueError` is raised if one
+    of them is larger than `max_field_size` bytes. Parts for
+    :class:`~relief.Unicode` elements are decoded with the ``charset`` of their
+    ``Content-Type`` or, if they have none, with `encoding` first.
+
+    :exc:`ValueError` is raised as well, if the body has more than
+    `max_parts` parts, as the parts of lists are kept until the body is
+    complete. The memory used by the decoder is therefore bounded, no matter
+    how large the body is.
+
+    Headers of parts are decoded with `encoding` as well, :exc:`ValueError` is
+    raised if they are larger than `max_header_size` bytes or the body is
+    otherwise malformed.
+
+    .. versionadded:: 2.2.0
+    """
+    def __init__(self, form, boundary, spool_size=1024 * 1024,
+                 max_field_size=1024 * 1024, max_header_size=16 * 1024,
+                 max_parts=1000, encoding="utf-8"):
+        if isinstance(boundary, text_type):
+            boundary = boundary.encode("ascii")
+        if not boundary:
+            raise ValueError("empty boundary")
+        #: The form the body is decoded into.
+        self.form = form
+        self.spool_size = spool_size
+        self.max_field_size = max_field_size
+        self.max_header_size = max_header_size
+        self.max_parts = max_parts
+        self.encoding = encoding
+        self._delimiter = b"\r\n--" + boundary
+        # Bytes that might be the start of a delimiter are kept in the buffer,
+        # until it is known whether they are.
+        self._keep = len(self._delimiter) - 1
+        # The body may start with a delimiter, without a preceding line break.
+        self._buffer = b"\r\n"
+        self._state = _PREAMBLE
+        # The name of the current part and the list or file its content is
+        # written to, None if it is skipped.
+        self._name = None
+        self._sink = None
+        # The encoding the content of the current part is decoded with, None
+        # if it is kept as bytes.
+        self._charset = None
+        self._size = 0
+        self._parts = 0
+        self._raw_value = {}
+        self._lists = {}
+
+    def feed(self, data):
+        """
+        Decodes the next chunk of the body.
+        """
+        if self._state == _EPILOGUE:
+            return
+        self._buffer += data
+        while self._step():
+            pass
+
+    def close(self):
+        """
+        Completes decoding, once all of the body has been passed to
+        :meth:`feed`, and returns :attr:`form`.
+
+        Raises :exc:`ValueError` if the body is incomplete.
+        """
+        if self._state != _EPILOGUE:
+            raise ValueError("multipart body ended before the final delimiter")
+        for name, raw_values in iteritems(self._lists):
+            self.form[name].set_from_raw(raw_values)
+            self._raw_value[name] = raw_values
+        self.form._set_from_decoded_members(self._raw_value)
+        return self.form
+
+    def _step(self):
+        """
+        Decodes as much of the buffer as possible in the current state and
+        returns `True` if the state changed.
+        """
+        buffer = self._buffer
+        if self._state == _BODY or self._state == _PREAMBLE:
+            index = buffer.find(self._delimiter)
+            if index == -1:
+                if len(buffer) > self._keep:
+                    self._write(buffer[:-self._keep])
+                    self._buffer = buffer[-self._keep:]
+                return False
+            self._write(buffer[:index])
+            if self._state == _BODY:
+                self._end_part()
+            self._buffer = buffer[index + len(self._delimiter):]
+            self._state = _DELIMITER
+        elif self._state == _DELIMITER:
+            if len(buffer) < 2:
+                return False
+            if buffer[:2] == b"--":
+                self._buffer = b""
+                self._state = _EPILOGUE
+                return False
+            index = buffer.find(b"\r\n")
+            if index == -1:
+                if len(buffer) > self.max_header_size:
+                    raise ValueError("invalid multipart delimiter")
+                return False
+            # Delimiters may be followed by whitespace.
+            if buffer[:index].strip(b" \t"):
+                raise ValueError("invalid multipart delimiter")
+            self._buffer = buffer[index + 2:]
+            self._state = _HEADERS
+        elif self._state == _HEADERS:
+            if buffer[:2] == b"\r\n":
+                index = 0
+                self._buffer = buffer[2:]
+            else:
+                index = buffer.find(b"\r\n\r\n")
+                if index == -1 or index > self.max_header_size:
+                    if len(buffer) > self.max_header_size:
+                        raise ValueError(
+                            "part headers are larger than max_header_size"
+                        )
+                    return False
+                self._buffer = buffer[index + 4:]
+            self._start_part(buffer[:index])
+            self._state = _BODY
+        else:
+            return False
+        return True
+
+    def _start_part(self, headers):
+        self._parts += 1
+        if self._parts > self.max_parts:
+            raise ValueError("body has more than max_parts parts")
+        try:
+            headers = headers.decode(self.encoding)
+        except UnicodeDecodeError:
+            raise ValueError("part headers are not encoded with %s" % self.encoding)
+        name = None
+        charset = self.encoding
+        for line in headers.split(u"\r\n"):
+            field, _, value = line.partition(u":")
+            field = field.strip().lower()
+            if field == u"content-disposition":
+                name = _parse_header(value)[1].get("name")
+            elif field == u"content-type":
+                charset = _parse_header(value)[1].get("charset", charset)
+        self._name = name
+        self._size = 0
+        self._charset = None
+        if name is None or name not in self.form.member_schema:
+            self._sink = None
+            return
+        schema = _unwrap(self.form.member_schema[name])
+        if issubclass(schema, List):
+            self._lists.setdefault(name, [])
+            schema = _unwrap(schema.member_schema)
+        if issubclass(schema, BytesFile):
+            self._sink = SpooledTemporaryFile(max_size=self.spool_size)
+        else:
+            self._sink = []
+            if issubclass(schema, Unicode):
+                self._charset = charset
+
+    def _write(self, data):
+        if self._sink is None or not data:
+            return
+        if isinstance(self._sink, list):
+            self._size += len(data)
+            if self._size > self.max_field_size:
+                raise ValueError(
+                    "part %r is larger than max_field_size" % self._name
+                )
+            self._sink.append(data)
+        else:
+            self._sink.write(data)
+
+    def _end_part(self):
+        if self._sink is None:
+            return
+        if isinstance(self._sink, list):
+            raw_value = b"".join(self._sink)
+            if self._charset is not None:
+                try:
+                    raw_value = raw_value.decode(self._charset)
+                except (UnicodeDecodeError, LookupError):
+                    # Left to the element, which cannot unserialize it either.
+                    pass
+        else:
+            raw_value = self._sink
+            raw_value.seek(0)
+        self._sink = None
+        if self._name in self._lists:
+            self._lists[self._name].append(raw_value)
+        else:
+            self.form[self._name].set_from_raw(raw_value)
+            self._raw_value[self._name] = raw_value
+
+
+def decode(form, stream, boundary, chunk_size=64 * 1024, **options):
+    """
+    Reads a ``multipart/form-data`` body with the given `boundary` from the
+    binary file object `stream`, in chunks of `chunk_size` bytes, decodes it
+    into `form` with a :class:`MultipartDecoder` and returns `form`::
+
+        >>> from relief import Form, Unicode, BytesFile
+        >>> Upload = Form.of({"title": Unicode, "attachment": BytesFile})
+        >>> upload = decode(
+        ...     Upload(), environ["wsgi.input"],
+        ...     get_boundary(environ["CONTENT_TYPE"])
+        ... )
+
+    Further keyword arguments are passed to :class:`MultipartDecoder`.
+
+    .. versionadded:: 2.2.0
+    """
+    decoder = MultipartDecoder(form, boundary, **options)
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        decoder.feed(chunk)
+    return decoder.close()
+
+
+__all__ = ["MultipartDecoder", "decode", "get_boundary"]
@@ -6,9 +6,304 @@
     :copyright: 2013 by Daniel Neuhäuser
     :license: BSD, see LICENSE.rst for details
 """
+from collections import namedtuple
+from weakref import WeakValueDictionary, WeakKeyDictionary
+
 from relief import Unspecified, NotUnserializable
 from relief.utils import class_cloner, InheritingDictDescriptor
-from relief._compat import iteritems
+from relief._compat import iteritems, itervalues, OrderedDict, copyreg
+
+
+#: Marks :attr:`BaseElement.raw_value` as not yet computed from the value.
+DEFERRED = object()
+
+# Schemas that have been pickled or unpickled in this process, by the
+# description of their recipe, so that unpickling a schema more than once
+# returns the same class.
+_pickled_schemas = WeakValueDictionary()
+_recipe_keys = WeakKeyDictionary()
+
+
+def _reduce_schema(cls):
+    # Imported here, because the registry depends on this module.
+    from relief.schema.registry import _describe_call, _reference
+    if _reference(cls) is not None:
+        return getattr(cls, "__qualname__", cls.__name__)
+    recipe = cls.__dict__.get("_recipe")
+    if recipe is None:
+        raise TypeError(
+            "cannot pickle %r, it can neither be imported nor was it created "
+            "with a class_cloner" % cls
+        )
+    if cls not in _recipe_keys:
+        try:
+            key = _recipe_keys[cls] = _describe_call(*recipe)
+        except TypeError: # cannot be described
+            pass
+        else:
+            _pickled_schemas[key] = cls
+    return _rebuild_schema, recipe
+
+
+def _rebuild_schema(schema, method, args, kwargs):
+    """
+    Returns ``getattr(schema, method)(*args, **kwargs)``, used to unpickle
+    schemas created with a :class:`~relief.utils.class_cloner`.
+    """
+    from relief.schema.registry import _describe_call
+    try:
+        key = _describe_call(schema, method, args, kwargs)
+    except TypeError: # cannot be described
+        return getattr(schema, method)(*args, **kwargs)
+    result = _pickled_schemas.get(key)
+    if result is None:
+        result = _pickled_schemas[key] = getattr(schema, method)(*args, **kwargs)
+        _recipe_keys[result] = key
+    return result
+
+
+def _new_element(cls, base, *args):
+    """
+    Creates an element of `cls` to be unpickled, without calling the
+    constructor of `cls`.
+    """
+    return base.__new__(cls, *args)
+
+
+class _CloneMetaclasses(dict):
+    """
+    Maps metaclasses to the subclasses of them, that are used as the
+    metaclasses of classes created with a :class:`~relief.utils.class_cloner`.
+
+    Pickle looks up reducers for classes by their exact metaclass, so only the
+    classes of those metaclasses are pickled by how they were created, the
+    metaclasses of elements themselves remain unchanged.
+    """
+    def __missing__(self, metaclass):
+        if metaclass in self.values():
+            return metaclass
+        name = metaclass.__name__
+        clone_metaclass = self[metaclass] = type(metaclass)(
+            "Cloned" + name[0].upper() + name[1:], (metaclass, ),
+            {"__module__": __name__}
+        )
+        copyreg.pickle(clone_metaclass, _reduce_schema)
+        return clone_metaclass
+
+
+class MemoInfo(namedtuple("MemoInfo", ["hits", "misses", "maxsize", "size"])):
+    """
+    Statistics about the memo of an element class, as returned by
+    :meth:`BaseElement.memo_info`.
+
+    .. versionadded:: 2.2.0
+    """
+    __slots__ = ()
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of raw values that were found in the memo.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / float(lookups) if lookups else 0.0
+
+
+class _Memo(object):
+    def __init__(self, maxsize, validators):
+        self.maxsize = maxsize
+        self.validators = validators
+        self.pure = all(
+            getattr(validator, "pure", False) for validator in validators
+        )
+        # Maps (type, raw value) to [value, is_valid, errors], is_valid is None
+        # until an element with that raw value has been validated.
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+def prefix_errors(errors, start, key):
+    """
+    Prepends `key` to the paths of the errors recorded in `errors` from index
+    `start` on.
+    """
+    # Paths are only built for members that have errors.
+    for index in range(start, len(errors)):
+        path, error = errors[index]
+        errors[index] = ((key, ) + path, error)
+
+
+class ValidationContext(dict):
+    """
+    The context passed to validators by :meth:`BaseElement.validate`, which
+    creates one if no context is passed. Containers pass the context on to
+    their members, so that all validators in a tree share one context.
+
+    Applications may store whatever validators need in the context, as in a
+    :class:`dict`. Validators that need an expensive lookup, such as loading
+    the set of existing user names, can store the result in a memo, instead
+    of repeating the lookup for every element they validate::
+
+        def validate(self, element, context):
+            names = context.memo(self, set)
+            if not names:
+                names.update(load_user_names())
+            return element.value not in names
+
+    One context can be used to validate any number of elements, memos are
+    kept until :meth:`clear_memos` is called.
+
+    .. versionadded:: 2.2.0
+    """
+    __slots__ = ["_memos"]
+
+    def memo(self, owner, factory=dict):
+        """
+        Returns the memo of `owner`, usually a validator. The memo is created
+        by calling `factory`, the first time it is requested.
+        """
+        try:
+            memos = self._memos
+        except AttributeError:
+            memos = self._memos = {}
+        try:
+            return memos[owner]
+        except KeyError:
+            memo = memos[owner] = factory()
+            return memo
+
+    def clear_memos(self):
+        """
+        Discards all memos.
+        """
+        self._memos = {}
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, dict.__repr__(self))
+
+
+def validate_batch(members, context, errors=None):
+    """
+    Validates the given ``(key, element)`` pairs of elements, that share the
+    same validators, and returns `True` if all of them are valid.
+
+    Validators that define a ``validate_batch(elements, context)`` method
+    are called once with all elements that have not failed a previous
+    validator and return a list of results, other validators are called with
+    each element. Validators note errors on the elements that fail. This
+    allows validators to look up all values at once, for example with a
+    single query, instead of once for every element.
+
+    If the elements are containers, their members are validated first, as
+    usual.
+
+    Containers use this to validate their members, an application that
+    validates many elements of the same schema can use it as well. If a list
+    is passed as `errors`, errors are recorded as by
+    :meth:`BaseElement.validate`, with the key of each element as the path.
+
+    .. versionadded:: 2.2.0
+    """
+    if not members:
+        return True
+    elements = [element for _, element in members]
+    if errors is not None:
+        noted = [len(element.errors) for element in elements]
+    invalid_contents = set()
+    for key, element in members:
+        if not isinstance(element, Container):
+            continue
+        if errors is None:
+            is_valid = element._validate_contents(context, None)
+        else:
+            recorded = len(errors)
+            is_valid = element._validate_contents(context, errors)
+            prefix_errors(errors, recorded, key)
+        if not is_valid:
+            invalid_contents.add(id(element))
+    pending = elements
+    for validator in elements[0].validators:
+        batch = _get_batch(validator)
+        if batch is None:
+            results = [validator(element, context) for element in pending]
+        else:
+            results = batch(pending, context)
+        valid = []
+        for element, result in zip(pending, results):
+            if result:
+                valid.append(element)
+            else:
+                element.is_valid = False
+        pending = valid
+        if not pending:
+            break
+    for element in pending:
+        element.is_valid = id(element) not in invalid_contents
+    if errors is not None:
+        for (key, element), start in zip(members, noted):
+            for error in element.errors[start:]:
+                errors.append(((key, ), error))
+    return len(pending) == len(elements) and not invalid_contents
+
+
+def _defined_by(cls, name):
+    # Returns the class in the mro of cls that defines the attribute name.
+    for base in getattr(cls, "__mro__", (cls, )):
+        if name in base.__dict__:
+            return base
+    return None
+
+
+def _overrides(cls, base, names):
+    # Returns True if any of names is defined by a subclass of base, that cls
+    # inherits from, and is therefore not what base expects it to be.
+    for name in names:
+        defined_by = _defined_by(cls, name)
+        if (defined_by is not None and defined_by is not base and
+            issubclass(defined_by, base)
+           ):
+            return True
+    return False
+
+
+#: Methods validate_batch() of a validator replaces, a validator that
+#: overrides any of them is called with each element.
+_VALIDATOR_METHODS = ["__call__", "validate", "note_error", "is_unusable"]
+
+_batch_validators = WeakKeyDictionary()
+
+
+def _get_batch(validator):
+    """
+    Returns the ``validate_batch`` method of `validator`, or `None` if there
+    is none or a subclass of the class defining it overrides a method it
+    replaces.
+    """
+    batch = getattr(validator, "validate_batch", None)
+    if batch is None:
+        return None
+    cls = validator.__class__
+    try:
+        supported = _batch_validators[cls]
+    except KeyError:
+        supported = _batch_validators[cls] = not _overrides(
+            cls, _defined_by(cls, "validate_batch"), _VALIDATOR_METHODS
+        )
+    return batch if supported else None
+
+
+def _batched(cls):
+    # Memoized elements and elements that override validate() are validated
+    # one at a time.
+    return (
+        not cls.memoize and
+        _defined_by(cls, "validate") in (ValidatedByMixin, Container) and
+        any(
+            _get_batch(validator) is not None
+            for validator in getattr(cls, "validators", ())
+        )
+    )
 
 
 class BaseElement(object):
@@ -17,6 +312,11 @@ class BaseElement(object):
     meta-elements - elements that affect other elements but do not themselves
     describe data.
 
+    Elements and their classes can be pickled, including classes created with
+    :meth:`using` or :meth:`~relief.Container.of` that cannot be imported;
+    those are created again from the schema and the arguments they were
+    created with, when they are unpickled.
+
     .. versionadded:: 2.1.0
        Was previously part of :class:`Element`, is now split up into a separate
        class.
@@ -25,6 +325,27 @@ class BaseElement(object):
     #: used for application-specific information associated with an element.
     properties = InheritingDictDescriptor('properties')
 
+    # The set of changed keys of the form and the key of this element, while
+    # the element is a member of that form and has its default value.
+    _default_of = None
+
+    # Metaclasses of the classes created by class_cloner methods, which are
+    # pickled by how they were created.
+    _clone_metaclasses = _CloneMetaclasses()
+
+    #: The number of raw values for which the results of :meth:`unserialize`
+    #: are memoized, when setting elements of this class with
+    #: :meth:`set_from_raw`. If all validators are marked as pure (see
+    #: :func:`relief.validation.pure`), the results of :meth:`validate` are
+    #: memoized as well. Once the memo is full, the oldest results are
+    #: discarded. This is only supported by scalar elements, whose values are
+    #: immutable.
+    #:
+    #: .. versionadded:: 2.2.0
+    memoize = 0
+
+    _memo_entry = None
+
     @class_cloner
     def using(cls, **kwargs):
         """
@@ -47,6 +368,37 @@ class BaseElement(object):
             properties=InheritingDictDescriptor('properties', **properties)
         )
 
+    @classmethod
+    def memo_info(cls):
+        """
+        Returns a :class:`MemoInfo` with statistics about the memo of this
+        class, see :attr:`memoize`.
+
+        .. versionadded:: 2.2.0
+        """
+        memo = cls._get_memo()
+        return MemoInfo(memo.hits, memo.misses, memo.maxsize, len(memo.entries))
+
+    @classmethod
+    def clear_memo(cls):
+        """
+        Removes all results from the memo of this class and resets the
+        statistics.
+
+        .. versionadded:: 2.2.0
+        """
+        if "_memo" in cls.__dict__:
+            del cls._memo
+
+    @classmethod
+    def _get_memo(cls):
+        # Every class has its own memo, which is not inherited by clones.
+        memo = cls.__dict__.get("_memo")
+        if memo is None:
+            memo = _Memo(cls.memoize, getattr(cls, "validators", []))
+            cls._memo = memo
+        return memo
+
     def __init__(self, value=Unspecified):
         #: Defines the validation state of the element, may be one of the
         #: following values:
@@ -66,25 +418,69 @@ class BaseElement(object):
         #: :data:`~relief.NotUnserializable` if :meth:`unserialize` was unable
         #: to unserialize the value.
         self.value = Unspecified
-
-        #: The concrete value this element represents. May also be
-        #: :data:`~relief.Unspecified` if the value has not been set. This may
-        #: be helpful to look at if :attr:`value` is
-        #: :data:`~relief.NotUnserializable`.
         self.raw_value = Unspecified
 
         self.set_from_raw(value)
 
+    @property
+    def raw_value(self):
+        """
+        The concrete value this element represents. May also be
+        :data:`~relief.Unspecified` if the value has not been set. This may be
+        helpful to look at if :attr:`value` is
+        :data:`~relief.NotUnserializable`.
+
+        If the value has been set with :meth:`set_from_native`, the raw value
+        is computed with :meth:`serialize` the first time it is accessed.
+
+        .. versionchanged:: 2.2.0
+           Is computed lazily after :meth:`set_from_native`.
+        """
+        if self._raw_value is DEFERRED:
+            self._raw_value = self._serialize_value()
+        return self._raw_value
+
+    @raw_value.setter
+    def raw_value(self, raw_value):
+        self._raw_value = raw_value
+        if self._default_of is not None:
+            changed, key = self._default_of
+            changed.add(key)
+            self._default_of = None
+
+    def _serialize_value(self):
+        return self.serialize(self.value)
+
+    def __reduce_ex__(self, protocol):
+        return _new_element, (self.__class__, object), self.__getstate__()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_memo_entry", None)
+        if state.get("_raw_value") is DEFERRED:
+            del state["_raw_value"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if "_raw_value" not in state:
+            self._raw_value = DEFERRED
+
     def set_from_native(self, value):
         """
         Sets :attr:`value` to the given `value` and sets attr:`raw_value` to
         the serialized form of `value`.
 
         .. versionadded:: 1.0.0
+
+        .. versionchanged:: 2.2.0
+           :meth:`serialize` is not called until :attr:`raw_value` is accessed.
         """
         self.value = value
-        self.raw_value = self.serialize(value)
+        self.raw_value = DEFERRED
         self.is_valid = None
+        if self._memo_entry is not None:
+            self._memo_entry = None
 
     def set_from_raw(self, raw_value):
         """
@@ -94,10 +490,39 @@ class BaseElement(object):
         .. versionadded:: 1.0.0
            Was previously named :meth:`set`.
         """
+        if self.memoize:
+            return self._set_from_raw_memoized(raw_value)
         self.raw_value = raw_value
         self.value = self.unserialize(raw_value)
         self.is_valid = None
 
+    def _set_from_raw_memoized(self, raw_value):
+        memo = self._get_memo()
+        key = (raw_value.__class__, raw_value)
+        try:
+            entry = memo.entries.get(key)
+        except TypeError: # unhashable
+            entry = key = None
+        if entry is None:
+            memo.misses += 1
+            entry = [self.unserialize(raw_value), None, None]
+            if key is not None:
+                if len(memo.entries) >= memo.maxsize:
+                    try:
+                        memo.entries.popitem(last=False)
+                    except KeyError: # emptied by another thread
+                        pass
+                memo.entries[key] = entry
+        else:
+            memo.hits += 1
+        self.raw_value = raw_value
+        self.value = entry[0]
+        self.is_valid = None
+        self._memo_entry = entry
+
+    def _set_default_value(self):
+        self.set_from_raw(Unspecified)
+
     def serialize(self, value):
         """
         Tries to serialize the given `value` and returns an object than can be
@@ -115,16 +540,27 @@ class BaseElement(object):
         """
         return raw_value
 
-    def validate(self, context=None):
+    def validate(self, context=None, errors=None):
         """
         Returns `True` when the element is valid and `False` otherwise, and
         sets :attr:`is_valid` to the returned value.
 
         The element will be considered invalid if :attr:`value` is
         :data:`~relief.Unspecified` or :data:`~relief.NotUnserializable`.
+
+        If a list is passed as `errors`, a ``(path, error)`` tuple is appended
+        to it for every error noted during validation. `path` is a tuple of
+        the keys and indices leading from this element to the one the error
+        was noted on.
+
+        `context` is passed to validators, if it is omitted a new
+        :class:`ValidationContext` is created.
+
+        .. versionadded:: 2.2.0
+           The `errors` argument.
         """
         if context is None:
-            context = {}
+            context = ValidationContext()
         self.is_valid = self.value not in [Unspecified, NotUnserializable]
         return self.is_valid
 
@@ -184,26 +620,48 @@ class ValidatedByMixin(object):
         #: validator as an explanation of why the element is invalid.
         self.errors = []
 
-    def validate(self, context=None):
+    def validate(self, context=None, errors=None):
         """
         Returns `True` when the element is valid and `False` otherwise, and
         sets :attr:`is_valid` to the returned value.
 
         If any validators have been defined for this element, each validator is
-        called with the element and the given `context` (which defaults to
-        `None`). If any validator returns `False`, the element will be
-        considered invalid.
+        called with the element and the given `context` (which defaults to a
+        new :class:`ValidationContext`). If any validator returns `False`, the
+        element will be considered invalid.
 
         If no validators have been defined, the element will be considered
         invalid if :attr:`value` is :data:`~relief.Unspecified` or
         :data:`~relief.NotUnserializable`.
+
+        Errors appended to :attr:`errors` by validators are also appended to
+        `errors`, see :meth:`BaseElement.validate`.
         """
         if context is None:
-            context = {}
+            context = ValidationContext()
         if self.validators:
-            self.is_valid = all(
-                validator(self, context) for validator in self.validators
-            )
+            entry = self._memo_entry
+            if entry is not None and entry[1] is not None:
+                self.is_valid = entry[1]
+                new_errors = entry[2]
+                self.errors.extend(new_errors)
+            else:
+                noted = len(self.errors)
+                self.is_valid = all(
+                    validator(self, context) for validator in self.validators
+                )
+                if len(self.errors) > noted:
+                    new_errors = self.errors[noted:]
+                else:
+                    new_errors = ()
+                if entry is not None:
+                    memo = self._get_memo()
+                    if memo.pure and self.validators is memo.validators:
+                        entry[1] = self.is_valid
+                        entry[2] = new_errors
+            if errors is not None:
+                for error in new_errors:
+                    errors.append(((), error))
         else:
             super(ValidatedByMixin, self).validate(context)
         return self.is_valid
@@ -264,12 +722,82 @@ class Container(Element):
         if self.member_schema is None:
             raise TypeError("member_schema is unknown")
 
+    def validate(self, context=None, errors=None, only=None):
+        """
+        Validates the members of the container and the container itself,
+        see :meth:`BaseElement.validate`.
+
+        If `only` is given, only the members selected by it are validated,
+        see :class:`~relief.schema.masks.FieldMask`.
+        """
+        if context is None:
+            context = ValidationContext()
+        if only is not None:
+            return self._validate_only(only, context, errors)
+        is_valid = self._validate_contents(context, errors)
+        is_valid &= super(Container, self).validate(context, errors)
+        self.is_valid = is_valid
+        return is_valid
+
+    def _validate_contents(self, context, errors):
+        """
+        Validates the members of the container and returns `True` if all of
+        them are valid.
+        """
+        return True
+
+    def _validate_member(self, key, element, context, errors):
+        if errors is None:
+            return element.validate(context)
+        recorded = len(errors)
+        is_valid = element.validate(context, errors)
+        prefix_errors(errors, recorded, key)
+        return is_valid
+
+    def _validate_members(self, members, context, errors):
+        """
+        Validates the given ``(key, element)`` pairs and returns `True` if all
+        elements are valid.
+
+        Elements that share validators, such as the elements of a
+        :class:`~relief.List`, are validated together, if one of their
+        validators supports batches, see :func:`validate_batch`.
+        """
+        is_valid = True
+        # Maps classes to the members that are validated together, or None
+        # if their validators don't support batches.
+        batches = OrderedDict()
+        batch_cls = batch = None
+        for key, element in members:
+            cls = element.__class__
+            if cls is not batch_cls:
+                batch_cls = cls
+                try:
+                    batch = batches[cls]
+                except KeyError:
+                    batch = batches[cls] = [] if _batched(cls) else None
+            if batch is not None and "validators" not in element.__dict__:
+                batch.append((key, element))
+            else:
+                is_valid &= self._validate_member(key, element, context, errors)
+        for batch in itervalues(batches):
+            if batch:
+                is_valid &= validate_batch(batch, context, errors)
+        return is_valid
+
+    def _validate_only(self, only, context, errors):
+        # Imported here, because masks depend on all containers.
+        from relief.schema.masks import FieldMask
+        if not isinstance(only, FieldMask):
+            only = FieldMask(only)
+        return only.validate(self, context, errors)
+
     def set_from_native(self, value):
         self._state = None
         if value is Unspecified:
             self._state = Unspecified
         self._set_value_from_native(value)
-        self.raw_value = self.serialize(self.value)
+        self.raw_value = DEFERRED
         self.is_valid = None
 
     def set_from_raw(self, raw_value):
@@ -0,0 +1,398 @@
+# coding: utf-8
+"""
+    relief.schema.files
+    ~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import io
+import sys
+import codecs
+
+from relief import Unspecified, NotUnserializable, Element
+from relief._compat import text_type
+
+
+def _match_file(regex, file, start):
+    """
+    Returns `True` if `regex` matches the content of the binary `file` from
+    `start` on. The content is matched in place, if the file is in memory or
+    can be mapped into memory.
+    """
+    getbuffer = getattr(file, "getbuffer", None)
+    mapped = None
+    if getbuffer is not None:
+        view = getbuffer()
+    else:
+        try:
+            fileno = file.fileno()
+        except (AttributeError, IOError, OSError):
+            fileno = None
+        if fileno is not None:
+            import mmap
+            file.flush()
+            try:
+                mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+            except (ValueError, EnvironmentError): # empty or not mappable
+                fileno = None
+        if fileno is None:
+            position = file.tell()
+            file.seek(start)
+            try:
+                return regex.match(file.read()) is not None
+            finally:
+                file.seek(position)
+        if start == 0:
+            try:
+                return regex.match(mapped) is not None
+            finally:
+                mapped.close()
+        try:
+            view = memoryview(mapped)
+        except TypeError: # mmap has no buffer interface on 2.x
+            try:
+                return regex.match(mapped[start:]) is not None
+            finally:
+                mapped.close()
+    try:
+        content = view[start:]
+        try:
+            return regex.match(content) is not None
+        finally:
+            content.release()
+    finally:
+        view.release()
+        if mapped is not None:
+            mapped.close()
+
+
+class FileContent(object):
+    """
+    Binary content read from `source`, which is either a path or a binary
+    file object, as the value of a :class:`BytesFile`.
+
+    The content is never read into memory as a whole, the file at a path is
+    only opened when :attr:`stream` is first accessed. File objects are read
+    from the position they have when the content is created. File objects that
+    cannot seek, such as sockets, are copied into a
+    :class:`~tempfile.SpooledTemporaryFile` with at most :attr:`spool_size`
+    bytes in memory, so that they can be read more than once.
+
+    The length and the SHA-256 hash of the content are computed together, by
+    reading it once in chunks of :attr:`chunk_size` bytes, and then cached.
+
+    .. versionadded:: 2.2.0
+    """
+    #: The number of bytes read at once.
+    chunk_size = 64 * 1024
+
+    #: The number of bytes of file objects that cannot seek, which are kept
+    #: in memory.
+    spool_size = 1024 * 1024
+
+    def __init__(self, source):
+        #: The path or file object the content is read from.
+        self.source = source
+        self._is_path = not hasattr(source, "read")
+        # Whether the stream is ours to close.
+        self._owns_stream = self._is_path
+        self._stream = None
+        self._length = None
+        self._hexdigests = {}
+        if not self._is_path:
+            try:
+                self._start = source.tell()
+            except (AttributeError, IOError, OSError):
+                self._spool()
+
+    def _spool(self):
+        from tempfile import SpooledTemporaryFile
+        spooled = SpooledTemporaryFile(max_size=self.spool_size)
+        chunk_size = self.chunk_size
+        read = self.source.read
+        for chunk in iter(lambda: read(chunk_size), b""):
+            spooled.write(chunk)
+        spooled.seek(0)
+        self.source = spooled
+        self._start = 0
+        self._owns_stream = True
+
+    def _open(self):
+        if self._is_path:
+            return io.open(self.source, "rb")
+        self.source.seek(self._start)
+        return self.source
+
+    @property
+    def stream(self):
+        """
+        A binary file object positioned at the start of the content, when it
+        is first accessed.
+        """
+        if self._stream is None:
+            self._stream = self._open()
+        return self._stream
+
+    def read(self, size=-1):
+        """
+        Reads and returns up to `size` bytes from :attr:`stream`, or all of
+        them if `size` is negative.
+        """
+        return self.stream.read(size)
+
+    def close(self):
+        """
+        Closes :attr:`stream`, if it has been opened from a path or spooled.
+        File objects the content is read from are left open.
+        """
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+        self._stream = None
+
+    def _raw_chunks(self):
+        chunk_size = self.chunk_size
+        if self._is_path:
+            with io.open(self.source, "rb") as file:
+                for chunk in iter(lambda: file.read(chunk_size), b""):
+                    yield chunk
+            return
+        file = self.source
+        position = file.tell()
+        file.seek(self._start)
+        try:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                yield chunk
+        finally:
+            file.seek(position)
+
+    def chunks(self):
+        """
+        Returns an iterator over the content in chunks of at most
+        :attr:`chunk_size` bytes, independent of the position of
+        :attr:`stream`.
+        """
+        return self._raw_chunks()
+
+    def _counter(self):
+        """
+        Returns a function that is called with each chunk and an empty chunk
+        with `final` set to `True` at the end, which returns its length.
+        """
+        return lambda chunk, final=False: len(chunk)
+
+    def length(self, limit=None):
+        """
+        Returns the length of the content. If `limit` is given, reading stops
+        as soon as the content is known to be longer and a length larger than
+        `limit` is returned.
+        """
+        if self._length is not None:
+            return self._length
+        import hashlib
+        count = self._counter()
+        sha256 = hashlib.sha256()
+        length = 0
+        chunks = self._raw_chunks()
+        try:
+            for chunk in chunks:
+                sha256.update(chunk)
+                length += count(chunk)
+                if limit is not None and length > limit:
+                    return length
+        finally:
+            chunks.close()
+        self._length = length + count(b"", True)
+        self._hexdigests["sha256"] = sha256.hexdigest()
+        return self._length
+
+    def __len__(self):
+        return self.length()
+
+    def hexdigest(self, algorithm="sha256"):
+        """
+        Returns the hex digest of the content with the given hash `algorithm`,
+        any algorithm supported by :func:`hashlib.new` may be used.
+        """
+        try:
+            return self._hexdigests[algorithm]
+        except KeyError:
+            pass
+        if algorithm == "sha256":
+            self.length()
+        else:
+            import hashlib
+            hash = hashlib.new(algorithm)
+            for chunk in self._raw_chunks():
+                hash.update(chunk)
+            self._hexdigests[algorithm] = hash.hexdigest()
+        return self._hexdigests[algorithm]
+
+    def matches(self, regex):
+        """
+        Returns `True` if the compiled `regex` matches the start of the
+        content.
+
+        :mod:`re` cannot continue matching with the next chunk, so the content
+        is matched in place instead: Byte string patterns are matched against
+        the file mapped into memory with :mod:`mmap`, or the buffer of an
+        :class:`io.BytesIO`. Only contents of other file objects are read into
+        memory.
+        """
+        if self._is_path:
+            with io.open(self.source, "rb") as file:
+                return _match_file(regex, file, 0)
+        return _match_file(regex, self.source, self._start)
+
+    def __repr__(self):
+        return "<%s %r>" % (self.__class__.__name__, self.source)
+
+
+class TextContent(FileContent):
+    """
+    Text content read from `source`, encoded with `encoding`, as the value of a
+    :class:`UnicodeFile`.
+
+    Like :class:`FileContent`, except that :attr:`stream`, :meth:`read` and
+    :meth:`chunks` return unicode strings, which are decoded as they are read,
+    and that the length is the number of characters. Hashes are computed from
+    the encoded content. :exc:`UnicodeDecodeError` is raised if the content
+    cannot be decoded.
+
+    .. versionadded:: 2.2.0
+    """
+    def __init__(self, source, encoding):
+        #: The encoding of the content.
+        self.encoding = encoding
+        super(TextContent, self).__init__(source)
+
+    @property
+    def stream(self):
+        """
+        A file object, positioned at the start of the content when it is first
+        accessed, from which unicode strings are read.
+        """
+        if self._stream is None:
+            self._stream = codecs.getreader(self.encoding)(self._open())
+        return self._stream
+
+    def chunks(self):
+        """
+        Returns an iterator over the decoded content, in chunks decoded from
+        at most :attr:`chunk_size` bytes.
+        """
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        for chunk in self._raw_chunks():
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", True)
+        if text:
+            yield text
+
+    def _counter(self):
+        decode = codecs.getincrementaldecoder(self.encoding)().decode
+        return lambda chunk, final=False: len(decode(chunk, final))
+
+    def matches(self, regex):
+        """
+        Returns `True` if the compiled `regex` matches the start of the
+        content.
+
+        Byte string patterns are matched against the encoded content, as
+        described for :meth:`FileContent.matches`. Unicode patterns can only
+        be matched once all of the content has been read and decoded.
+        """
+        if isinstance(regex.pattern, bytes):
+            return super(TextContent, self).matches(regex)
+        return regex.match(u"".join(self.chunks())) is not None
+
+
+class BytesFile(Element):
+    """
+    Represents binary content that is too large to be held in memory, such as
+    an uploaded file, as a :class:`FileContent`.
+
+    Accepts readable binary file objects, paths given as :class:`os.PathLike`
+    objects such as :class:`pathlib.Path` and :class:`FileContent` objects,
+    which may also be created from paths given as strings. Byte strings and
+    unicode strings, that can be encoded using the default encoding, are
+    accepted as well::
+
+        >>> from relief import BytesFile
+        >>> element = BytesFile()
+        >>> element.set_from_raw(b"Hello, World!")
+        >>> element.value.read()
+        b"Hello, World!"
+        >>> len(element.value)
+        13
+
+    :class:`~relief.validation.ShorterThan`,
+    :class:`~relief.validation.LongerThan`,
+    :class:`~relief.validation.LengthWithinRange` and
+    :class:`~relief.validation.MatchesRegex` work with the content, without
+    reading it into memory.
+
+    :func:`relief.multipart.decode` spools the content of parts it sets
+    :class:`BytesFile` elements from to temporary files, instead of reading
+    it into memory.
+
+    .. versionadded:: 2.2.0
+    """
+    native_type = FileContent
+
+    def _get_encoding(self):
+        return sys.getdefaultencoding()
+
+    def _create_content(self, source):
+        return FileContent(source)
+
+    def unserialize(self, raw_value):
+        raw_value = super(BytesFile, self).unserialize(raw_value)
+        if raw_value is Unspecified or raw_value is NotUnserializable:
+            return raw_value
+        if isinstance(raw_value, FileContent):
+            if raw_value.__class__ is self.native_type:
+                return raw_value
+            return NotUnserializable
+        elif isinstance(raw_value, bytes):
+            return self._create_content(io.BytesIO(raw_value))
+        elif isinstance(raw_value, text_type):
+            try:
+                raw_value = raw_value.encode(self._get_encoding())
+            except UnicodeEncodeError:
+                return NotUnserializable
+            return self._create_content(io.BytesIO(raw_value))
+        elif hasattr(raw_value, "read") or hasattr(raw_value, "__fspath__"):
+            return self._create_content(raw_value)
+        return NotUnserializable
+
+
+class UnicodeFile(BytesFile):
+    """
+    Represents text that is too large to be held in memory as a
+    :class:`TextContent`, which is decoded using the default encoding or
+    :attr:`encoding`.
+
+    Accepts the same raw values as :class:`BytesFile`, except that
+    :class:`TextContent` objects are accepted instead of :class:`FileContent`
+    objects. Unicode strings are encoded with the encoding of the element.
+
+    .. versionadded:: 2.2.0
+    """
+    native_type = TextContent
+
+    #: The encoding of the content, can be set with :meth:`using` and
+    #: defaults to the default encoding.
+    encoding = None
+
+    def _get_encoding(self):
+        if self.encoding is None:
+            return sys.getdefaultencoding()
+        return self.encoding
+
+    def _create_content(self, source):
+        return TextContent(source, self._get_encoding())
+
+
+__all__ = ["BytesFile", "UnicodeFile", "FileContent", "TextContent"]
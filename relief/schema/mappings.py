@@ -9,10 +9,11 @@
 import collections
 
 from relief import Unspecified, NotUnserializable, Element, _compat
-from relief.utils import class_cloner
-from relief.schema.core import Container
+from relief.utils import class_cloner, hidden_attribute
+from relief.schema.core import Container, DEFERRED, _new_element
 from relief._compat import (
-    add_native_itermethods, Prepareable, itervalues, iteritems, with_metaclass
+    add_native_itermethods, Prepareable, itervalues, iteritems, viewkeys,
+    with_metaclass
 )
 
 
@@ -23,18 +24,56 @@ class _Value(object):
         self.key = key
         self.value = value
 
+    def __reduce__(self):
+        return _Value, (self.key, self.value)
+
+
+class _FormMethod(object):
+    # Calls a validate_{key} method of a form. Bound methods cannot be pickled
+    # on Python 2, so the name of the method is stored instead.
+    __slots__ = ["form", "name"]
+
+    def __init__(self, form, name):
+        self.form = form
+        self.name = name
+
+    def __call__(self, element, context):
+        return getattr(self.form, self.name)(element, context)
+
+    def __reduce__(self):
+        return _FormMethod, (self.form, self.name)
+
 
 @add_native_itermethods
 class Mapping(Container):
+    #: When `True` keys and values are not stored as elements, instead their
+    #: raw and unserialized values are stored in lists and elements are only
+    #: created when they are accessed. This considerably reduces the memory
+    #: used by large mappings. Only scalar key and value schemas are supported.
+    compact = False
+
     @class_cloner
     def of(cls, key_schema, value_schema):
         cls.member_schema = (key_schema, value_schema)
         return cls
 
+    def __init__(self, value=Unspecified):
+        if self.compact and self.member_schema is not None:
+            for schema in self.member_schema:
+                if (not issubclass(schema, Element) or
+                    issubclass(schema, Container)
+                   ):
+                    raise TypeError(
+                        "compact storage requires scalar schemas, got %r" % schema
+                    )
+        super(Mapping, self).__init__(value)
+
     @property
     def value(self):
         if self._state is not None:
             return self._state
+        if self.compact:
+            return self._columns_value()
         result = self.native_type()
         for key, value in iteritems(self):
             if key.value is NotUnserializable or value.value is NotUnserializable:
@@ -49,9 +88,9 @@ class Mapping(Container):
 
     def _set_value_from_native(self, value):
         super(Mapping, self).clear()
-        if value is not Unspecified:
-            if hasattr(self, "_raw_value"):
-                del self._raw_value
+        if self.compact:
+            self._set_columns(value, None, None)
+        elif value is not Unspecified:
             for key in value:
                 super(Mapping, self).__setitem__(key, _Value(
                     self.member_schema[0](key),
@@ -60,15 +99,134 @@ class Mapping(Container):
 
     def _set_value_from_raw(self, value):
         super(Mapping, self).clear()
-        if value is not Unspecified:
-            if hasattr(self, "_raw_value"):
-                del self._raw_value
+        if self.compact:
+            if value is Unspecified:
+                self._set_columns(value, None, None)
+            else:
+                self._set_columns(
+                    value,
+                    self.member_schema[0]().unserialize,
+                    self.member_schema[1]().unserialize
+                )
+        elif value is not Unspecified:
             for key in value:
                 super(Mapping, self).__setitem__(key, _Value(
                     self.member_schema[0](key),
                     self.member_schema[1](value[key])
                 ))
 
+    def _set_from_decoded_members(self, items):
+        # Like set_from_raw() for decoders, such as relief.urlencoded, that
+        # have already created and set the elements of the values of items,
+        # given as (raw key, element) pairs. Not supported by compact mappings.
+        super(Mapping, self).clear()
+        setitem = super(Mapping, self).__setitem__
+        key_schema = self.member_schema[0]
+        for key, element in items:
+            setitem(key, _Value(key_schema(key), element))
+        self.raw_value = DEFERRED
+        self._state = None
+        self.is_valid = None
+
+    def __reduce_ex__(self, protocol):
+        # Items cannot be restored with __setitem__, which raises TypeError.
+        state = self.__getstate__()
+        # The linked list of the pure Python OrderedDict on 2.x is created
+        # again, when the items are restored.
+        for name in list(state):
+            if name.startswith("_OrderedDict__"):
+                del state[name]
+        return (
+            _new_element,
+            (self.__class__, self.native_type),
+            (state, [
+                # Avoid OrderedDict.items(), which uses __getitem__ on 2.x.
+                (key, dict.__getitem__(self, key))
+                for key in super(Mapping, self).__iter__()
+            ])
+        )
+
+    def __setstate__(self, state):
+        state, items = state
+        super(Mapping, self).__setstate__(state)
+        setitem = super(Mapping, self).__setitem__
+        for key, value in items:
+            setitem(key, value)
+
+    def _set_columns(self, value, unserialize_key, unserialize_value):
+        # Created elements, by index.
+        self._entries = {}
+        self._keys = keys = []
+        self._values = values = []
+        if unserialize_key is None:
+            # Elements are created from the native keys and values.
+            self._raw_keys = self._raw_values = None
+        else:
+            self._raw_keys = raw_keys = []
+            self._raw_values = raw_values = []
+        self._unserializable = False
+        if value is Unspecified:
+            return
+        setitem = super(Mapping, self).__setitem__
+        for index, key in enumerate(value):
+            item = value[key]
+            setitem(key, index)
+            if unserialize_key is None:
+                keys.append(key)
+                values.append(item)
+            else:
+                raw_keys.append(key)
+                raw_values.append(item)
+                key = unserialize_key(key)
+                item = unserialize_value(item)
+                keys.append(key)
+                values.append(item)
+                if key is NotUnserializable or item is NotUnserializable:
+                    self._unserializable = True
+
+    def _columns_value(self):
+        keys, values = self._keys, self._values
+        unserializable = self._unserializable
+        if self._entries:
+            # Created entries may have been changed since, so their values
+            # take precedence over the columns.
+            keys, values = list(keys), list(values)
+            for index, entry in iteritems(self._entries):
+                keys[index] = entry.key.value
+                values[index] = entry.value.value
+            unserializable = (
+                NotUnserializable in keys or NotUnserializable in values
+            )
+        if unserializable:
+            return NotUnserializable
+        return self.native_type(zip(keys, values))
+
+    def _create_entry(self, index):
+        key_schema, value_schema = self.member_schema
+        if self._raw_keys is None:
+            key = key_schema()
+            key.set_from_native(self._keys[index])
+            value = value_schema()
+            value.set_from_native(self._values[index])
+        else:
+            key = key_schema(self._raw_keys[index])
+            value = value_schema(self._raw_values[index])
+        if self.is_valid is not None:
+            # Entries that failed validation have been created during
+            # validation, so any entry we create now has been valid.
+            key.is_valid = value.is_valid = True
+        self._entries[index] = entry = _Value(key, value)
+        return entry
+
+    def _entry(self, key):
+        entry = super(Mapping, self).__getitem__(key)
+        if self.compact:
+            try:
+                return self._entries[entry]
+            except KeyError:
+                return self._create_entry(entry)
+        return entry
+
     def unserialize(self, raw_value):
         raw_value = super(Mapping, self).unserialize(raw_value)
         if raw_value is NotUnserializable:
@@ -79,7 +237,7 @@ class Mapping(Container):
             return NotUnserializable
 
     def __getitem__(self, key):
-        return super(Mapping, self).__getitem__(key).value
+        return self._entry(key).value
 
     def __setitem__(self, key, value):
         raise TypeError(
@@ -94,34 +252,89 @@ class Mapping(Container):
 
     def __iter__(self):
         for key in super(Mapping, self).__iter__():
-            yield super(Mapping, self).__getitem__(key).key
+            yield self._entry(key).key
 
     def keys(self):
         return iter(self)
 
     def values(self):
-        return (self[key.value] for key in self)
+        for key in super(Mapping, self).__iter__():
+            yield self._entry(key).value
 
     def items(self):
-        return ((key, self[key.value]) for key in self)
+        for key in super(Mapping, self).__iter__():
+            entry = self._entry(key)
+            yield entry.key, entry.value
 
-    def validate(self, context=None):
-        if context is None:
-            context = {}
-        self.is_valid = True
+    def _validate_contents(self, context, errors):
+        if self.compact:
+            return self._validate_columns(context, errors)
+        members = []
         for key, value in iteritems(self):
-            self.is_valid &= key.validate(context)
-            self.is_valid &= value.validate(context)
-        self.is_valid &= super(Mapping, self).validate(context)
-        return self.is_valid
-
-    def __getattribute__(self, name):
-        mutating_methods = set([
-            'setdefault', 'popitem', 'pop', 'update', 'clear'
-        ])
-        if name in mutating_methods:
-            raise AttributeError(name)
-        return super(Mapping, self).__getattribute__(name)
+            # Errors of keys and values are both recorded under the key.
+            path = key.value
+            if path is Unspecified or path is NotUnserializable:
+                path = key.raw_value
+            members.append((path, key))
+            members.append((path, value))
+        return self._validate_members(members, context, errors)
+
+    def _validate_entry(self, key, value, context, errors):
+        if errors is None:
+            is_valid = key.validate(context)
+            is_valid &= value.validate(context)
+            return is_valid
+        # Errors of keys and values are both recorded under the key.
+        path = key.value
+        if path is Unspecified or path is NotUnserializable:
+            path = key.raw_value
+        is_valid = self._validate_member(path, key, context, errors)
+        is_valid &= self._validate_member(path, value, context, errors)
+        return is_valid
+
+    def _validate_columns(self, context, errors):
+        # Entries that have not been created yet are validated using a single
+        # pair of elements, only entries that turn out to be invalid are
+        # created, so that their errors are kept.
+        key_element = self.member_schema[0]()
+        value_element = self.member_schema[1]()
+        entries = self._entries
+        if self._raw_keys is None:
+            set_key = key_element.set_from_native
+            set_value = value_element.set_from_native
+            keys, values = self._keys, self._values
+        else:
+            set_key = key_element.set_from_raw
+            set_value = value_element.set_from_raw
+            keys, values = self._raw_keys, self._raw_values
+        is_valid = True
+        for index in range(len(keys)):
+            if index in entries:
+                entry = entries[index]
+                entry_is_valid = self._validate_entry(
+                    entry.key, entry.value, context, errors
+                )
+            else:
+                set_key(keys[index])
+                set_value(values[index])
+                del key_element.errors[:]
+                del value_element.errors[:]
+                entry_is_valid = key_element.validate(context)
+                entry_is_valid &= value_element.validate(context)
+                if not entry_is_valid:
+                    self.is_valid = None
+                    entry = self._create_entry(index)
+                    self._validate_entry(
+                        entry.key, entry.value, context, errors
+                    )
+            is_valid &= entry_is_valid
+        return is_valid
+
+    setdefault = hidden_attribute('setdefault')
+    popitem = hidden_attribute('popitem')
+    pop = hidden_attribute('pop')
+    update = hidden_attribute('update')
+    clear = hidden_attribute('clear')
 
 
 class Dict(Mapping, dict):
@@ -150,6 +363,16 @@ class Dict(Mapping, dict):
     operations you can perform on a :class:`dict` you can also perform on a
     :class:`Dict`. Any operation that return objects stored within the
     dictionary will return the element not the value.
+
+    Large dictionaries whose keys and values are scalars can be stored
+    compactly, creating elements only when they are accessed:
+
+    .. doctest::
+
+       >>> CompactDict = UnicodeIntegerDict.using(compact=True)
+
+    .. versionadded:: 2.2.0
+       Added :attr:`compact`.
     """
     native_type = dict
 
@@ -171,9 +394,29 @@ class OrderedDict(Mapping, _compat.OrderedDict):
             _compat.OrderedDict.__init__(self)
         Mapping.__init__(self, value=value)
 
+    def __setstate__(self, state):
+        if hasattr(collections, 'OrderedDict'):
+            _compat.OrderedDict.__init__(self)
+        Mapping.__setstate__(self, state)
+
     def __reversed__(self):
         for key in super(OrderedDict, self).__reversed__():
-            yield super(_compat.OrderedDict, self).__getitem__(key).key
+            yield self._entry(key).key
+
+
+class _Member(object):
+    """
+    Replaces the schema of a member in the class, in order to create the
+    element of that member on first access.
+    """
+    def __init__(self, name, schema):
+        self.name = name
+        self.schema = schema
+
+    def __get__(self, instance, cls):
+        if instance is None:
+            return self.schema
+        return instance[self.name]
 
 
 class FormMeta(collections.Mapping.__class__, with_metaclass(Prepareable, type)):
@@ -181,9 +424,24 @@ class FormMeta(collections.Mapping.__class__, with_metaclass(Prepareable, type))
         member_schema = attributes["member_schema"] = _compat.OrderedDict()
         for base in reversed(bases):
             member_schema.update(getattr(base, "member_schema", {}) or {})
-        for name, attribute in iteritems(attributes):
+        for name, attribute in list(iteritems(attributes)):
             if isinstance(attribute, type) and issubclass(attribute, Element):
                 member_schema[name] = attribute
+                attributes[name] = _Member(name, attribute)
+        # Forms keep the names of their validation methods, so only the
+        # namespace of the new class and bases that are not forms have to be
+        # searched for them.
+        validate_methods = [
+            name for name in attributes if name.startswith("validate_")
+        ]
+        for base in bases:
+            inherited = getattr(base, "_validate_methods", None)
+            if inherited is None:
+                inherited = [
+                    name for name in dir(base) if name.startswith("validate_")
+                ]
+            validate_methods.extend(inherited)
+        attributes["_validate_methods"] = sorted(set(validate_methods))
         return super(FormMeta, cls).__new__(cls, cls_name, bases, attributes)
 
     def __prepare__(name, bases, **kwargs):
@@ -250,11 +508,46 @@ class Form(with_metaclass(FormMeta, collections.Mapping, Container)):
                 # Perform validation on `foo` value.
                 ...
 
+    By default a raw value has to contain exactly the keys of the form. If
+    :attr:`sparse` is `True`, keys may be omitted and the corresponding
+    elements are set to their default value instead:
+
+    .. doctest::
+
+       >>> SparseSomething = Something.using(sparse=True)
+       >>> element = SparseSomething({"foo": 1})
+       >>> element["bar"].value
+       Unspecified
+
     .. versionadded:: 0.2
        Added the ability to validate values with `validate_{key}` methods.
+
+    Forms with a lot of keys, of which usually only some are accessed, can be
+    made :attr:`lazy`. The elements of those forms are only created once they
+    are accessed.
+
+    .. versionadded:: 2.2.0
+       Added :attr:`sparse` and :attr:`lazy`.
     """
     native_type = dict
 
+    #: When `True` raw values may contain only some of the keys defined by the
+    #: form, elements whose keys are missing are set to their default value.
+    #: Only the elements that are present, and the ones that were present in
+    #: the previously set value, are touched when a value is set.
+    sparse = False
+
+    #: When `True` elements are created when they are first accessed as an
+    #: attribute, by key or during iteration, instead of when the form is
+    #: created. Accessing :attr:`value` or calling :meth:`validate` creates
+    #: all elements.
+    lazy = False
+
+    # True while a form without a default value is created, the elements
+    # created by __new__ have been set to their default value already and are
+    # not set again.
+    _fresh = False
+
     @class_cloner
     def of(cls, schema):
         cls.member_schema = _compat.OrderedDict(schema)
@@ -262,21 +555,54 @@ class Form(with_metaclass(FormMeta, collections.Mapping, Container)):
 
     def __new__(cls, *args, **kwargs):
         self = super(Form, cls).__new__(cls)
-        for attribute_name in dir(self):
-            if not attribute_name.startswith('validate_'):
-                continue
-            attribute = getattr(self, attribute_name)
-            member_name = attribute_name[len('validate_'):]
-            member = self.member_schema[member_name]
-            self.member_schema[member_name] = member.validated_by([attribute])
-
-        self._elements = _compat.OrderedDict()
-        for name, element_cls in iteritems(self.member_schema):
-            self._elements[name] = element = element_cls()
-            setattr(self, name, element)
-
+        if cls._validate_methods:
+            self.member_schema = _compat.OrderedDict(cls.member_schema)
+            for attribute_name in cls._validate_methods:
+                member_name = attribute_name[len('validate_'):]
+                member = self.member_schema[member_name]
+                self.member_schema[member_name] = member.validated_by(
+                    [_FormMethod(self, attribute_name)]
+                )
+
+        self._elements = {}
+        # The method called with Unspecified on elements when they are created,
+        # None if they should keep their default value.
+        self._pending = None
+        # The keys of elements that may not have their default value. Elements
+        # that have their default value add their key, once their raw value is
+        # set, even if they are set directly instead of through the form.
+        self._changed = set()
+        if not self.lazy:
+            for name in self.member_schema:
+                self._create_element(name)
+        self._fresh = (
+            cls.default is Unspecified and cls.default_factory is Unspecified
+        )
         return self
 
+    def __init__(self, value=Unspecified):
+        super(Form, self).__init__(value)
+        self._fresh = False
+
+    def _create_element(self, key):
+        element = self.member_schema[key]()
+        if self._pending is not None:
+            getattr(element, self._pending)(Unspecified)
+            self._changed.add(key)
+        else:
+            self._mark_default(key, element)
+        self._elements[key] = self.__dict__[key] = element
+        return element
+
+    def _mark_default(self, key, element):
+        # The members of containers may be changed without setting the raw
+        # value of the container, so those are always considered changed.
+        if isinstance(element, Container):
+            self._changed.add(key)
+        else:
+            self._changed.discard(key)
+            element._default_of = (self._changed, key)
+
     def _set_default_value(self):
         if self.default is not Unspecified:
             self.set_from_native(self.default)
@@ -284,24 +610,48 @@ class Form(with_metaclass(FormMeta, collections.Mapping, Container)):
             self.set_from_native(self.default_factory())
         else:
             self._state = None
-            for key, value in iteritems(self):
-                value._set_default_value()
+            if not self._fresh:
+                for key, element in iteritems(self._elements):
+                    element._set_default_value()
+                    self._mark_default(key, element)
+            self._pending = None
+
+    def _set_absent_to_default(self, present):
+        for key in [key for key in self._changed if key not in present]:
+            element = self._elements[key]
+            element._set_default_value()
+            self._mark_default(key, element)
+        self._pending = None
 
     def __getitem__(self, key):
-        return self._elements[key]
+        try:
+            return self._elements[key]
+        except KeyError:
+            return self._create_element(key)
+
+    def __getattr__(self, name):
+        # Members of forms created with of() are not class attributes.
+        if name in self.member_schema:
+            return self[name]
+        raise AttributeError(name)
+
+    def __contains__(self, key):
+        return key in self.member_schema
 
     def __len__(self):
-        return len(self._elements)
+        return len(self.member_schema)
 
     def __iter__(self):
-        return iter(self._elements)
+        return iter(self.member_schema)
 
     @property
     def value(self):
         if self._state is not None:
             return self._state
         result = _compat.OrderedDict()
-        for key, element in iteritems(self):
+        # Members may shadow methods such as items(), so they are avoided.
+        for key in self.member_schema:
+            element = self[key]
             if element.value is Unspecified:
                 return NotUnserializable
             result[key] = element.value
@@ -314,19 +664,50 @@ class Form(with_metaclass(FormMeta, collections.Mapping, Container)):
 
     def _set_value_from_native(self, value):
         if value is Unspecified:
-            for element in itervalues(self):
-                element.set_from_native(value)
+            if not self._fresh:
+                for element in itervalues(self._elements):
+                    element.set_from_native(value)
+            self._pending = 'set_from_native'
         else:
-            for key, value in iteritems(value):
-                self[key].set_from_native(value)
+            for key, member_value in iteritems(value):
+                self[key].set_from_native(member_value)
+            if self.sparse:
+                self._set_absent_to_default(value)
 
     def _set_value_from_raw(self, value):
         if value is Unspecified:
-            for element in itervalues(self):
-                element.set_from_raw(value)
+            if not self._fresh:
+                for element in itervalues(self._elements):
+                    element.set_from_raw(value)
+            self._pending = 'set_from_raw'
         else:
-            for key, value in iteritems(value):
-                self[key].set_from_raw(value)
+            for key, member_value in iteritems(value):
+                self[key].set_from_raw(member_value)
+            if self.sparse:
+                self._set_absent_to_default(value)
+
+    def _set_from_decoded_members(self, raw_value, complete=False,
+                                  present=None):
+        # Completes set_from_raw() for decoders, such as relief.multipart,
+        # that have already set the members in raw_value while decoding it.
+        # Members missing from raw_value are treated as by set_from_raw().
+        # If complete is True, raw_value is known to have all keys and is not
+        # checked again, as relief.csvimport does for every row. Decoders
+        # that do not build a raw value, such as relief.urlencoded, pass
+        # DEFERRED and the names of the members they have set as present.
+        self.raw_value = raw_value
+        self.is_valid = None
+        if present is None:
+            present = raw_value
+            if not complete and self.unserialize(raw_value) is NotUnserializable:
+                self._state = NotUnserializable
+                return
+        elif not self.sparse and len(present) != len(self.member_schema):
+            self._state = NotUnserializable
+            return
+        self._state = None
+        if self.sparse:
+            self._set_absent_to_default(present)
 
     def unserialize(self, raw_value):
         raw_value = super(Form, self).unserialize(raw_value)
@@ -337,15 +718,15 @@ class Form(with_metaclass(FormMeta, collections.Mapping, Container)):
                 raw_value = dict(raw_value)
             except (TypeError, ValueError):
                 return NotUnserializable
-        if set(raw_value) != set(self.member_schema):
+        if self.sparse:
+            if not viewkeys(raw_value) <= viewkeys(self.member_schema):
+                return NotUnserializable
+        elif viewkeys(raw_value) != viewkeys(self.member_schema):
             return NotUnserializable
         return raw_value
 
-    def validate(self, context=None):
-        if context is None:
-            context = {}
-        self.is_valid = True
-        for element in itervalues(self):
-            self.is_valid &= element.validate(context=context)
-        self.is_valid &= super(Form, self).validate(context=context)
-        return self.is_valid
+    def _validate_contents(self, context, errors):
+        # Members may shadow methods such as items(), so they are avoided.
+        return self._validate_members(
+            [(key, self[key]) for key in self.member_schema], context, errors
+        )
@@ -0,0 +1,159 @@
+# coding: utf-8
+"""
+    relief.schema.masks
+    ~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from relief import Unspecified
+from relief.schema.core import ValidationContext, prefix_errors, DEFERRED
+from relief.schema.meta import Maybe
+from relief.schema.mappings import Mapping, Form
+from relief.schema.sequences import Sequence
+from relief.schema.paths import WILDCARD, _parse
+from relief._compat import iteritems
+
+
+def _members(element, key):
+    """
+    Returns an iterable of ``(key, member)`` pairs of `element` matching the
+    given `key`.
+    """
+    if key is not WILDCARD:
+        return [(key, element[key])]
+    elif isinstance(element, Form):
+        return [(key, element[key]) for key in element.member_schema]
+    elif isinstance(element, Mapping):
+        return [(key.value, value) for key, value in element.items()]
+    elif isinstance(element, Sequence):
+        return enumerate(element)
+    raise TypeError("%r has no members" % element)
+
+
+def _raw_members(raw_value, key):
+    if key is not WILDCARD:
+        try:
+            return [(key, raw_value[key])]
+        except (LookupError, TypeError):
+            return []
+    elif isinstance(raw_value, dict):
+        return iteritems(raw_value)
+    return enumerate(raw_value)
+
+
+class FieldMask(object):
+    """
+    Selects parts of a tree of elements, with paths as accepted by
+    :func:`~relief.path`, so that only these parts are unserialized or
+    validated. Paths may contain wildcards, a path selecting an element
+    selects all of its members as well::
+
+        mask = FieldMask(["name", "items[*].price"])
+        mask.set_from_raw(order, {"name": u"Spam", "items": [{"price": u"1"}]})
+        mask.validate(order)
+
+    :class:`~relief.Form`, :class:`~relief.Dict`, :class:`~relief.List` and
+    the other containers accept a mask, or a list of paths, as the `only`
+    argument of :meth:`validate`.
+
+    The cost of using a mask grows with the number of elements it selects, not
+    with the size of the tree.
+
+    .. versionadded:: 2.2.0
+    """
+    def __init__(self, paths):
+        #: The paths selected by this mask.
+        self.paths = list(paths)
+        # Maps keys (or WILDCARD) to the mask of their members, or None if all
+        # members are selected.
+        self._tree = {}
+        for path in self.paths:
+            tree = self._tree
+            steps = _parse(path)
+            for step in steps[:-1]:
+                subtree = tree.setdefault(step, {})
+                if subtree is None:
+                    break
+                tree = subtree
+            else:
+                tree[steps[-1]] = None
+
+    def validate(self, element, context=None, errors=None):
+        """
+        Validates the selected members of `element` and returns `True` if all
+        of them are valid. The :attr:`~relief.Element.is_valid` attributes of
+        elements that are not selected, including the containers leading to
+        selected elements, remain unchanged.
+
+        `errors` are recorded as described in
+        :meth:`~relief.schema.core.BaseElement.validate`.
+        """
+        if context is None:
+            context = ValidationContext()
+        return self._validate(element, self._tree, context, errors)
+
+    def _validate(self, element, tree, context, errors):
+        if tree is None:
+            if errors is None:
+                return element.validate(context)
+            return element.validate(context, errors)
+        while isinstance(element, Maybe):
+            if element.value is None:
+                return True
+            element = element.member
+        is_valid = True
+        for key, subtree in iteritems(tree):
+            for member_key, member in _members(element, key):
+                if errors is None:
+                    is_valid &= self._validate(member, subtree, context, None)
+                    continue
+                recorded = len(errors)
+                is_valid &= self._validate(member, subtree, context, errors)
+                prefix_errors(errors, recorded, member_key)
+        return is_valid
+
+    def set_from_raw(self, element, raw_value):
+        """
+        Sets the selected members of `element` from the corresponding parts of
+        `raw_value`. Selected members missing from `raw_value` and members that
+        are not selected remain unchanged.
+
+        The containers leading to members that have been set are no longer
+        considered validated and their :attr:`~relief.Element.raw_value` is
+        computed from their value again.
+        """
+        self._set_from_raw(element, self._tree, raw_value)
+
+    def _set_from_raw(self, element, tree, raw_value):
+        if tree is None:
+            element.set_from_raw(raw_value)
+            return
+        containers = [element]
+        while isinstance(element, Maybe):
+            element = element.member
+            containers.append(element)
+        is_set = False
+        for key, subtree in iteritems(tree):
+            for member_key, member_raw_value in _raw_members(raw_value, key):
+                try:
+                    member = element[member_key]
+                except LookupError:
+                    continue
+                self._set_from_raw(member, subtree, member_raw_value)
+                is_set = True
+        if is_set:
+            for container in containers:
+                container.raw_value = DEFERRED
+                container.is_valid = None
+                if getattr(container, "_state", None) is Unspecified:
+                    # The container has members with values now.
+                    container._state = None
+                if isinstance(container, Sequence):
+                    container._value_index = None
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.paths)
+
+
+__all__ = ["FieldMask"]
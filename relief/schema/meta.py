@@ -8,7 +8,7 @@
 """
 from relief.utils import class_cloner
 from relief.constants import Unspecified
-from relief.schema.core import BaseElement
+from relief.schema.core import BaseElement, ValidationContext, DEFERRED
 
 
 class Maybe(BaseElement):
@@ -65,13 +65,19 @@ class Maybe(BaseElement):
             self.member.set_from_raw(raw_value)
         self.is_valid = None
 
+    def _serialize_value(self):
+        return self.member.raw_value
+
     def set_from_native(self, value):
         self.member.set_from_native(value)
-        self.raw_value = self.member.raw_value
+        self.raw_value = DEFERRED
         self.is_valid = None
 
-    def validate(self, context=None):
+    def validate(self, context=None, errors=None):
         if context is None:
-            context = {}
-        self.is_valid = self.member.validate() or self.value is None
+            context = ValidationContext()
+        if errors is None or self.value is None:
+            self.is_valid = self.member.validate(context) or self.value is None
+        else:
+            self.is_valid = self.member.validate(context, errors)
         return self.is_valid
@@ -0,0 +1,280 @@
+# coding: utf-8
+"""
+    relief.schema.paths
+    ~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import re
+from operator import itemgetter, attrgetter
+
+from relief.schema.meta import Maybe
+from relief.schema.mappings import Mapping, Form
+from relief.schema.sequences import Sequence, Tuple
+
+
+_step_re = re.compile(r"""
+    (?P<dot>\.)?
+    (?:
+        (?P<name>[^\W\d]\w*)
+        | \[(?P<index>-?\d+)\]
+        | \[(?P<quote>["'])(?P<key>.*?)(?P=quote)\]
+        | \[\*\] | \*
+    )
+""", re.VERBOSE | re.UNICODE)
+
+#: Marks a step of a path that matches all members of a container.
+WILDCARD = object()
+
+_member = attrgetter("member")
+
+
+def _parse(expression):
+    steps = []
+    position = 0
+    while position < len(expression):
+        match = _step_re.match(expression, position)
+        if match is not None:
+            dotted = match.group("dot") is not None
+            if match.group(0).lstrip(".").startswith("["):
+                # Brackets are never preceded by a dot.
+                is_valid = not dotted
+            else:
+                is_valid = dotted == (position > 0)
+        if match is None or not is_valid:
+            raise ValueError(
+                "invalid path %r at position %d" % (expression, position)
+            )
+        if match.group("name") is not None:
+            steps.append(match.group("name"))
+        elif match.group("index") is not None:
+            steps.append(int(match.group("index")))
+        elif match.group("quote") is not None:
+            steps.append(match.group("key"))
+        else:
+            steps.append(WILDCARD)
+        position = match.end()
+    if not steps:
+        raise ValueError("empty path")
+    return steps
+
+
+def _children(element):
+    while isinstance(element, Maybe):
+        element = element.member
+    if isinstance(element, Form):
+        return _form_children(element)
+    elif isinstance(element, Mapping):
+        return element.values()
+    elif isinstance(element, Sequence):
+        return iter(element)
+    raise TypeError("%r has no members" % element)
+
+
+def _form_children(form):
+    return (form[key] for key in form.member_schema)
+
+
+def _item(key):
+    def get_item(element):
+        while isinstance(element, Maybe):
+            element = element.member
+        return element[key]
+    return get_item
+
+
+def _compile_step(schema, step):
+    """
+    Returns a list of operations and the schema of the elements they return
+    for the given `step`, applied to elements of the given `schema`.
+    """
+    operations = []
+    while isinstance(schema, type) and issubclass(schema, Maybe):
+        operations.append(("member", None))
+        schema = schema.member_schema
+    if step is WILDCARD:
+        if issubclass(schema, Form):
+            member_schemas = set(schema.member_schema.values())
+            operations.append(("children", _form_children))
+        elif issubclass(schema, Mapping):
+            member_schemas = set([schema.member_schema[1]])
+            operations.append(("children", schema.values))
+        elif issubclass(schema, Tuple):
+            member_schemas = set(schema.member_schema)
+            operations.append(("children", iter))
+        elif issubclass(schema, Sequence):
+            member_schemas = set([schema.member_schema])
+            operations.append(("children", iter))
+        else:
+            raise ValueError("%s has no members" % schema.__name__)
+        if len(member_schemas) == 1:
+            return operations, member_schemas.pop()
+        # The schema of the elements differs, following steps are looked up
+        # without knowing it.
+        return operations, None
+    if issubclass(schema, Form):
+        if step not in schema.member_schema:
+            raise ValueError("%s has no member %r" % (schema.__name__, step))
+        member_schema = schema.member_schema[step]
+    elif issubclass(schema, Mapping):
+        member_schema = schema.member_schema[1]
+    elif issubclass(schema, Tuple):
+        if not isinstance(step, int):
+            raise ValueError("%s has no member %r" % (schema.__name__, step))
+        try:
+            member_schema = schema.member_schema[step]
+        except IndexError:
+            raise ValueError("%s has no member %r" % (schema.__name__, step))
+    elif issubclass(schema, Sequence):
+        if not isinstance(step, int):
+            raise ValueError("%s has no member %r" % (schema.__name__, step))
+        member_schema = schema.member_schema
+    else:
+        raise ValueError("%s has no members" % schema.__name__)
+    operations.append(("item", step))
+    return operations, member_schema
+
+
+def _compile_lookup(operations):
+    """
+    Returns a function that applies the given `operations`, none of which may
+    be ``"children"``, to an element.
+    """
+    # The operations are compiled into a single expression, which makes the
+    # lookup as fast as writing it out by hand.
+    namespace = {}
+    source = "element"
+    for index, (operation, argument) in enumerate(operations):
+        name = "_%d" % index
+        namespace[name] = argument
+        if operation == "item":
+            source = "%s[%s]" % (source, name)
+        elif operation == "member":
+            source += ".member"
+        else:
+            source = "%s(%s)" % (name, source)
+    return eval("lambda element: %s" % source, namespace)
+
+
+def _get_each(getter, elements):
+    for element in elements:
+        yield getter(element)
+
+
+def _children_of_each(children, elements):
+    for element in elements:
+        for child in children(element):
+            yield child
+
+
+class Path(object):
+    """
+    A path to elements within a tree of elements, such as
+    ``"order.items[*].price"``, compiled for fast repeated lookups.
+
+    Paths consist of member names separated by dots, indices or quoted keys in
+    brackets (``[3]``, ``["key"]``) and wildcards (``[*]`` or ``.*``) that
+    match all members of a container. :class:`~relief.Maybe` elements along
+    the path are looked through.
+
+    If a `schema` is given, the path is checked against it and raises
+    :exc:`ValueError` if it cannot match; lookups are then specialized for the
+    containers in the schema.
+
+    .. versionadded:: 2.2.0
+    """
+    def __init__(self, expression, schema=None):
+        #: The expression the path was created from.
+        self.expression = expression
+        #: The schema the path has been compiled for or `None`.
+        self.schema = schema
+        steps = _parse(expression)
+        #: `True` if the path contains wildcards and can match multiple
+        #: elements.
+        self.has_wildcards = WILDCARD in steps
+        operations = []
+        for step in steps:
+            if schema is None:
+                if step is WILDCARD:
+                    operations.append(("children", _children))
+                else:
+                    operations.append(("call", _item(step)))
+            else:
+                step_operations, schema = _compile_step(schema, step)
+                operations.extend(step_operations)
+        self._pipeline = []
+        for operation, argument in operations:
+            if operation == "item":
+                self._pipeline.append((_get_each, itemgetter(argument)))
+            elif operation == "member":
+                self._pipeline.append((_get_each, _member))
+            elif operation == "call":
+                self._pipeline.append((_get_each, argument))
+            else:
+                self._pipeline.append((_children_of_each, argument))
+        if not self.has_wildcards:
+            self._lookup = _compile_lookup(operations)
+
+    def elements(self, element):
+        """
+        Returns an iterator over the elements matched by the path within the
+        given `element`. The elements are looked up as the iterator is
+        consumed.
+        """
+        elements = iter([element])
+        for each, function in self._pipeline:
+            elements = each(function, elements)
+        return elements
+
+    def values(self, element):
+        """
+        Returns an iterator over the values of the elements matched by the
+        path within the given `element`.
+        """
+        for element in self.elements(element):
+            yield element.value
+
+    def element(self, element):
+        """
+        Returns the element the path points to within the given `element`.
+
+        Raises :exc:`TypeError` if the path contains wildcards, use
+        :meth:`elements` for those.
+        """
+        if self.has_wildcards:
+            raise TypeError(
+                "%r contains wildcards, use elements()" % self.expression
+            )
+        return self._lookup(element)
+
+    def value(self, element):
+        """
+        Returns the value of the element the path points to within the given
+        `element`.
+        """
+        return self.element(element).value
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.expression)
+
+
+def path(expression, schema=None):
+    """
+    Returns a :class:`Path` for the given `expression`, compiled against the
+    given `schema`, if any.
+
+    >>> from relief import Form, List, Integer, path
+    >>> Order = Form.of({"items": List.of(Integer)})
+    >>> order = Order({"items": [1, 2, 3]})
+    >>> path("items[1]", Order).value(order)
+    2
+    >>> list(path("items[*]").values(order))
+    [1, 2, 3]
+
+    .. versionadded:: 2.2.0
+    """
+    return Path(expression, schema)
+
+
+__all__ = ["Path", "path"]
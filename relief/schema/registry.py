@@ -0,0 +1,283 @@
+# coding: utf-8
+"""
+    relief.schema.registry
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import re
+import sys
+import types
+import marshal
+import hashlib
+from threading import Lock
+from weakref import WeakKeyDictionary
+
+from relief import Unspecified, NotUnserializable
+from relief.utils import InheritingDictDescriptor, _is_iterator
+from relief.schema.core import BaseElement
+from relief._compat import OrderedDict, text_type, integer_types, iteritems
+
+
+class SchemaRegistry(object):
+    """
+    Caches schemas created at runtime, such as forms that depend on
+    configuration, so that structurally equal schemas are only created once::
+
+        registry = SchemaRegistry(maxsize=1000)
+        TenantForm = registry.of(Form, {"name": Unicode, "age": Integer})
+
+    Schemas are identified by a structural description of the schema they are
+    derived from and the arguments passed.
+    Once more than `maxsize` schemas are cached, the least recently used one is
+    evicted. The registry keeps no other references to evicted schemas, they
+    are garbage collected once they are no longer used elsewhere.
+
+    .. versionadded:: 2.2.0
+    """
+    def __init__(self, maxsize=128):
+        #: The maximum number of schemas that are cached.
+        self.maxsize = maxsize
+        #: The number of schemas that were found in the cache.
+        self.hits = 0
+        #: The number of schemas that had to be created.
+        self.misses = 0
+        #: The number of schemas that have been evicted from the cache.
+        self.evictions = 0
+        self._schemas = OrderedDict()
+        self._lock = Lock()
+
+    def of(self, schema, *args):
+        """
+        Returns ``schema.of(*args)``.
+        """
+        return self._get(schema, "of", args, {})
+
+    def using(self, schema, **kwargs):
+        """
+        Returns ``schema.using(**kwargs)``.
+        """
+        return self._get(schema, "using", (), kwargs)
+
+    def validated_by(self, schema, validators):
+        """
+        Returns ``schema.validated_by(validators)``.
+        """
+        return self._get(schema, "validated_by", (validators, ), {})
+
+    def with_properties(self, schema, **properties):
+        """
+        Returns ``schema.with_properties(**properties)``.
+        """
+        return self._get(schema, "with_properties", (), properties)
+
+    def _get(self, schema, method, args, kwargs):
+        # Iterators would be consumed by describing the call.
+        args = tuple(list(arg) if _is_iterator(arg) else arg for arg in args)
+        key = _describe_call(schema, method, args, kwargs)
+        with self._lock:
+            try:
+                result = self._schemas.pop(key)
+            except KeyError:
+                pass
+            else:
+                self.hits += 1
+                self._schemas[key] = result
+                return result
+        result = getattr(schema, method)(*args, **kwargs)
+        with self._lock:
+            self.misses += 1
+            self._schemas[key] = result
+            while len(self._schemas) > self.maxsize:
+                self._schemas.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def clear(self):
+        """
+        Removes all schemas from the cache and resets the statistics.
+        """
+        with self._lock:
+            self._schemas.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._schemas)
+
+    def __repr__(self):
+        return "%s(maxsize=%r, hits=%r, misses=%r, evictions=%r, size=%r)" % (
+            self.__class__.__name__, self.maxsize, self.hits, self.misses,
+            self.evictions, len(self)
+        )
+
+
+# Class attributes that are derived from other attributes or are set by Python
+# itself and are therefore not part of the description of a class.
+_IGNORED_ATTRIBUTES = frozenset([
+    "__module__", "__doc__", "__dict__", "__weakref__", "__qualname__",
+    "__abstractmethods__", "_abc_impl", "_abc_registry", "_abc_cache",
+    "_abc_negative_cache", "_abc_negative_cache_version", "_validate_methods",
+    "_recipe", "_memo"
+])
+
+_VALUE_TYPES = (
+    type(None), bool, float, complex, bytes, text_type
+) + integer_types
+_EXACT_VALUE_TYPES = frozenset(_VALUE_TYPES)
+
+_CONSTANTS = {
+    id(Unspecified): ("constant", "Unspecified"),
+    id(NotUnserializable): ("constant", "NotUnserializable")
+}
+
+_descriptions = WeakKeyDictionary()
+
+
+def _resolve(module_name, qualified_name):
+    module = sys.modules.get(module_name)
+    if module is None:
+        return None
+    obj = module
+    for name in qualified_name.split("."):
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None
+    return obj
+
+
+def _reference(obj):
+    """
+    Returns a description of `obj` as an importable name or `None`, if `obj`
+    cannot be imported.
+    """
+    module_name = getattr(obj, "__module__", None)
+    qualified_name = getattr(obj, "__qualname__", obj.__name__)
+    if module_name is None or "<" in qualified_name:
+        return None
+    if _resolve(module_name, qualified_name) is obj:
+        return ("reference", module_name, qualified_name)
+    return None
+
+
+def _describe_class(cls):
+    try:
+        return _descriptions[cls]
+    except (KeyError, TypeError):
+        pass
+    description = _reference(cls)
+    if description is None:
+        # Classes created with class_cloner or within functions are described
+        # by their bases and the attributes they define.
+        description = (
+            "class",
+            cls.__name__,
+            tuple(_describe(base) for base in cls.__bases__),
+            tuple(
+                (name, _describe_attribute(cls, value))
+                for name, value in sorted(iteritems(cls.__dict__))
+                if name not in _IGNORED_ATTRIBUTES
+            )
+        )
+    try:
+        _descriptions[cls] = description
+    except TypeError:
+        pass
+    return description
+
+
+def _describe_attribute(cls, value):
+    if isinstance(value, InheritingDictDescriptor):
+        # Values may have been added to the class after it has been created.
+        values = value.cls_values_mapping.get(cls, value.values)
+        return ("properties", value.name, _describe(dict(values)))
+    return _describe(value)
+
+
+def _describe_function(function):
+    description = _reference(function)
+    if description is not None:
+        return description
+    code = function.__code__
+    return (
+        "function",
+        function.__module__,
+        getattr(function, "__qualname__", function.__name__),
+        hashlib.sha1(marshal.dumps(code)).hexdigest(),
+        _describe(function.__defaults__),
+        _describe(tuple(
+            cell.cell_contents for cell in function.__closure__ or ()
+        ))
+    )
+
+
+def _describe(obj):
+    """
+    Returns a description of `obj`, that consists only of tuples and strings.
+    Objects that are structurally equal, such as two classes created by calling
+    :meth:`~relief.Element.using` with the same arguments, have equal
+    descriptions.
+
+    Classes and functions that can be imported are described by their name,
+    everything else is described by its contents. Raises :exc:`TypeError` if
+    `obj` contains something that cannot be described.
+    """
+    cls = type(obj)
+    if cls in _EXACT_VALUE_TYPES or isinstance(obj, _VALUE_TYPES):
+        return ("value", cls.__name__, repr(obj))
+    elif id(obj) in _CONSTANTS:
+        return _CONSTANTS[id(obj)]
+    elif isinstance(obj, type):
+        try:
+            return _descriptions[obj]
+        except (KeyError, TypeError):
+            return _describe_class(obj)
+    elif isinstance(obj, BaseElement):
+        # Elements change and may refer to themselves through validators.
+        raise TypeError("cannot describe element %r" % obj)
+    elif isinstance(obj, types.FunctionType):
+        return _describe_function(obj)
+    elif isinstance(obj, types.MethodType):
+        return ("method", _describe(obj.__func__), _describe(obj.__self__))
+    elif isinstance(obj, (staticmethod, classmethod)):
+        return (type(obj).__name__, _describe(obj.__func__))
+    elif isinstance(obj, (list, tuple)):
+        return (type(obj).__name__, tuple(_describe(item) for item in obj))
+    elif isinstance(obj, (set, frozenset)):
+        return (
+            type(obj).__name__,
+            tuple(sorted((_describe(item) for item in obj), key=repr))
+        )
+    elif isinstance(obj, dict):
+        items = [(_describe(key), _describe(value)) for key, value in iteritems(obj)]
+        if not isinstance(obj, OrderedDict):
+            items.sort(key=repr)
+        return (type(obj).__name__, tuple(items))
+    elif isinstance(obj, InheritingDictDescriptor):
+        return ("properties", obj.name, _describe(obj.values))
+    elif isinstance(obj, type(re.compile(""))):
+        return ("regex", _describe(obj.pattern), obj.flags)
+    elif isinstance(obj, property):
+        return ("property", _describe(obj.fget), _describe(obj.fset))
+    elif type(obj).__repr__ is not object.__repr__:
+        representation = repr(obj)
+        if " at 0x" in representation:
+            raise TypeError("cannot describe %r" % obj)
+        return ("repr", _describe(type(obj)), representation)
+    elif hasattr(obj, "__dict__"):
+        return ("object", _describe(type(obj)), _describe(vars(obj)))
+    raise TypeError("cannot describe %r" % obj)
+
+
+def _describe_call(schema, method, args, kwargs):
+    """
+    Returns a description of calling `method` on `schema` with the given
+    arguments.
+    """
+    return _describe((schema, method, tuple(
+        # The order of the members passed to Form.of matters.
+        OrderedDict(arg) if type(arg) is dict else arg for arg in args
+    ), kwargs))
+
+
+__all__ = ["SchemaRegistry"]
@@ -9,7 +9,8 @@
 import sys
 
 from relief import Unspecified, NotUnserializable, Element
-from relief._compat import text_type
+from relief.utils import class_cloner, imported_attribute
+from relief._compat import text_type, integer_types, intern, iteritems
 
 
 class Boolean(Element):
@@ -34,20 +35,64 @@ class Boolean(Element):
         return NotUnserializable
 
 
-class Number(Element):
+class Parsed(Element):
+    """
+    Base class for elements whose values are parsed from unicode or byte
+    strings.
+
+    Raw values that are instances of :attr:`native_type` are used as they are,
+    anything else is passed to :meth:`_parse` and byte strings are passed to
+    :meth:`_parse_bytes`. Should parsing fail with a :exc:`ValueError` or
+    :exc:`TypeError`, the value will be :data:`~relief.NotUnserializable`.
+
+    .. versionadded:: 2.2.0
+    """
     def unserialize(self, raw_value):
-        raw_value = super(Number, self).unserialize(raw_value)
+        # Raw values that already are of the native type or byte strings are by
+        # far the most common, so we handle those before anything else.
+        raw_type = raw_value.__class__
+        if raw_type is self.native_type:
+            return raw_value
+        elif raw_type is bytes and not self.strict:
+            return self._unserialize_bytes(raw_value)
+        raw_value = super(Parsed, self).unserialize(raw_value)
         if raw_value is Unspecified or raw_value is NotUnserializable:
             return raw_value
         if isinstance(raw_value, self.native_type):
             return raw_value
         elif isinstance(raw_value, bytes):
-            raw_value = raw_value.decode(sys.getdefaultencoding())
+            return self._unserialize_bytes(raw_value)
         try:
-            return self.native_type(raw_value)
+            return self._parse(raw_value)
         except (ValueError, TypeError):
             return NotUnserializable
 
+    def _parse(self, raw_value):
+        return self.native_type(raw_value)
+
+    def _parse_bytes(self, raw_value):
+        return self._parse(raw_value)
+
+    def _unserialize_bytes(self, raw_value):
+        try:
+            return self._parse_bytes(raw_value)
+        except (ValueError, TypeError):
+            pass
+        # The byte string may still represent a value, if it contains non-ASCII
+        # characters in the default encoding.
+        try:
+            raw_value.decode('ascii')
+        except UnicodeDecodeError:
+            try:
+                return self._parse(raw_value.decode(sys.getdefaultencoding()))
+            except (ValueError, TypeError):
+                pass
+        return NotUnserializable
+
+
+class Number(Parsed):
+    pass
+
 
 class Integer(Number):
     """
@@ -87,6 +132,154 @@ class Complex(Number):
     """
     native_type = complex
 
+    def _parse_bytes(self, raw_value):
+        # complex() does not accept byte strings.
+        return complex(raw_value.decode('ascii'))
+
+
+class Decimal(Number):
+    """
+    Represents a :class:`decimal.Decimal`.
+
+    Unserializes unicode and byte strings like :class:`Integer`.
+
+    .. versionadded:: 2.2.0
+    """
+    # decimal, datetime and uuid are only imported, once the elements that
+    # need them are used.
+    native_type = imported_attribute("decimal", "Decimal")
+
+    #: The :class:`decimal.Context` used to create values, can be set with
+    #: :meth:`using`. If it is `None` values are created exactly, otherwise
+    #: they are rounded according to the context, which should trap
+    #: :exc:`decimal.InvalidOperation`.
+    context = None
+
+    _invalid_operation = imported_attribute("decimal", "InvalidOperation")
+
+    def _parse(self, raw_value):
+        try:
+            if self.context is None:
+                return self.native_type(raw_value)
+            return self.context.create_decimal(raw_value)
+        except self._invalid_operation:
+            raise ValueError(raw_value)
+
+    def _parse_bytes(self, raw_value):
+        return self._parse(raw_value.decode('ascii'))
+
+
+class Temporal(Parsed):
+    #: Parses an ISO 8601 formatted unicode string.
+    fromisoformat = None
+
+    def _parse(self, raw_value):
+        if not isinstance(raw_value, text_type):
+            raise TypeError(raw_value)
+        return self.fromisoformat(raw_value)
+
+    def _parse_bytes(self, raw_value):
+        return self.fromisoformat(raw_value.decode('ascii'))
+
+
+class Date(Temporal):
+    """
+    Represents a :class:`datetime.date`.
+
+    Unserializes unicode and byte strings in ISO 8601 format:
+
+    .. doctest::
+
+       >>> from relief import Date
+       >>> element = Date()
+       >>> element.set_from_raw(b"2013-10-19")
+       >>> element.value
+       datetime.date(2013, 10, 19)
+
+    :class:`datetime.datetime` objects are not considered to be dates.
+
+    Which ISO 8601 strings are accepted depends on the version of Python:
+    3.11 and later accept what :meth:`datetime.date.fromisoformat` accepts,
+    earlier versions only accept ``YYYY-MM-DD``.
+
+    .. versionadded:: 2.2.0
+    """
+    native_type = imported_attribute("datetime", "date")
+    fromisoformat = imported_attribute(
+        "relief._isoformat", "date_fromisoformat"
+    )
+
+    def unserialize(self, raw_value):
+        if isinstance(raw_value, DateTime.native_type):
+            return NotUnserializable
+        return super(Date, self).unserialize(raw_value)
+
+
+class DateTime(Temporal):
+    """
+    Represents a :class:`datetime.datetime`.
+
+    Unserializes unicode and byte strings in ISO 8601 format, like
+    :class:`Date`. A UTC offset, such as ``+01:00`` or ``Z``, results in an
+    aware datetime.
+
+    On 3.11 and later any string accepted by
+    :meth:`datetime.datetime.fromisoformat` is accepted. Earlier versions are
+    limited to the formats produced by :meth:`datetime.datetime.isoformat`,
+    with ``Z`` as an additional UTC offset; before 3.7 these formats are
+    matched with :meth:`datetime.datetime.strptime`, which is slightly more
+    lenient about the number of digits.
+
+    .. versionadded:: 2.2.0
+    """
+    native_type = imported_attribute("datetime", "datetime")
+    fromisoformat = imported_attribute(
+        "relief._isoformat", "datetime_fromisoformat"
+    )
+
+
+class Time(Temporal):
+    """
+    Represents a :class:`datetime.time`.
+
+    Unserializes unicode and byte strings in ISO 8601 format, like
+    :class:`Date`. A UTC offset, such as ``+01:00`` or ``Z``, results in an
+    aware time.
+
+    On 3.11 and later any string accepted by
+    :meth:`datetime.time.fromisoformat` is accepted. Earlier versions are
+    limited to the formats produced by :meth:`datetime.time.isoformat`, with
+    ``Z`` as an additional UTC offset; before 3.7 these formats are
+    matched with :meth:`datetime.datetime.strptime`, which is slightly more
+    lenient about the number of digits.
+
+    .. versionadded:: 2.2.0
+    """
+    native_type = imported_attribute("datetime", "time")
+    fromisoformat = imported_attribute(
+        "relief._isoformat", "time_fromisoformat"
+    )
+
+
+class UUID(Parsed):
+    """
+    Represents a :class:`uuid.UUID`.
+
+    Unserializes unicode and byte strings in any of the formats accepted by
+    :class:`uuid.UUID`.
+
+    .. versionadded:: 2.2.0
+    """
+    native_type = imported_attribute("uuid", "UUID")
+
+    def _parse(self, raw_value):
+        if not isinstance(raw_value, text_type):
+            raise TypeError(raw_value)
+        return self.native_type(raw_value)
+
+    def _parse_bytes(self, raw_value):
+        return self.native_type(raw_value.decode('ascii'))
+
 
 class Unicode(Element):
     """
@@ -161,3 +354,124 @@ class Bytes(Element):
             return bytes(raw_value)
         except TypeError:
             return NotUnserializable
+
+
+def _lookup_key(value):
+    """
+    Returns the key `value` is looked up by in the tables of :class:`Enum`.
+
+    Values that are equal but of different types, such as ``1``, ``True`` and
+    ``1.0``, have different keys. Unicode and byte strings, including
+    instances of their subclasses, are their own key.
+    """
+    if isinstance(value, (text_type, bytes)):
+        return value
+    elif value.__class__ in integer_types:
+        # Python 2 integers are int or long depending on their size.
+        return int, value
+    return value.__class__, value
+
+
+def _raw_forms(raw_value):
+    """
+    Yields `raw_value` and the unicode and byte string forms in which it might
+    be given as a raw value.
+    """
+    yield raw_value
+    if isinstance(raw_value, bool):
+        return
+    if isinstance(raw_value, integer_types):
+        raw_value = text_type(raw_value)
+        yield raw_value
+    if isinstance(raw_value, text_type):
+        try:
+            yield raw_value.encode("utf-8")
+        except UnicodeEncodeError:
+            pass
+    elif isinstance(raw_value, bytes):
+        try:
+            yield raw_value.decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+
+
+class Enum(Element):
+    """
+    Represents a member of an enumeration.
+
+    In order to use :class:`Enum` you have to derive a schema with :meth:`of`
+    from either an :class:`enum.Enum` subclass or a mapping of raw values to
+    the values they represent:
+
+    .. doctest::
+
+       >>> from relief import Enum
+       >>> Status = Enum.of({u"active": 1, u"inactive": 0})
+       >>> Status(b"active").value
+       1
+
+    Members of an :class:`enum.Enum` are looked up by value and by name.
+    Integers and unicode strings are also accepted in their unicode and byte
+    string forms. The lookup is a single dictionary access and always returns
+    the same canonical object for a given value. Raw values that are not
+    strings only match values of the same type, ``True`` and ``1.0`` are not
+    taken to be ``1``.
+
+    Raw values that are not part of the enumeration unserialize to
+    :data:`~relief.NotUnserializable`. If :attr:`strict` is `True` only the
+    values themselves are accepted.
+
+    .. versionadded:: 2.2.0
+    """
+    #: The enumeration given to :meth:`of`.
+    enumeration = None
+
+    @class_cloner
+    def of(cls, enumeration):
+        """
+        Returns a new :class:`Enum` class whose values are defined by the given
+        `enumeration`.
+        """
+        cls.enumeration = enumeration
+        if hasattr(enumeration, "__members__"):
+            cls.native_type = enumeration
+            mapping = dict(
+                (member.value, member) for member in enumeration
+            )
+            names = iteritems(enumeration.__members__)
+        else:
+            mapping = {}
+            for raw_value, value in iteritems(dict(enumeration)):
+                if value.__class__ is str:
+                    value = intern(value)
+                mapping[raw_value] = value
+            names = ()
+        values = list(mapping.values()) + [Unspecified]
+        cls._values = dict((_lookup_key(value), value) for value in values)
+        # Earlier entries take precedence, so that names can't shadow values.
+        cls._lookup = lookup = {}
+        for raw_value, value in iteritems(mapping):
+            for raw_form in _raw_forms(raw_value):
+                lookup.setdefault(_lookup_key(raw_form), value)
+        for value in values:
+            lookup.setdefault(_lookup_key(value), value)
+        for name, value in names:
+            for raw_form in _raw_forms(name):
+                lookup.setdefault(_lookup_key(raw_form), value)
+        return cls
+
+    def __init__(self, value=Unspecified):
+        if self.enumeration is None:
+            raise TypeError("enumeration is unknown")
+        super(Enum, self).__init__(value)
+
+    def unserialize(self, raw_value):
+        raw_type = raw_value.__class__
+        if raw_type is not text_type and raw_type is not bytes:
+            raw_value = _lookup_key(raw_value)
+        try:
+            if self.strict:
+                return self._values[raw_value]
+            return self._lookup[raw_value]
+        except (KeyError, TypeError):
+            return NotUnserializable
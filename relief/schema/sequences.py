@@ -6,32 +6,91 @@
     :copyright: 2013 by Daniel Neuhäuser
     :license: BSD, see LICENSE.rst for details
 """
+from bisect import bisect_left
+
 from relief import Unspecified, NotUnserializable
-from relief.utils import class_cloner
-from relief.schema.core import Container
+from relief.utils import class_cloner, hidden_attribute
+from relief.schema.core import Container, DEFERRED, _new_element
 
 
 class Sequence(Container):
+    #: When `True` :meth:`__contains__`, :meth:`index` and :meth:`count` use
+    #: an index mapping values to their positions, instead of comparing the
+    #: value to every element. The index is created on first use and discarded
+    #: when the value of the sequence is set. It is not updated when the value
+    #: of a contained element is changed directly.
+    indexed = False
+
+    def set_from_native(self, value):
+        self._value_index = None
+        super(Sequence, self).set_from_native(value)
+
+    def set_from_raw(self, raw_value):
+        self._value_index = None
+        super(Sequence, self).set_from_raw(raw_value)
+
+    def __getstate__(self):
+        state = super(Sequence, self).__getstate__()
+        state["_value_index"] = None
+        return state
+
+    def _get_value_index(self):
+        if self._value_index is None:
+            positions = {}
+            unhashable = []
+            for i, element in enumerate(self):
+                try:
+                    positions.setdefault(element.value, []).append(i)
+                except TypeError:
+                    unhashable.append(i)
+            self._value_index = positions, unhashable
+        return self._value_index
+
+    def _positions(self, value):
+        """
+        Returns a sorted list of the positions of elements whose value is equal
+        to `value` or `None` if the index cannot be used.
+        """
+        if not self.indexed:
+            return None
+        positions, unhashable = self._get_value_index()
+        try:
+            result = positions.get(value, [])
+        except TypeError:
+            return None
+        if unhashable:
+            result = sorted(
+                result + [i for i in unhashable if self[i].value == value]
+            )
+        return result
+
     def __contains__(self, value):
-        return any(element.value == value for element in self)
+        positions = self._positions(value)
+        if positions is None:
+            return any(element.value == value for element in self)
+        return bool(positions)
 
     def index(self, value, start=None, stop=None):
-        for i, element in enumerate(self[start:stop], start or 0):
-            if element.value == value:
-                return i
+        start, stop, _ = slice(start, stop).indices(len(self))
+        positions = self._positions(value)
+        if positions is None:
+            for i in range(start, stop):
+                if self[i].value == value:
+                    return i
+        else:
+            i = bisect_left(positions, start)
+            if i < len(positions) and positions[i] < stop:
+                return positions[i]
         raise ValueError("%r not in %s" % (value, self.__class__.__name__))
 
     def count(self, value):
-        return sum(element.value == value for element in self)
+        positions = self._positions(value)
+        if positions is None:
+            return sum(element.value == value for element in self)
+        return len(positions)
 
-    def validate(self, context=None):
-        if context is None:
-            context = {}
-        self.is_valid = True
-        for element in self:
-            self.is_valid &= element.validate(context)
-        self.is_valid &= super(Sequence, self).validate(context)
-        return self.is_valid
+    def _validate_contents(self, context, errors):
+        return self._validate_members(enumerate(self), context, errors)
 
 
 class Tuple(Sequence, tuple):
@@ -104,6 +163,13 @@ class Tuple(Sequence, tuple):
             (schema() for schema in cls.member_schema)
         )
 
+    def __reduce_ex__(self, protocol):
+        return (
+            _new_element,
+            (self.__class__, tuple, tuple(self)),
+            self.__getstate__()
+        )
+
     @property
     def value(self):
         if self._state is not None:
@@ -198,6 +264,30 @@ class List(Sequence, list):
         if new_value is not Unspecified:
             raise AttributeError("can't set attribute")
 
+    def __reduce_ex__(self, protocol):
+        # Elements cannot be restored with append() or extend(), which are
+        # hidden.
+        return (
+            _new_element,
+            (self.__class__, list),
+            (self.__getstate__(), list(self))
+        )
+
+    def __setstate__(self, state):
+        state, elements = state
+        super(List, self).__setstate__(state)
+        super(List, self).extend(elements)
+
+    def _set_from_decoded_members(self, elements):
+        # Like set_from_raw() for decoders, such as relief.urlencoded, that
+        # have already created and set the elements.
+        self._value_index = None
+        super(List, self).__delitem__(slice(None, None, None)) # del self[:]
+        super(List, self).extend(elements)
+        self.raw_value = DEFERRED
+        self._state = None
+        self.is_valid = None
+
     def _set_value_from_native(self, value):
         super(List, self).__delitem__(slice(None, None, None)) # del self[:]
         if value is not Unspecified:
@@ -237,10 +327,8 @@ class List(Sequence, list):
             '%r object does not support slice deletion' % self.__class__.__name__
         )
 
-    def __getattribute__(self, name):
-        mutating_methods = set([
-            'append', 'extend', 'insert', 'pop', 'remove'
-        ])
-        if name in mutating_methods:
-            raise AttributeError(name)
-        return super(List, self).__getattribute__(name)
+    append = hidden_attribute('append')
+    extend = hidden_attribute('extend')
+    insert = hidden_attribute('insert')
+    pop = hidden_attribute('pop')
+    remove = hidden_attribute('remove')
@@ -0,0 +1,476 @@
+# coding: utf-8
+"""
+    relief.urlencoded
+    ~~~~~~~~~~~~~~~~~
+
+    Decodes ``application/x-www-form-urlencoded`` data and multi-dicts with
+    flattened keys, such as ``order.items-0.price``, into forms.
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from weakref import WeakKeyDictionary
+
+from relief.schema.core import DEFERRED
+from relief.schema.meta import Maybe
+from relief.schema.mappings import Mapping, Form
+from relief.schema.sequences import List
+from relief._compat import text_type, iteritems
+
+
+def _get_unquote_plus():
+    # urllib is only imported once it's needed, as in relief.validation.
+    try:
+        from urllib.parse import unquote_plus
+    except ImportError: # 2.x
+        from urllib import unquote_plus as unquote_bytes
+
+        def unquote_plus(string, encoding, errors):
+            return unquote_bytes(string.encode(encoding)).decode(
+                encoding, errors
+            )
+    return unquote_plus
+
+
+def parse(data, encoding="utf-8"):
+    """
+    Returns an iterator over the ``(key, value)`` pairs of the given
+    ``application/x-www-form-urlencoded`` `data`, which may be a byte or
+    unicode string. Keys and values are decoded with `encoding` as they are
+    unquoted, :exc:`UnicodeDecodeError` is raised if they cannot be decoded.
+    Blank values are kept.
+
+    .. versionadded:: 2.2.0
+    """
+    if isinstance(data, bytes):
+        data = data.decode(encoding)
+    unquote_plus = _get_unquote_plus()
+    for field in data.split(u"&"):
+        if not field:
+            continue
+        key, _, value = field.partition(u"=")
+        yield (
+            unquote_plus(key, encoding, "strict"),
+            unquote_plus(value, encoding, "strict")
+        )
+
+
+def _pairs(data, encoding):
+    """
+    Returns an iterable of the ``(key, value)`` pairs in `data`.
+    """
+    if isinstance(data, (bytes, text_type)):
+        return parse(data, encoding)
+    elif hasattr(data, "lists"): # MultiDict, QueryDict
+        return _expand(data.lists())
+    elif hasattr(data, "items"):
+        return _expand(data.items())
+    return data
+
+
+def _expand(items):
+    for key, values in items:
+        if isinstance(values, list):
+            for value in values:
+                yield key, value
+        else:
+            yield key, values
+
+
+def _split_indices(segment, index_separator):
+    """
+    Splits a segment such as ``items-0`` into the name and the indices that
+    follow it.
+    """
+    parts = segment.split(index_separator)
+    indices = []
+    while len(parts) > 1 and parts[-1].isdigit():
+        indices.append(int(parts.pop()))
+    indices.reverse()
+    return index_separator.join(parts), indices
+
+
+def _unwrap(schema):
+    while issubclass(schema, Maybe):
+        schema = schema.member_schema
+    return schema
+
+
+_FORM, _LIST, _MAPPING, _COMPACT_MAPPING, _OTHER = range(5)
+
+
+def _get_kind(schema):
+    if issubclass(schema, Form):
+        return _FORM
+    elif issubclass(schema, List):
+        return _LIST
+    elif issubclass(schema, Mapping):
+        return _COMPACT_MAPPING if schema.compact else _MAPPING
+    return _OTHER
+
+
+#: The number of keys and prefixes whose paths are kept by :class:`_Paths`.
+_CACHE_SIZE = 1024
+
+
+class _Paths(object):
+    """
+    Looks up the paths of keys into forms of `schema`.
+
+    The path of a key is a tuple of the steps to the container of its
+    element, below the form, and the step of the element in that container,
+    which is `None` for values of lists of scalars given without an index.
+    Keys that do not point to an element have no path.
+    """
+    def __init__(self, schema, separator, index_separator):
+        self.separator = separator
+        self.index_separator = index_separator
+        # Looking up the kind of a schema with issubclass() is slow, as forms
+        # are abstract base classes, so the unwrapped schema and its kind are
+        # looked up by schema.
+        self.kinds = {}
+        # The schema, kind and steps of containers by the prefixes of keys
+        # that point to them, e.g. of ``items-0`` for ``items-0.name`` and
+        # ``items-0.price``.
+        self.containers = {u"": (schema, _FORM, ())}
+        #: Paths by key.
+        self.keys = {}
+
+    def _kind(self, schema):
+        try:
+            return self.kinds[schema]
+        except KeyError:
+            unwrapped = _unwrap(schema)
+            result = self.kinds[schema] = unwrapped, _get_kind(unwrapped)
+            return result
+
+    def _steps(self, schema, kind, segment):
+        """
+        Returns the steps the `segment` of a key consists of, when looking up
+        members of `schema`.
+        """
+        if kind == _FORM:
+            name, _, index = segment.rpartition(self.index_separator)
+            if segment in schema.member_schema:
+                return [segment]
+            elif index.isdigit() and name in schema.member_schema:
+                return [name, int(index)]
+            name, indices = _split_indices(segment, self.index_separator)
+            return [name] + indices
+        elif kind == _LIST:
+            if segment.isdigit():
+                return [int(segment)]
+            name, indices = _split_indices(segment, self.index_separator)
+            return indices if not name and indices else [segment]
+        elif (kind == _MAPPING or kind == _COMPACT_MAPPING) and not issubclass(
+                _unwrap(schema.member_schema[1]), List
+             ):
+            return [segment]
+        name, indices = _split_indices(segment, self.index_separator)
+        return [name] + indices
+
+    def _member(self, schema, kind, step):
+        """
+        Returns the unwrapped schema and kind of the member of a container of
+        `schema` identified by `step`, or `None` if there is none.
+        """
+        if kind == _FORM:
+            member_schema = schema.member_schema.get(step)
+            if member_schema is None:
+                return None
+        elif kind == _LIST:
+            if step.__class__ is not int:
+                return None
+            member_schema = schema.member_schema
+        elif kind == _MAPPING:
+            member_schema = schema.member_schema[1]
+        else:
+            return None
+        return self._kind(member_schema)
+
+    def _container(self, prefix):
+        """
+        Returns the schema, kind and steps of the container `prefix` points
+        to, or `None` if it does not point to one.
+        """
+        try:
+            return self.containers[prefix]
+        except KeyError:
+            pass
+        parent_prefix, _, segment = prefix.rpartition(self.separator)
+        container = self._container(parent_prefix)
+        if container is not None:
+            schema, kind, steps = container
+            for step in self._steps(schema, kind, segment):
+                member = self._member(schema, kind, step)
+                if member is None or member[1] == _OTHER:
+                    container = None
+                    break
+                schema, kind = member
+                steps += (step, )
+            else:
+                container = schema, kind, steps
+        if len(self.containers) < _CACHE_SIZE:
+            self.containers[prefix] = container
+        return container
+
+    def _resolve(self, key):
+        prefix, _, segment = key.rpartition(self.separator)
+        container = self._container(prefix)
+        if container is None:
+            return None
+        schema, kind, steps = container
+        segment_steps = self._steps(schema, kind, segment)
+        for step in segment_steps[:-1]:
+            member = self._member(schema, kind, step)
+            if member is None or member[1] == _OTHER:
+                return None
+            schema, kind = member
+            steps += (step, )
+        step = segment_steps[-1]
+        if kind == _COMPACT_MAPPING:
+            # Compact mappings are set from the raw values of their items.
+            return steps, step
+        member = self._member(schema, kind, step)
+        if member is None:
+            return None
+        elif member[1] == _OTHER:
+            return steps, step
+        elif member[1] == _LIST and \
+                self._kind(member[0].member_schema)[1] == _OTHER:
+            # Lists of scalars are set from all values of their key.
+            return steps + (step, ), None
+        return None
+
+    def get(self, key):
+        """
+        Returns the path of `key`, or `None` if it does not point to an
+        element.
+        """
+        try:
+            return self.keys[key]
+        except KeyError:
+            path = self._resolve(key)
+            if len(self.keys) < _CACHE_SIZE:
+                self.keys[key] = path
+            return path
+
+
+# _Paths by schema and separators, so that the paths of keys only have to
+# be looked up once for forms that are decoded repeatedly.
+_paths = WeakKeyDictionary()
+
+
+def _get_paths(schema, separator, index_separator):
+    try:
+        by_separators = _paths[schema]
+    except KeyError:
+        by_separators = _paths[schema] = {}
+    try:
+        return by_separators[separator, index_separator]
+    except KeyError:
+        paths = by_separators[separator, index_separator] = _Paths(
+            schema, separator, index_separator
+        )
+        return paths
+
+
+class _Node(object):
+    """
+    A container that elements are decoded into, the :class:`~relief.Maybe`
+    elements it is wrapped in and the nodes of its members that are
+    containers, by step.
+    """
+    __slots__ = ["element", "maybes", "children"]
+
+    def __init__(self, element, maybes):
+        self.element = element
+        self.maybes = maybes
+        self.children = {}
+
+    def finish(self):
+        for maybe in self.maybes:
+            maybe.raw_value = DEFERRED
+            maybe.is_valid = None
+
+
+class _FormNode(_Node):
+    __slots__ = ["present"]
+
+    def __init__(self, element, maybes):
+        super(_FormNode, self).__init__(element, maybes)
+        # The names of the members that have been set.
+        self.present = set()
+
+    def member(self, step):
+        self.present.add(step)
+        return self.element[step]
+
+    def set(self, step, raw_value):
+        self.present.add(step)
+        self.element[step].set_from_raw(raw_value)
+
+    def finish(self):
+        self.element._set_from_decoded_members(DEFERRED, present=self.present)
+        super(_FormNode, self).finish()
+
+
+class _ListNode(_Node):
+    __slots__ = ["elements", "unindexed"]
+
+    def __init__(self, element, maybes):
+        super(_ListNode, self).__init__(element, maybes)
+        # Elements by index, and those given without an index.
+        self.elements = {}
+        self.unindexed = []
+
+    def member(self, step):
+        element = self.elements.get(step)
+        if element is None:
+            element = self.elements[step] = self.element.member_schema()
+        return element
+
+    def set(self, step, raw_value):
+        if step is None:
+            self.unindexed.append(self.element.member_schema(raw_value))
+        else:
+            self.elements[step] = self.element.member_schema(raw_value)
+
+    def finish(self):
+        elements = self.elements
+        self.element._set_from_decoded_members(
+            [elements[index] for index in sorted(elements)] + self.unindexed
+        )
+        super(_ListNode, self).finish()
+
+
+class _MappingNode(_Node):
+    __slots__ = ["elements"]
+
+    def __init__(self, element, maybes):
+        super(_MappingNode, self).__init__(element, maybes)
+        # Elements of values by raw key.
+        self.elements = {}
+
+    def member(self, step):
+        element = self.elements.get(step)
+        if element is None:
+            element = self.elements[step] = self.element.member_schema[1]()
+        return element
+
+    def set(self, step, raw_value):
+        self.elements[step] = self.element.member_schema[1](raw_value)
+
+    def finish(self):
+        self.element._set_from_decoded_members(iteritems(self.elements))
+        super(_MappingNode, self).finish()
+
+
+class _CompactMappingNode(_Node):
+    __slots__ = ["raw_value"]
+
+    def __init__(self, element, maybes):
+        super(_CompactMappingNode, self).__init__(element, maybes)
+        # Compact mappings store the raw values of their items anyway.
+        self.raw_value = {}
+
+    def set(self, step, raw_value):
+        self.raw_value[step] = raw_value
+
+    def finish(self):
+        self.element.set_from_raw(self.raw_value)
+        super(_CompactMappingNode, self).finish()
+
+
+_node_types = {
+    _FORM: _FormNode,
+    _LIST: _ListNode,
+    _MAPPING: _MappingNode,
+    _COMPACT_MAPPING: _CompactMappingNode
+}
+
+
+def _child(paths, node, step):
+    """
+    Returns the node of the member of the container of `node` identified by
+    `step`, which has not been reached before.
+    """
+    element = node.member(step)
+    maybes = []
+    while isinstance(element, Maybe):
+        maybes.append(element)
+        element = element.member
+    child = node.children[step] = _node_types[
+        paths._kind(element.__class__)[1]
+    ](element, maybes)
+    return child
+
+
+def decode(form, data, encoding="utf-8", separator=u".", index_separator=u"-"):
+    """
+    Sets `form` from `data` with flattened keys and returns it::
+
+        >>> from relief import Form, List, Integer, Unicode
+        >>> Item = Form.of({"name": Unicode, "price": Integer})
+        >>> Order = Form.of({"number": Integer, "items": List.of(Item)})
+        >>> order = decode(
+        ...     Order(),
+        ...     b"number=1&items-0.name=Spam&items-0.price=2"
+        ... )
+        >>> order.value
+        {"number": 1, "items": [{"name": u"Spam", "price": 2}]}
+
+    `data` may be ``application/x-www-form-urlencoded`` data as a byte or
+    unicode string, which is decoded with `encoding` (see :func:`parse`), a
+    multi-dict with a ``lists()`` method such as those of Werkzeug and
+    Django, a dictionary whose values are single values or lists of them, or
+    an iterable of ``(key, value)`` pairs.
+
+    Keys consist of the names of members of :class:`~relief.Form` elements
+    and keys of :class:`~relief.Dict` and :class:`~relief.OrderedDict`
+    elements separated by `separator`. Indices of :class:`~relief.List`
+    elements are appended to the preceding name with `index_separator`, or
+    are separated by `separator` as well. :class:`~relief.Maybe` elements are
+    looked through. Lists of scalar elements are set from all values of their
+    key, if no index is given. Keys that do not point to an element of `form`
+    are ignored.
+
+    Each value is routed to its element through the schema of `form` and the
+    element is set from it, the paths of keys are looked up once and kept
+    for later calls with forms of the same schema. Elements of lists are
+    ordered by their indices. Once all values have been set, the containers
+    they are in are completed as :meth:`~relief.Element.set_from_raw` would
+    have: :class:`~relief.Form` elements are
+    :data:`~relief.NotUnserializable` unless they are
+    :attr:`~relief.Form.sparse` or all their members are given. No raw value
+    is built for containers, their :attr:`~relief.Element.raw_value` is
+    computed from their value, as after :meth:`FieldMask.set_from_raw
+    <relief.schema.masks.FieldMask.set_from_raw>`.
+
+    .. versionadded:: 2.2.0
+    """
+    paths = _get_paths(form.__class__, separator, index_separator)
+    root = _FormNode(form, [])
+    # Nodes are completed in the order they have been reached, no container
+    # depends on the members of another one being completed first.
+    nodes = [root]
+    get_path = paths.get
+    for key, raw_value in _pairs(data, encoding):
+        path = get_path(key)
+        if path is None:
+            continue
+        steps, step = path
+        node = root
+        for container_step in steps:
+            child = node.children.get(container_step)
+            if child is None:
+                child = _child(paths, node, container_step)
+                nodes.append(child)
+            node = child
+        node.set(step, raw_value)
+    for node in nodes:
+        node.finish()
+    return form
+
+
+__all__ = ["decode", "parse"]
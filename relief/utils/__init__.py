@@ -7,6 +7,8 @@
     :license: BSD, see LICENSE.rst for details
 """
 import sys
+import types
+from functools import wraps
 
 from relief.utils.idd import InheritingDictDescriptor
 
@@ -14,19 +16,102 @@ from relief.utils.idd import InheritingDictDescriptor
 class class_cloner(classmethod):
     """
     Like :class:`classmethod` but calls the method with a clone of the class.
+
+    The class that is returned remembers how it was created as its `_recipe`,
+    a tuple of the class the method was called on, the name of the method and
+    the arguments, so that it can be created again when it is unpickled.
+
+    If the class has a `_clone_metaclasses` mapping, the clone is created with
+    the metaclass it maps the metaclass of the class to.
+    """
+    def __init__(self, function):
+        name = function.__name__
+
+        @wraps(function)
+        def clone_method(cls, *args, **kwargs):
+            # Iterators would be consumed, before the recipe is pickled.
+            if args:
+                args = tuple([
+                    list(arg) if _is_iterator(arg) else arg for arg in args
+                ])
+            recipe = (cls, name, args, kwargs)
+            attributes = {
+                "__doc__": cls.__doc__,
+                # module name in the scope of the caller
+                "__module__": sys._getframe(1).f_globals.get(
+                    "__name__", "__main__"
+                ),
+                "_recipe": recipe
+            }
+            metaclass = cls.__class__
+            clone_metaclasses = getattr(cls, "_clone_metaclasses", None)
+            if clone_metaclasses is not None:
+                metaclass = clone_metaclasses[metaclass]
+            clone = metaclass(cls.__name__, (cls, ), attributes)
+            result = function(clone, *args, **kwargs)
+            if result is not clone and isinstance(result, type) and \
+                    issubclass(result, clone):
+                result._recipe = recipe
+            return result
+        super(class_cloner, self).__init__(clone_method)
+
+
+def _is_iterator(obj):
+    try:
+        return iter(obj) is obj
+    except TypeError:
+        return False
+
+
+class hidden_attribute(object):
+    """
+    Hides the attribute `name` a class inherits, instances behave as if they do
+    not have the attribute at all.
+
+    Unlike overriding :meth:`__getattribute__` this does not slow down access
+    to any other attribute.
     """
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, cls):
+        if instance is None:
+            return self
+        raise AttributeError(self.name)
+
+
+class imported_attribute(object):
+    """
+    A class attribute that is the attribute `name` of the module `module_name`,
+    which is only imported, once the attribute is accessed.
+
+    The first access replaces the attribute with its value on the class that
+    defines it, so that later accesses are as fast as those of any other
+    attribute. Functions are wrapped with :func:`staticmethod`.
+    """
+    def __init__(self, module_name, name):
+        self.module_name = module_name
+        self.name = name
+
     def __get__(self, instance, cls):
-        attributes = {
-            "__doc__": getattr(cls, "__doc__", None),
-            # module name in the scope of the caller
-            "__module__": sys._getframe(1).f_globals.get("__name__", "__main__")
-        }
-        clone = cls.__class__(cls.__name__, (cls, ), attributes)
-        return super(class_cloner, self).__get__(instance, clone)
+        module = __import__(self.module_name, fromlist=[self.name])
+        value = getattr(module, self.name)
+        for base in cls.__mro__:
+            for attribute, descriptor in list(base.__dict__.items()):
+                if descriptor is self:
+                    setattr(base, attribute, (
+                        staticmethod(value)
+                        if isinstance(value, types.FunctionType) else value
+                    ))
+                    return value
+        return value
 
 
 def as_singleton(cls):
     return cls()
 
 
-__all__ = ['InheritingDictDescriptor', 'class_cloner', 'as_singleton']
+__all__ = [
+    'InheritingDictDescriptor', 'class_cloner', 'hidden_attribute',
+    'imported_attribute', 'as_singleton'
+]
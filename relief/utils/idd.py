@@ -33,6 +33,12 @@ class InheritingDictDescriptor(object):
     def __set__(self, instance, value):
         instance.__dict__[self.name] = value
 
+    def __getstate__(self):
+        return {"name": self.name, "values": self.values}
+
+    def __setstate__(self, state):
+        self.__init__(state["name"], **state["values"])
+
 
 class MutableMapping(MutableMappingBase):
     def __len__(self):
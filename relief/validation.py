@@ -6,16 +6,109 @@
     :copyright: 2013 by Daniel Neuhäuser
     :license: BSD, see LICENSE.rst for details
 """
-import re
-try:
-    from urllib.parse import urlparse
-except ImportError:
-    from urlparse import urlparse
+from operator import getitem
 
 from relief import Unspecified, NotUnserializable
 
 
+def _get_urlparse():
+    # urllib is only imported once it's needed, importing it is slower than
+    # importing this entire module.
+    try:
+        from urllib.parse import urlparse
+    except ImportError:
+        from urlparse import urlparse
+    return urlparse
+
+
+def _is_url(value, urlparse=None):
+    parsed = (urlparse or _get_urlparse())(value)
+    return bool(parsed.scheme and parsed.netloc)
+
+
+def _is_probably_an_email_address(value):
+    if u"@" in value:
+        host = value.split(u"@", 1)[1]
+        if u"." in host:
+            parts = host.split(u".")
+            if len(parts) >= 2:
+                return True
+    return False
+
+
+def _length(value, limit):
+    # The length of file contents is measured by reading them, which can stop
+    # once it's known to exceed the limit the validator compares it with.
+    from relief.schema.files import FileContent
+    if isinstance(value, FileContent):
+        return value.length(limit)
+    return len(value)
+
+
+def _get_length(elements, limit):
+    # Returns the function validate_batch() methods should use to get the
+    # length of the values of elements, len() unless there are file contents.
+    from relief.schema.files import BytesFile
+    if any(issubclass(cls, BytesFile) for cls in set(map(type, elements))):
+        return lambda value: _length(value, limit)
+    return len
+
+
+def _matches(regex, value):
+    from relief.schema.files import FileContent
+    if isinstance(value, FileContent):
+        return value.matches(regex)
+    return regex.match(value) is not None
+
+
+def _get_matches(elements, regex):
+    # Like _get_length(), returns the function validate_batch() should use to
+    # match the values of elements, regex.match() unless there are files.
+    from relief.schema.files import BytesFile
+    if any(issubclass(cls, BytesFile) for cls in set(map(type, elements))):
+        return lambda value: _matches(regex, value)
+    return regex.match
+
+
+def _members_equal(element, a, b, get_member):
+    """
+    Returns `True` if the members `a` and `b` of the container `element`, as
+    returned by `get_member`, have usable and equal values. Only the compared
+    members are looked at, the value of `element` is not built.
+    """
+    # Containers whose own value is unspecified or not unserializable.
+    if element._state is not None:
+        return False
+    try:
+        a = get_member(element, a).value
+        b = get_member(element, b).value
+    except LookupError:
+        return False
+    for value in [a, b]:
+        if value is Unspecified or value is NotUnserializable:
+            return False
+    return a == b
+
+
+def pure(validator):
+    """
+    Marks the given `validator` function as pure: its result and the errors it
+    notes depend only on the value of the element, which allows memoizing
+    them, see :attr:`relief.Element.memoize`. Returns `validator`.
+
+    .. versionadded:: 2.2.0
+    """
+    validator.pure = True
+    return validator
+
+
 class Validator(object):
+    #: `True` if the result of :meth:`validate` and the errors it notes depend
+    #: only on the value of the element, see :func:`pure`.
+    #:
+    #: .. versionadded:: 2.2.0
+    pure = False
+
     def validate(self, element, context):
         return False
 
@@ -33,11 +126,31 @@ class Validator(object):
     def __call__(self, element, context):
         return self.validate(element, context)
 
+    def _validate_values(self, elements, is_valid, error):
+        # Used by validate_batch() methods of validators that only look at the
+        # value, `is_valid` is called with the usable values and `error` is
+        # noted on the elements that fail.
+        results = []
+        append = results.append
+        for element in elements:
+            value = element.value
+            if (value is Unspecified or
+                value is NotUnserializable or
+                not is_valid(value)
+               ):
+                element.errors.append(error)
+                append(False)
+            else:
+                append(True)
+        return results
+
 
 class Present(Validator):
     """
     Validator that fails with :attr:`message` if the value is unspecified.
     """
+    pure = True
+
     #: Message that is stored in :attr:`Element.errors`.
     message = u"May not be blank."
 
@@ -53,6 +166,8 @@ class Converted(Validator):
     Validator that fails with :attr:`message` if the value is not
     unserializable.
     """
+    pure = True
+
     #: Message that is stored in :attr:`Element.errors`.
     message = u"Not a valid value."
 
@@ -67,6 +182,8 @@ class IsTrue(Validator):
     """
     Validator that fails with :attr:`message` if the value is false-ish.
     """
+    pure = True
+
     #: Message that is stored in :attr:`Element.errors`.
     message = u"Must be true."
 
@@ -81,6 +198,8 @@ class IsFalse(Validator):
     """
     Validator that fails with :attr:`message` if the value is true-ish.
     """
+    pure = True
+
     #: Message that is stored in :attr:`Element.errors`.
     message = u"Must be false."
 
@@ -95,7 +214,14 @@ class ShorterThan(Validator):
     """
     Validator that fails with :attr:`message` if the length of the value is
     equal to or longer than the given `upperbound`.
+
+    .. versionchanged:: 2.2.0
+       Contents of :class:`~relief.BytesFile` and :class:`~relief.UnicodeFile`
+       elements are only read until their length is known to exceed
+       `upperbound`.
     """
+    pure = True
+
     #: Message that is stored in :attr:`Element.errors`. ``{upperbound}`` in
     #: the message is substituted with the given `upperbound`.
     message = u"Must be shorter than {upperbound}."
@@ -104,7 +230,9 @@ class ShorterThan(Validator):
         self.upperbound = upperbound
 
     def validate(self, element, context):
-        if self.is_unusable(element) or len(element.value) >= self.upperbound:
+        if (self.is_unusable(element) or
+            _length(element.value, self.upperbound) >= self.upperbound
+           ):
             self.note_error(
                 element,
                 self.message,
@@ -113,12 +241,28 @@ class ShorterThan(Validator):
             return False
         return True
 
+    def validate_batch(self, elements, context):
+        upperbound = self.upperbound
+        length = _get_length(elements, upperbound)
+        return self._validate_values(
+            elements,
+            lambda value: length(value) < upperbound,
+            self.message.format(upperbound=upperbound)
+        )
+
 
 class LongerThan(Validator):
     """
     Validator that fails with :attr:`message` if the length of the value is
     equal to or shorter than the given `lowerbound`.
+
+    .. versionchanged:: 2.2.0
+       Contents of :class:`~relief.BytesFile` and :class:`~relief.UnicodeFile`
+       elements are only read until their length is known to exceed
+       `lowerbound`.
     """
+    pure = True
+
     #: Message that is stored in :attr:`Element.errors`. ``{lowerbound}`` in
     #: the message is substituted with the given `lowerbound`.
     message = u"Must be longer than {lowerbound}."
@@ -127,7 +271,9 @@ class LongerThan(Validator):
         self.lowerbound = lowerbound
 
     def validate(self, element, context):
-        if self.is_unusable(element) or len(element.value) <= self.lowerbound:
+        if (self.is_unusable(element) or
+            _length(element.value, self.lowerbound) <= self.lowerbound
+           ):
             self.note_error(
                 element,
                 self.message,
@@ -136,12 +282,28 @@ class LongerThan(Validator):
             return False
         return True
 
+    def validate_batch(self, elements, context):
+        lowerbound = self.lowerbound
+        length = _get_length(elements, lowerbound)
+        return self._validate_values(
+            elements,
+            lambda value: length(value) > lowerbound,
+            self.message.format(lowerbound=lowerbound)
+        )
+
 
 class LengthWithinRange(Validator):
     """
     Validator that fails with :attr:`message` if the length of the value is
     less than or equal to `start` or greater than or equal to `end`.
+
+    .. versionchanged:: 2.2.0
+       Contents of :class:`~relief.BytesFile` and :class:`~relief.UnicodeFile`
+       elements are only read until their length is known to exceed
+       `end`.
     """
+    pure = True
+
     #: Message that is stored in :attr:`Element.errors`. ``{start}`` and
     #: ``{end}`` is substituted with the given `start` and `end`.
     message = u"Must be longer than {start} and shorter than {end}."
@@ -152,7 +314,7 @@ class LengthWithinRange(Validator):
 
     def validate(self, element, context):
         if (not self.is_unusable(element) and
-            self.start < len(element.value) < self.end
+            self.start < _length(element.value, self.end) < self.end
            ):
             return True
         self.note_error(
@@ -162,12 +324,23 @@ class LengthWithinRange(Validator):
         )
         return False
 
+    def validate_batch(self, elements, context):
+        start, end = self.start, self.end
+        length = _get_length(elements, end)
+        return self._validate_values(
+            elements,
+            lambda value: start < length(value) < end,
+            self.message.format(start=start, end=end)
+        )
+
 
 class ContainedIn(Validator):
     """
     A validator that fails with ``"Not a valid value."`` if the value is not
     contained in `options`.
     """
+    pure = True
+
     #: Message that is stored in :attr:`Element.errors`.
     message = u"Not a valid value."
 
@@ -186,6 +359,8 @@ class LessThan(Validator):
     Validator that fails with :attr:`message` if the value is greater than or
     equal to `upperbound`.
     """
+    pure = True
+
     #: Message that is stored in :attr:`Element.errors`. ``{upperbound}`` is
     #: substituted with the given `upperbound`.
     message = u"Must be less than {upperbound}."
@@ -209,6 +384,8 @@ class GreaterThan(Validator):
     Validator that fails with :attr:`message` if the value is less than or
     equal to `lowerbound`.
     """
+    pure = True
+
     #: Message that is stored in the :attr:`Element.errors`. ``{lowerbound}``
     #: is substituted with the given `lowerbound`.
     message = u"Must be greater than {lowerbound}."
@@ -232,6 +409,8 @@ class WithinRange(Validator):
     Validator that fails with :attr:`message` if the value is less than or
     equal to `start` or greater than or equal to `end.`
     """
+    pure = True
+
     #: Message that is stored in :attr:`Element.errors`. ``{start}`` and
     #: ``{end}`` are substituted with the given `start` and `end`.
     message = u"Must be greater than {start} and shorter than {end}."
@@ -259,6 +438,14 @@ class ItemsEqual(Validator):
     The items are defined with the tuples `a` and `b` each of which consist of
     two elements ``(label, key)``. The `key` is used to determine the item to
     compare and the `label` is used for substitution in the message.
+
+    If the element is a container, such as a :class:`~relief.Dict` or
+    :class:`~relief.Form`, the elements of the items are compared directly and
+    the value of the container is not built, the items need to be usable but
+    the other members do not.
+
+    .. versionchanged:: 2.2.0
+       Only the compared items of containers need to be usable.
     """
     #: Message that is stored in :attr:`Element.errors`. ``{a}`` and ``{b}``
     #: are substituted with the labels in the given `a` and `b`.
@@ -269,9 +456,15 @@ class ItemsEqual(Validator):
         self.b = b
 
     def validate(self, element, context):
-        if (not self.is_unusable(element) and
-            element.value[self.a[1]] == element.value[self.b[1]]
-           ):
+        from relief.schema.core import Container
+        if isinstance(element, Container):
+            is_valid = _members_equal(element, self.a[1], self.b[1], getitem)
+        else:
+            is_valid = (
+                not self.is_unusable(element) and
+                element.value[self.a[1]] == element.value[self.b[1]]
+            )
+        if is_valid:
             return True
         self.note_error(
             element,
@@ -290,6 +483,9 @@ class AttributesEqual(Validator):
     `a` and `b` each of which consists of two element in the form ``(label,
     attribute_name)``. `attribute_name` is used to determine the attributes to
     compare and the `label` is used for substitution in the message.
+
+    .. versionchanged:: 2.2.0
+       Only the compared attributes of containers need to be usable.
     """
     #: Message that is stored in :attr:`Element.errors`. ``{a}`` and ``{b}``
     #: are substituted with the labels in the given `a` and `b`.
@@ -300,9 +496,16 @@ class AttributesEqual(Validator):
         self.b = b
 
     def validate(self, element, context):
-        if (not self.is_unusable(element) and
-            getattr(element, self.a[1]).value == getattr(element, self.b[1]).value
-           ):
+        from relief.schema.core import Container
+        if isinstance(element, Container):
+            is_valid = _members_equal(element, self.a[1], self.b[1], getattr)
+        else:
+            is_valid = (
+                not self.is_unusable(element) and
+                getattr(element, self.a[1]).value ==
+                getattr(element, self.b[1]).value
+            )
+        if is_valid:
             return True
         self.note_error(
             element,
@@ -326,22 +529,27 @@ class ProbablyAnEmailAddress(Validator):
     If you want to truly validate e-mail addresses you need to send an e-mail
     and wait for a response.
     """
+    pure = True
+
     #: Message that is stored in the :attr:`Element.errors`.
     message = u"Must be a valid e-mail address."
 
     def validate(self, element, context):
-        if not self.is_unusable(element) and u"@" in element.value:
-            host = element.value.split(u"@", 1)[1]
-            if u"." in host:
-                parts = host.split(u".")
-                if len(parts) >= 2:
-                    return True
+        if (not self.is_unusable(element) and
+            _is_probably_an_email_address(element.value)
+           ):
+            return True
         self.note_error(
             element,
             self.message
         )
         return False
 
+    def validate_batch(self, elements, context):
+        return self._validate_values(
+            elements, _is_probably_an_email_address, self.message.format()
+        )
+
 
 class MatchesRegex(Validator):
     """
@@ -349,7 +557,13 @@ class MatchesRegex(Validator):
     given `regex`.
 
     .. versionadded:: 2.1.0
+
+    .. versionchanged:: 2.2.0
+       Contents of :class:`~relief.BytesFile` and :class:`~relief.UnicodeFile`
+       elements are matched with :meth:`~relief.schema.files.FileContent.matches`.
     """
+    pure = True
+
     #: The default regular expression used.
     regex = u''
 
@@ -357,16 +571,26 @@ class MatchesRegex(Validator):
     message = u'Must be a valid value.'
 
     def __init__(self, regex=None):
+        import re
         if regex is None:
             regex = self.regex
         self.regex = re.compile(regex)
 
     def validate(self, element, context):
-        if not self.is_unusable(element) and self.regex.match(element.value):
+        if (not self.is_unusable(element) and
+            _matches(self.regex, element.value)
+           ):
             return True
         self.note_error(element, self.message)
         return False
 
+    def validate_batch(self, elements, context):
+        return self._validate_values(
+            elements,
+            _get_matches(elements, self.regex),
+            self.message.format()
+        )
+
 
 class IsURL(Validator):
     """
@@ -375,13 +599,21 @@ class IsURL(Validator):
 
     .. versionadded:: 2.1.0
     """
+    pure = True
+
     #: Message that is stored in :attr:`Element.errors`.
     message = u'Must be a URL.'
 
     def validate(self, element, context):
-        if not self.is_unusable(element):
-            parsed = urlparse(element.value)
-            if parsed.scheme and parsed.netloc:
-                return True
+        if not self.is_unusable(element) and _is_url(element.value):
+            return True
         self.note_error(element, self.message)
         return False
+
+    def validate_batch(self, elements, context):
+        urlparse = _get_urlparse()
+        return self._validate_values(
+            elements,
+            lambda value: _is_url(value, urlparse),
+            self.message.format()
+        )
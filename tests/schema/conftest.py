@@ -6,6 +6,8 @@
     :copyright: 2013 by Daniel Neuhäuser
     :license: BSD, see LICENSE.rst for details
 """
+import pickle
+
 from relief.validation import Present, Converted
 
 
@@ -32,6 +34,23 @@ class BaseElementTest(object):
         b = a.with_properties(bar=2)
         assert b.properties == {'foo': 1, 'bar': 2}
 
+    def test_pickle(self, element_cls, possible_value):
+        element = element_cls(possible_value)
+        element.validate()
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            unpickled, raw_value, value = pickle.loads(pickle.dumps(
+                (element, element.raw_value, element.value), protocol
+            ))
+            assert type(unpickled) is element_cls
+            assert unpickled.raw_value == raw_value
+            assert unpickled.value == value
+            assert unpickled.is_valid == element.is_valid
+
+        element = element_cls()
+        element.set_from_native(possible_value)
+        unpickled, value = pickle.loads(pickle.dumps((element, possible_value)))
+        assert unpickled.value == value
+
     def test_set_from_native_custom_serialize(self, element_cls, possible_value):
         class FooElement(element_cls):
             def serialize(self, value):
@@ -77,6 +96,18 @@ class ValidatedByTestMixin(object):
         assert element.errors == [u"May not be blank."]
 
 
+    def test_validate_errors(self, element_cls, possible_value):
+        errors = []
+        element = element_cls.validated_by([Present()])()
+        assert not element.validate(errors=errors)
+        assert errors == [((), u"May not be blank.")]
+
+        errors = []
+        element = element_cls.validated_by([Present()])(possible_value)
+        assert element.validate(errors=errors)
+        assert errors == []
+
+
 class DefaultTestMixin(object):
     def test_default(self, element_cls, possible_value):
         element = element_cls.using(default=possible_value)()
@@ -90,4 +121,22 @@ class DefaultTestMixin(object):
 
 
 class ElementTest(DefaultTestMixin, ValidatedByTestMixin, BaseElementTest):
-    pass
+    def test_set_from_native_serializes_lazily(self, element_cls, possible_value):
+        calls = []
+
+        class CountingElement(element_cls):
+            def serialize(self, value):
+                calls.append(value)
+                return super(CountingElement, self).serialize(value)
+
+        element = CountingElement()
+        del calls[:]
+        element.set_from_native(possible_value)
+        assert calls == []
+        assert element.raw_value == possible_value
+        assert element.raw_value == possible_value
+        assert calls == [possible_value]
+
+        element.set_from_raw(possible_value)
+        assert element.raw_value == possible_value
+        assert calls == [possible_value]
@@ -6,13 +6,36 @@
     :copyright: 2013 by Daniel Neuhäuser
     :license: BSD, see LICENSE.rst for details
 """
+import pickle
+import sqlite3
+import binascii
+from abc import ABCMeta
+
 import pytest
 
-from relief import Unspecified, Element
+from relief import (
+    Unspecified, Element, ValidationContext, Integer, Unicode, List, Dict,
+    Tuple, Form
+)
+from relief.validation import IsTrue, ShorterThan
+from relief.schema.core import validate_batch
 
+from tests.test_import import run
 from tests.schema.conftest import ElementTest
 
 
+# abc.ABC does not exist before Python 3.4.
+ABC = ABCMeta("ABC", (object, ), {})
+
+
+class Order(Form):
+    number = Integer
+    items = List.of(Dict.of(Unicode, Integer).using(compact=True))
+
+    def validate_number(self, element, context):
+        return element.value > 0
+
+
 class TestElement(ElementTest):
     @pytest.fixture
     def element_cls(self):
@@ -44,3 +67,254 @@ class TestElement(ElementTest):
         element.set_from_raw(1)
         assert element.value == 1
         assert element.raw_value == 1
+
+
+class TestPickle(object):
+    def test_importable_class(self):
+        assert pickle.loads(pickle.dumps(Integer)) is Integer
+        assert pickle.loads(pickle.dumps(Order)) is Order
+
+    def test_cloned_class(self):
+        schemas = [
+            Integer.using(default=1),
+            Integer.validated_by([IsTrue()]),
+            Integer.with_properties(foo=1),
+            List.of(Integer),
+            Tuple.of(Integer, Unicode),
+            Form.of({"a": Integer, "b": List.of(Unicode)})
+        ]
+        for schema in schemas:
+            unpickled = pickle.loads(pickle.dumps(schema))
+            # Schemas pickled in the same process are not created again.
+            assert unpickled is schema
+
+    def test_cloned_class_in_other_process(self):
+        schema = Form.of(
+            [("a", Integer.with_properties(foo=1)), ("b", List.of(Unicode))]
+        )
+        data = binascii.hexlify(pickle.dumps((schema, schema))).decode("ascii")
+        assert run(
+            "import pickle, binascii\n"
+            "a, b = pickle.loads(binascii.unhexlify(%r))\n"
+            "c = pickle.loads(binascii.unhexlify(%r))[0]\n"
+            "print('%%s %%s %%s' %% (a is b is c, list(a.member_schema), "
+            "a.member_schema['a'].properties['foo']))" % (data, data)
+        ) == "True ['a', 'b'] 1"
+
+    def test_local_class(self):
+        class Local(Integer):
+            pass
+        # Pickled like any other class that cannot be imported.
+        with pytest.raises((AttributeError, pickle.PicklingError)):
+            pickle.dumps(Local)
+
+    def test_abc_mixin(self):
+        class AbstractInteger(Integer, ABC):
+            pass
+        assert type(AbstractInteger) is ABCMeta
+        assert type(Integer) is type
+        assert isinstance(AbstractInteger(1), Integer)
+
+        class AbstractForm(Form, ABC):
+            number = Integer
+        assert AbstractForm({"number": 1}).value == {"number": 1}
+
+        schema = Integer.using(default=1)
+        assert issubclass(type(schema), type(Integer))
+        assert pickle.loads(pickle.dumps(schema)) is schema
+
+    def test_form_with_validate_methods(self):
+        order = Order({"number": 0, "items": [{u"a": 1}]})
+        assert not order.validate()
+        unpickled = pickle.loads(pickle.dumps(order))
+        assert unpickled.value == {"number": 0, "items": [{u"a": 1}]}
+        assert not unpickled.is_valid
+        assert not unpickled["number"].is_valid
+        unpickled["number"].set_from_raw(1)
+        assert unpickled.validate()
+
+
+class TestValidationContext(object):
+    def test_dict(self):
+        context = ValidationContext(foo=1)
+        assert context == {"foo": 1}
+        assert repr(context) == "ValidationContext({'foo': 1})"
+
+    def test_memo(self):
+        context = ValidationContext()
+        owner = object()
+        memo = context.memo(owner)
+        assert memo == {}
+        memo["a"] = 1
+        assert context.memo(owner) is memo
+        assert context.memo(object(), set) == set()
+        assert context == {}
+
+        context.clear_memos()
+        assert context.memo(owner) == {}
+
+    def test_shared_by_tree(self):
+        contexts = []
+
+        def record(element, context):
+            contexts.append(context)
+            return True
+        Recorded = Integer.validated_by([record])
+        Schema = Form.of({
+            "a": Recorded,
+            "b": List.of(Recorded),
+            "c": Dict.of(Unicode, Recorded)
+        })
+        element = Schema({"a": 1, "b": [2, 3], "c": {u"d": 4}})
+        assert element.validate()
+        assert len(contexts) == 4
+        assert isinstance(contexts[0], ValidationContext)
+        assert all(context is contexts[0] for context in contexts)
+
+        del contexts[:]
+        context = ValidationContext()
+        for _ in range(2):
+            assert element.validate(context)
+        assert len(contexts) == 8
+        assert all(c is context for c in contexts)
+
+    def test_memo_shared_across_elements(self):
+        lookups = []
+
+        class Known(object):
+            def __call__(self, element, context):
+                names = context.memo(self, set)
+                if not names:
+                    lookups.append(1)
+                    names.update([u"a", u"b"])
+                return element.value in names
+        Names = List.of(Unicode.validated_by([Known()]))
+        context = ValidationContext()
+        assert Names([u"a", u"b"]).validate(context)
+        assert not Names([u"c"]).validate(context)
+        assert lookups == [1]
+
+
+class SKUExists(object):
+    """
+    Checks that the SKU of an order line exists in a catalog, with one query
+    for all lines that are validated together.
+    """
+    def __init__(self, connection):
+        self.connection = connection
+        self.queries = 0
+
+    def __call__(self, element, context):
+        return self.validate_batch([element], context)[0]
+
+    def validate_batch(self, elements, context):
+        skus = [element["sku"].value for element in elements]
+        unique = list(set(skus))
+        self.queries += 1
+        known = set(row[0] for row in self.connection.execute(
+            "SELECT sku FROM catalog WHERE sku IN (%s)" % (
+                ", ".join("?" * len(unique))
+            ),
+            unique
+        ))
+        results = []
+        for element, sku in zip(elements, skus):
+            results.append(sku in known)
+            if sku not in known:
+                element.errors.append(u"Unknown SKU.")
+        return results
+
+
+class TestValidateBatch(object):
+    @pytest.fixture
+    def connection(self):
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE catalog (sku TEXT PRIMARY KEY)")
+        connection.executemany(
+            "INSERT INTO catalog VALUES (?)",
+            [(u"sku-%d" % i, ) for i in range(0, 100, 2)]
+        )
+        yield connection
+        connection.close()
+
+    def test_containers(self, connection):
+        validator = SKUExists(connection)
+        Line = Form.of({
+            "sku": Unicode,
+            "quantity": Integer.validated_by([IsTrue()])
+        }).validated_by([validator])
+        Lines = List.of(Line)
+        lines = Lines([
+            {"sku": u"sku-%d" % i, "quantity": i % 3} for i in range(10)
+        ])
+        errors = []
+        assert not lines.validate(errors=errors)
+        assert validator.queries == 1
+        assert [line.is_valid for line in lines] == [
+            False, False, True, False, True, False, False, False, True, False
+        ]
+        assert sorted(errors) == sorted(
+            [((i, "quantity"), u"Must be true.") for i in range(0, 10, 3)] +
+            [((i, ), u"Unknown SKU.") for i in range(1, 10, 2)]
+        )
+        assert lines[1].errors == [u"Unknown SKU."]
+
+        lines = Lines([{"sku": u"sku-2", "quantity": 1}] * 5000)
+        assert lines.validate()
+        assert validator.queries == 2
+
+    def test_function(self, connection):
+        validator = SKUExists(connection)
+        Line = Form.of({"sku": Unicode}).validated_by([validator])
+        lines = [Line({"sku": u"sku-%d" % i}) for i in range(4)]
+        errors = []
+        assert not validate_batch(list(enumerate(lines)), {}, errors)
+        assert validator.queries == 1
+        assert errors == [((1, ), u"Unknown SKU."), ((3, ), u"Unknown SKU.")]
+        assert [line.is_valid for line in lines] == [True, False, True, False]
+
+    def test_short_circuits(self):
+        calls = []
+
+        class GreaterThanOne(object):
+            def __call__(self, element, context):
+                return self.validate_batch([element], context)[0]
+
+            def validate_batch(self, elements, context):
+                values = [element.value for element in elements]
+                calls.append(values)
+                return [value > 1 for value in values]
+        Schema = List.of(Integer.validated_by([GreaterThanOne()] * 2))
+        assert not Schema([1, 2, 3]).validate()
+        assert calls == [[1, 2, 3], [2, 3]]
+
+    def test_overridden_validator(self):
+        class NoX(ShorterThan):
+            def validate(self, element, context):
+                if u"x" in element.value:
+                    self.note_error(element, u"No x.")
+                    return False
+                return super(NoX, self).validate(element, context)
+
+        class Noting(ShorterThan):
+            def note_error(self, element, error, substitutions=None):
+                element.errors.append(u"Too long!")
+
+        strings = List.of(Unicode.validated_by([NoX(3)]))([u"xa", u"ab"])
+        assert not strings.validate()
+        assert [string.errors for string in strings] == [[u"No x."], []]
+
+        strings = List.of(Unicode.validated_by([Noting(2)]))([u"abc"])
+        assert not strings.validate()
+        assert strings[0].errors == [u"Too long!"]
+
+    def test_overridden_validate(self):
+        class Line(Form.of({"quantity": Integer})):
+            def validate(self, context=None, errors=None):
+                self.is_valid = self["quantity"].value < 3
+                return self.is_valid
+
+        Lines = List.of(Line.validated_by([ShorterThan(5)]))
+        lines = Lines([{"quantity": 3}, {"quantity": 1}])
+        assert not lines.validate()
+        assert [line.is_valid for line in lines] == [False, True]
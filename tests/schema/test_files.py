@@ -0,0 +1,201 @@
+# coding: utf-8
+"""
+    tests.schema.test_files
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import io
+import re
+import hashlib
+from tempfile import SpooledTemporaryFile
+
+import pytest
+
+from relief import (
+    BytesFile, UnicodeFile, List, Unspecified, NotUnserializable
+)
+from relief.schema.files import FileContent, TextContent
+from relief.validation import (
+    ShorterThan, LongerThan, LengthWithinRange, MatchesRegex
+)
+
+
+class Unseekable(io.RawIOBase):
+    def __init__(self, content):
+        self.content = io.BytesIO(content)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.content.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def tell(self):
+        raise io.UnsupportedOperation("tell")
+
+
+class CountingBytesIO(io.BytesIO):
+    def __init__(self, content):
+        super(CountingBytesIO, self).__init__(content)
+        self.read_bytes = 0
+
+    def read(self, size=-1):
+        data = super(CountingBytesIO, self).read(size)
+        self.read_bytes += len(data)
+        return data
+
+
+@pytest.fixture
+def path(tmpdir):
+    path = tmpdir.join("content")
+    path.write_binary(u"hëllö".encode("utf-8") * 1000)
+    return str(path)
+
+
+class TestBytesFile(object):
+    def test_default(self):
+        element = BytesFile()
+        assert element.value is Unspecified
+
+    def test_file(self):
+        raw_value = io.BytesIO(b"foobar")
+        raw_value.seek(3)
+        element = BytesFile(raw_value)
+        assert element.value.source is raw_value
+        assert element.value.read() == b"bar"
+
+    def test_bytes(self):
+        element = BytesFile(b"foobar")
+        assert element.value.read() == b"foobar"
+
+    def test_unicode(self):
+        element = BytesFile(u"foobar")
+        assert element.value.read() == b"foobar"
+
+    def test_path(self, path):
+        content = FileContent(path)
+        element = BytesFile(content)
+        assert element.value is content
+        assert element.value._stream is None
+        assert element.value.read(6) == u"hëllö".encode("utf-8")[:6]
+        element.value.close()
+
+    def test_not_unserializable(self):
+        element = BytesFile(1)
+        assert element.value is NotUnserializable
+        element = BytesFile(TextContent(io.BytesIO(b"foo"), "utf-8"))
+        assert element.value is NotUnserializable
+
+    def test_validate(self, path):
+        Validated = BytesFile.validated_by([
+            LengthWithinRange(6999, 7001), MatchesRegex(b"(h\xc3\xabll\xc3\xb6)+$")
+        ])
+        assert Validated(FileContent(path)).validate()
+        element = Validated(b"x" * 7000)
+        assert not element.validate()
+        assert element.errors == [u"Must be a valid value."]
+
+    def test_validate_batch(self, path):
+        Validated = List.of(BytesFile.validated_by([
+            ShorterThan(7001), MatchesRegex(b"h")
+        ]))
+        element = Validated([FileContent(path), b"hello", b"x" * 7001])
+        assert not element.validate()
+        assert [member.is_valid for member in element] == [True, True, False]
+
+
+class TestUnicodeFile(object):
+    def test_unicode(self):
+        # Encoded with the default encoding, which is ASCII on 2.x.
+        element = UnicodeFile(u"hello")
+        assert element.value.read() == u"hello"
+        element = UnicodeFile.using(encoding="utf-8")(u"hëllö")
+        assert element.value.read() == u"hëllö"
+        assert len(element.value) == 5
+
+    def test_encoding(self):
+        element = UnicodeFile.using(encoding="latin-1")(u"hëllö".encode("latin-1"))
+        assert element.value.read() == u"hëllö"
+        element = UnicodeFile.using(encoding="ascii")(u"hëllö")
+        assert element.value is NotUnserializable
+
+    def test_validate(self, path):
+        Validated = UnicodeFile.using(encoding="utf-8").validated_by([
+            LongerThan(4999), ShorterThan(5001), MatchesRegex(u"(hëllö)+$")
+        ])
+        assert Validated(TextContent(path, "utf-8")).validate()
+        assert not Validated(u"hëllö").validate()
+
+
+class TestFileContent(object):
+    def test_length_and_hexdigest(self, path):
+        data = u"hëllö".encode("utf-8") * 1000
+        content = FileContent(path)
+        assert len(content) == len(data)
+        assert content.hexdigest() == hashlib.sha256(data).hexdigest()
+        assert content.hexdigest("md5") == hashlib.md5(data).hexdigest()
+
+    def test_length_limit(self):
+        file = CountingBytesIO(b"x" * (1024 * 1024))
+        content = FileContent(file)
+        assert content.length(10) > 10
+        assert file.read_bytes == content.chunk_size
+        assert file.tell() == 0
+        assert content.length() == 1024 * 1024
+
+    def test_chunks(self, path):
+        content = FileContent(path)
+        content.chunk_size = 1024
+        chunks = list(content.chunks())
+        assert max(map(len, chunks)) == 1024
+        assert b"".join(chunks) == u"hëllö".encode("utf-8") * 1000
+
+    def test_chunks_keep_position(self):
+        content = FileContent(io.BytesIO(b"foobar"))
+        assert content.read(3) == b"foo"
+        assert len(content) == 6
+        assert content.read() == b"bar"
+
+    def test_unseekable(self):
+        content = FileContent(Unseekable(b"foobar"))
+        assert isinstance(content.source, SpooledTemporaryFile)
+        assert content.read() == b"foobar"
+        assert len(content) == 6
+
+    @pytest.mark.parametrize("make_file", [
+        io.BytesIO,
+        lambda data: SpooledTemporaryFile(max_size=1),
+        Unseekable
+    ])
+    def test_matches(self, make_file):
+        file = make_file(b"foobar")
+        if isinstance(file, SpooledTemporaryFile):
+            file.write(b"foobar")
+            file.seek(3)
+            content = FileContent(file)
+            data = b"bar"
+        else:
+            content = FileContent(file)
+            data = b"foobar"
+        assert content.matches(re.compile(data + b"$"))
+        assert not content.matches(re.compile(b"baz"))
+
+    def test_matches_empty(self, tmpdir):
+        path = tmpdir.join("empty")
+        path.write_binary(b"")
+        assert FileContent(str(path)).matches(re.compile(b"$"))
+
+    def test_text(self, path):
+        content = TextContent(path, "utf-8")
+        content.chunk_size = 7
+        chunks = list(content.chunks())
+        assert u"".join(chunks) == u"hëllö" * 1000
+        assert len(content) == 5000
+        assert content.read(5) == u"hëllö"
+        assert content.matches(re.compile(u"(hëllö)+$"))
+        assert content.matches(re.compile(b"h\xc3\xab"))
+        content.close()
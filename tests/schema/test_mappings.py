@@ -6,13 +6,17 @@
     :copyright: 2013 by Daniel Neuhäuser
     :license: BSD, see LICENSE.rst for details
 """
+import pickle
+
 import pytest
 
 from relief import (
-    Dict, OrderedDict, Unicode, Integer, NotUnserializable, Form, Element,
-    _compat
+    Dict, OrderedDict, Unicode, Integer, Unspecified, NotUnserializable, Form,
+    Element, Maybe, List, _compat
 )
 
+from relief.validation import GreaterThan, LongerThan
+
 from tests.conftest import python2_only
 from tests.schema.conftest import ElementTest
 
@@ -182,6 +186,27 @@ class TestDict(MutableMappingTest):
         assert element.raw_value == [(u"foo", 1)]
         assert element.value is NotUnserializable
 
+    def test_validate_batch(self, element_cls):
+        batches = []
+
+        class Positive(object):
+            def __call__(self, element, context):
+                return element.value > 0
+
+            def validate_batch(self, elements, context):
+                batches.append(len(elements))
+                return [element.value > 0 for element in elements]
+        Schema = element_cls.of(
+            Unicode, Integer.validated_by([Positive()])
+        )
+        element = Schema({u"foo": 1, u"bar": 0, u"baz": 2})
+        assert not element.validate()
+        assert element[u"foo"].is_valid
+        assert not element[u"bar"].is_valid
+        if not Schema.compact:
+            # Compact mappings validate entries one at a time.
+            assert batches == [3]
+
     def test_retains_ordering(self, element_cls):
         value = [
             (u"foo", 1),
@@ -200,6 +225,13 @@ class TestOrderedDict(MutableMappingTest):
     def possible_value(self):
         return _compat.OrderedDict([(u"foo", 1)])
 
+    def test_pickle_order(self, element_cls):
+        value = _compat.OrderedDict([(u"c", 1), (u"a", 2), (u"b", 3)])
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            unpickled = pickle.loads(pickle.dumps(element_cls(value), protocol))
+            assert [key.value for key in unpickled] == [u"c", u"a", u"b"]
+            assert unpickled.value == value
+
     @python2_only
     def test_has_key(self, element_cls):
         assert element_cls({u"foo": 1}).has_key(u"foo")
@@ -217,6 +249,73 @@ class TestOrderedDict(MutableMappingTest):
         assert element.value is NotUnserializable
 
 
+class TestCompactDict(TestDict):
+    @pytest.fixture
+    def element_cls(self):
+        return Dict.of(Unicode, Integer).using(compact=True)
+
+    def test_requires_scalars(self):
+        with pytest.raises(TypeError):
+            Dict.of(Unicode, Dict.of(Unicode, Integer)).using(compact=True)()
+
+    def test_creates_elements_on_demand(self, element_cls):
+        element = element_cls({u"foo": u"1", u"bar": u"2"})
+        assert element._entries == {}
+        assert element.value == {u"foo": 1, u"bar": 2}
+        assert element._entries == {}
+        assert element[u"foo"] is element[u"foo"]
+        assert element[u"foo"].raw_value == u"1"
+        assert list(element._entries) == [0]
+
+        element.set_from_native({u"foo": 1})
+        assert element[u"foo"].value == 1
+        assert element[u"foo"].raw_value == 1
+
+    def test_value_reflects_members(self, element_cls):
+        element = element_cls({u"foo": u"1", u"bar": u"2"})
+        element[u"foo"].set_from_raw(u"3")
+        assert element.value == {u"foo": 3, u"bar": 2}
+        element[u"bar"].set_from_raw(u"spam")
+        assert element.value is NotUnserializable
+        element[u"bar"].set_from_native(4)
+        assert element.value == {u"foo": 3, u"bar": 4}
+
+    def test_validate_keeps_errors(self, element_cls):
+        element_cls = Dict.of(
+            Unicode, Integer.validated_by([GreaterThan(1)])
+        ).using(compact=True)
+        element = element_cls({u"foo": 1, u"bar": 2})
+        assert not element.validate()
+        assert list(element._entries) == [0]
+        assert element[u"foo"].errors == [u"Must be greater than 1."]
+        assert not element[u"foo"].is_valid
+        assert element[u"bar"].errors == []
+        assert element[u"bar"].is_valid
+
+        element.set_from_raw({u"foo": 2})
+        assert element[u"foo"].is_valid is None
+        assert element.validate()
+
+    def test_validate_errors(self, element_cls):
+        element_cls = Dict.of(
+            Unicode, Integer.validated_by([GreaterThan(1)])
+        ).using(compact=True)
+        element = element_cls({u"foo": 1, u"bar": 2})
+        errors = []
+        assert not element.validate(errors=errors)
+        assert errors == [((u"foo", ), u"Must be greater than 1.")]
+
+
+class TestCompactOrderedDict(TestOrderedDict):
+    @pytest.fixture
+    def element_cls(self):
+        return OrderedDict.of(Unicode, Integer).using(compact=True)
+
+    def test_reversed(self, element_cls):
+        element = element_cls(_compat.OrderedDict([(u"foo", 1), (u"bar", 2)]))
+        assert [key.value for key in reversed(element)] == [u"bar", u"foo"]
+
+
 class TestForm(object):
     def test_member_schema_ordering(self):
         class Foo(Form):
@@ -408,3 +507,192 @@ class TestForm(object):
         form = Foo()
         assert form.value == {'spam': u'eggs'}
         assert form.spam.value == u'eggs'
+
+    def test_maybe_member(self):
+        form = Form.of({"spam": Maybe.of(Unicode)})()
+        assert form.value == {"spam": None}
+
+    def test_set_missing_keys(self):
+        form = Form.of({"spam": Integer, "eggs": Integer})({"spam": 1})
+        assert form.value is NotUnserializable
+
+    def test_set_additional_keys(self):
+        form = Form.of({"spam": Integer})({"spam": 1, "eggs": 2})
+        assert form.value is NotUnserializable
+
+    def test_sparse(self):
+        class Foo(Form):
+            spam = Integer
+            eggs = Integer.using(default=2)
+
+        SparseFoo = Foo.using(sparse=True)
+        form = SparseFoo({"spam": u"1"})
+        assert form.value == {"spam": 1, "eggs": 2}
+
+        form.set_from_raw({"spam": u"3", "eggs": u"4"})
+        assert form.value == {"spam": 3, "eggs": 4}
+
+        form.set_from_raw({"spam": u"5"})
+        assert form.value == {"spam": 5, "eggs": 2}
+        assert form["eggs"].raw_value == 2
+
+        form.set_from_raw({})
+        assert form["spam"].value is Unspecified
+        assert form["eggs"].value == 2
+
+        form.set_from_native({"eggs": 6})
+        assert form["spam"].value is Unspecified
+        assert form["eggs"].value == 6
+
+        form = SparseFoo({"spam": 1, "bacon": 2})
+        assert form.value is NotUnserializable
+
+        form = SparseFoo.using(strict=True)([("spam", 1)])
+        assert form.value is NotUnserializable
+
+    def test_sparse_member_set_directly(self):
+        class Foo(Form):
+            spam = Integer
+            eggs = Integer.using(default=2)
+            bacon = List.of(Integer)
+
+        form = Foo.using(sparse=True)({"spam": 1})
+        form["eggs"].set_from_raw(5)
+        form["bacon"].set_from_raw([1])
+        form["bacon"][0].set_from_raw(2)
+        form.set_from_raw({"spam": 3})
+        assert form["spam"].value == 3
+        assert form["eggs"].value == 2
+        assert form["bacon"].value is Unspecified
+
+        form["eggs"].set_from_native(6)
+        form.set_from_raw({"spam": 4})
+        assert form["eggs"].value == 2
+
+    def test_sparse_of(self):
+        form = Form.of({"spam": Integer}).using(sparse=True)({})
+        assert form["spam"].value is Unspecified
+        assert form.value is NotUnserializable
+        form.set_from_raw({"spam": 1})
+        assert form.value == {"spam": 1}
+
+    def test_validate_methods_are_not_accumulated(self):
+        calls = []
+
+        class Foo(Form):
+            spam = Unicode
+
+            def validate_spam(self, element, context):
+                calls.append(self)
+                return True
+
+        foos = [Foo({"spam": u"spam"}) for _ in range(3)]
+        assert foos[-1].validate()
+        assert calls == [foos[-1]]
+        assert Foo.member_schema["spam"] is Unicode
+
+    def test_lazy(self):
+        class Foo(Form):
+            spam = Integer
+            eggs = Integer.using(default=2)
+
+        LazyFoo = Foo.using(lazy=True)
+        form = LazyFoo()
+        assert len(form) == 2
+        assert list(form) == ["spam", "eggs"]
+        assert "spam" in form
+        assert "bacon" not in form
+        assert form._elements == {}
+
+        assert form.eggs.value == 2
+        assert form.eggs is form["eggs"]
+        assert list(form._elements) == ["eggs"]
+
+        assert form.value is NotUnserializable
+        assert not form.validate()
+        assert [element.value for element in form.values()] == [Unspecified, 2]
+
+        form = LazyFoo({"spam": u"1", "eggs": u"3"})
+        assert form.value == {"spam": 1, "eggs": 3}
+        assert form.validate()
+
+        form = LazyFoo()
+        form.set_from_raw(Unspecified)
+        assert form["eggs"].value is Unspecified
+
+        with pytest.raises(KeyError):
+            form["bacon"]
+        with pytest.raises(AttributeError):
+            form.bacon
+
+    def test_lazy_of(self):
+        form = Form.of({"spam": Integer}).using(lazy=True)()
+        assert form._elements == {}
+        assert form.spam is form["spam"]
+
+    def test_lazy_sparse(self):
+        class Foo(Form):
+            spam = Integer
+            eggs = Integer.using(default=2)
+
+        form = Foo.using(lazy=True, sparse=True)({"spam": u"1"})
+        assert list(form._elements) == ["spam"]
+        assert form.value == {"spam": 1, "eggs": 2}
+
+        form.set_from_raw(Unspecified)
+        form.set_from_raw({"eggs": u"3"})
+        assert form.value is NotUnserializable
+        assert form["spam"].value is Unspecified
+        assert form["eggs"].value == 3
+
+    def test_create_sets_elements_once(self):
+        calls = []
+
+        class Foo(Form):
+            spam = Integer.using(
+                default_factory=lambda element: calls.append(element) or 1
+            )
+
+        form = Foo()
+        assert calls == [form.spam]
+        assert form.spam.value == 1
+        assert form.value == {"spam": 1}
+
+        form.set_from_native(Unspecified)
+        assert calls == [form.spam]
+        assert form.spam.value is Unspecified
+        form.set_from_raw(Unspecified)
+        assert form.spam.value is Unspecified
+
+    def test_validate_errors(self):
+        Item = Form.of([
+            ("name", Unicode.validated_by([LongerThan(0)])),
+            ("price", Maybe.of(Integer.validated_by([GreaterThan(0)])))
+        ])
+
+        class Order(Form):
+            items = List.of(Item)
+            quantities = Dict.of(Unicode, Integer.validated_by([GreaterThan(0)]))
+
+        order = Order({
+            "items": [
+                {"name": u"spam", "price": u"1"},
+                {"name": u"", "price": u"0"},
+                {"name": u"eggs", "price": Unspecified}
+            ],
+            "quantities": {u"spam": u"1", u"eggs": u"0"}
+        })
+        errors = []
+        assert not order.validate(errors=errors)
+        assert sorted(errors) == [
+            (("items", 1, "name"), u"Must be longer than 0."),
+            (("items", 1, "price"), u"Must be greater than 0."),
+            (("quantities", u"eggs"), u"Must be greater than 0.")
+        ]
+
+        errors = []
+        order["items"][1]["name"].set_from_raw(u"ham")
+        order["items"][1]["price"].set_from_raw(u"2")
+        order["quantities"][u"eggs"].set_from_raw(u"2")
+        assert order.validate(errors=errors)
+        assert errors == []
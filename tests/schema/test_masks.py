@@ -0,0 +1,145 @@
+# coding: utf-8
+"""
+    tests.schema.test_masks
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import pytest
+
+from relief import (
+    Form, List, Dict, Maybe, Integer, Unicode, Unspecified, NotUnserializable
+)
+from relief.validation import GreaterThan, LongerThan
+from relief.schema.masks import FieldMask
+
+
+Item = Form.of([
+    ("name", Unicode.validated_by([LongerThan(0)])),
+    ("price", Maybe.of(Integer.validated_by([GreaterThan(0)])))
+])
+
+Order = Form.of([
+    ("name", Unicode.validated_by([LongerThan(0)])),
+    ("items", List.of(Item)),
+    ("tags", Dict.of(Unicode, Integer.validated_by([GreaterThan(0)])))
+])
+
+
+@pytest.fixture
+def order():
+    return Order({
+        "name": u"",
+        "items": [
+            {"name": u"spam", "price": u"0"},
+            {"name": u"", "price": u"2"}
+        ],
+        "tags": {u"foo": u"0", u"bar": u"1"}
+    })
+
+
+class TestFieldMask(object):
+    def test_validate(self, order):
+        errors = []
+        assert FieldMask(["items[0].name", "tags.bar"]).validate(
+            order, errors=errors
+        )
+        assert errors == []
+        assert order["items"][0]["name"].is_valid
+        assert order["tags"][u"bar"].is_valid
+        assert order.is_valid is None
+        assert order["name"].is_valid is None
+        assert order["items"][0]["price"].is_valid is None
+        assert order["items"][1]["name"].is_valid is None
+        assert order["tags"][u"foo"].is_valid is None
+
+    def test_validate_invalid(self, order):
+        errors = []
+        assert not FieldMask(["name", "items[*].price"]).validate(
+            order, errors=errors
+        )
+        assert sorted(errors) == [
+            (("items", 0, "price"), u"Must be greater than 0."),
+            (("name", ), u"Must be longer than 0.")
+        ]
+        assert not order["name"].is_valid
+        assert not order["items"][0]["price"].is_valid
+        assert order["items"][1]["price"].is_valid
+        assert order["items"][0]["name"].is_valid is None
+
+    def test_validate_subtree(self, order):
+        errors = []
+        assert not FieldMask(["tags", "tags.bar"]).validate(
+            order, errors=errors
+        )
+        assert errors == [(("tags", u"foo"), u"Must be greater than 0.")]
+        assert not order["tags"].is_valid
+
+    def test_validate_maybe(self):
+        element = Form.of({"item": Maybe.of(Item)})({"item": Unspecified})
+        assert FieldMask(["item.name"]).validate(element)
+
+    def test_validate_only(self, order):
+        assert order.validate(only=["items[0].name"])
+        assert order.is_valid is None
+        assert not order.validate(only=FieldMask(["items[0].price"]))
+        assert order["items"].validate(only=["[0].name"])
+        assert not order["tags"].validate(only=["foo"])
+
+    def test_set_from_raw(self, order):
+        mask = FieldMask(["name", "items[*].price", "tags.foo"])
+        mask.set_from_raw(order, {
+            "name": u"eggs",
+            "items": [{"name": u"ham", "price": u"3"}],
+            "tags": {u"foo": u"4", u"bar": u"5"},
+            "unknown": u"6"
+        })
+        assert order["name"].value == u"eggs"
+        assert order["items"][0]["price"].value == 3
+        assert order["items"][0]["name"].value == u"spam"
+        assert order["items"][1]["price"].value == 2
+        assert order["tags"][u"foo"].value == 4
+        assert order["tags"][u"bar"].value == 1
+        assert mask.validate(order)
+
+    def test_set_from_raw_containers(self):
+        Foo = Form.of([
+            ("name", Unicode),
+            ("xs", Maybe.of(List.of(Integer).using(indexed=True)))
+        ])
+        foo = Foo({"name": u"spam", "xs": [u"1", u"2"]})
+        assert foo.validate()
+        assert 2 in foo["xs"].member
+        FieldMask(["xs[1]"]).set_from_raw(foo, {"xs": [None, u"9"]})
+        assert foo["xs"].member[1].value == 9
+        assert 9 in foo["xs"].member
+        assert 2 not in foo["xs"].member
+        assert foo["xs"].raw_value == [1, 9]
+        assert foo.raw_value == {"name": u"spam", "xs": [1, 9]}
+        assert foo.is_valid is None
+        assert foo["xs"].is_valid is None
+        assert foo["xs"].member.is_valid is None
+        assert foo["name"].is_valid
+
+    def test_set_from_raw_unspecified(self):
+        Foo = Form.of([("name", Unicode), ("tags", Dict.of(Unicode, Integer))])
+        foo = Foo()
+        foo.set_from_raw(Unspecified)
+        assert foo.value is Unspecified
+        FieldMask(["name"]).set_from_raw(foo, {"name": u"spam"})
+        assert foo["name"].value == u"spam"
+        assert foo.value is NotUnserializable
+        FieldMask(["tags"]).set_from_raw(foo, {"tags": {u"foo": u"1"}})
+        assert foo.value == {"name": u"spam", "tags": {u"foo": 1}}
+
+    def test_set_from_raw_compact(self):
+        Tags = Dict.of(Unicode, Integer).using(compact=True)
+        tags = Tags({u"foo": u"1", u"bar": u"2"})
+        FieldMask(["foo"]).set_from_raw(tags, {u"foo": u"3"})
+        assert tags.value == {u"foo": 3, u"bar": 2}
+        assert tags.raw_value == {u"foo": 3, u"bar": 2}
+
+    def test_invalid_path(self):
+        with pytest.raises(ValueError):
+            FieldMask(["items..name"])
@@ -0,0 +1,109 @@
+# coding: utf-8
+"""
+    tests.schema.test_paths
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import types
+
+import pytest
+
+from relief import (
+    Form, List, Tuple, Dict, Maybe, Integer, Unicode, Unspecified, path
+)
+from relief.schema.paths import Path
+
+
+Item = Form.of([
+    ("name", Unicode),
+    ("price", Maybe.of(Integer))
+])
+
+
+Order = Form.of([
+    ("items", List.of(Item)),
+    ("tags", Dict.of(Unicode, Integer)),
+    ("pair", Tuple.of(Integer, Unicode)),
+    ("note", Maybe.of(Form.of({"text": Unicode})))
+])
+
+
+@pytest.fixture
+def order():
+    return Order({
+        "items": [
+            {"name": u"spam", "price": 1},
+            {"name": u"eggs", "price": Unspecified}
+        ],
+        "tags": {u"foo": 1, u"bar": 2},
+        "pair": (1, u"foo"),
+        "note": {"text": u"bar"}
+    })
+
+
+@pytest.fixture(params=[None, Order])
+def schema(request):
+    return request.param
+
+
+class TestPath(object):
+    def test_path(self):
+        assert isinstance(path("items"), Path)
+        assert path("items").expression == "items"
+
+    def test_element(self, order, schema):
+        assert path("items", schema).element(order) is order["items"]
+        name = order["items"][1]["name"]
+        assert path("items[1].name", schema).element(order) is name
+        assert path("items[-1].name", schema).value(order) == u"eggs"
+        assert path("tags['foo']", schema).value(order) == 1
+        assert path('tags["bar"]', schema).value(order) == 2
+        assert path("pair[1]", schema).value(order) == u"foo"
+
+    def test_element_maybe(self, order, schema):
+        assert path("note.text", schema).value(order) == u"bar"
+        assert path("items[0].price", schema).value(order) == 1
+        assert path("items[1].price", schema).value(order) is None
+
+    def test_element_wildcard(self, order, schema):
+        with pytest.raises(TypeError):
+            path("items[*].name", schema).element(order)
+
+    def test_elements(self, order, schema):
+        elements = path("items[*].name", schema).elements(order)
+        assert isinstance(elements, types.GeneratorType)
+        assert list(elements) == [
+            order["items"][0]["name"], order["items"][1]["name"]
+        ]
+        assert sorted(path("tags.*", schema).values(order)) == [1, 2]
+        assert list(path("pair[*]", schema).values(order)) == [1, u"foo"]
+        assert list(path("items.*.*", schema).values(order)) == [
+            u"spam", 1, u"eggs", None
+        ]
+        assert list(path("items[0]", schema).elements(order)) == [
+            order["items"][0]
+        ]
+
+    def test_elements_lazy(self, order, schema):
+        elements = path("items[*].name", schema).elements(order)
+        order["items"][0]["name"].set_from_native(u"ham")
+        assert next(elements).value == u"ham"
+
+    @pytest.mark.parametrize("expression", [
+        "", ".items", "items..name", "items.[0]", "items name", "items*",
+        "items[", "items['foo]"
+    ])
+    def test_invalid(self, expression):
+        with pytest.raises(ValueError):
+            path(expression)
+
+    @pytest.mark.parametrize("expression", [
+        "foo", "items.name", "items[0].foo", "pair[2]", "pair.foo",
+        "items[0].name.foo", "items[0].name[*]"
+    ])
+    def test_invalid_for_schema(self, expression):
+        path(expression)
+        with pytest.raises(ValueError):
+            path(expression, Order)
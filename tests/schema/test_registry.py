@@ -0,0 +1,154 @@
+# coding: utf-8
+"""
+    tests.schema.test_registry
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import gc
+import weakref
+
+import pytest
+
+from relief import Form, List, Dict, Integer, Unicode
+from relief.validation import ShorterThan
+from relief.schema.registry import SchemaRegistry, _describe
+from relief._compat import OrderedDict
+
+
+class TestSchemaRegistry(object):
+    def test_of(self):
+        registry = SchemaRegistry()
+        Foo = registry.of(Form, {"spam": Integer, "eggs": Unicode})
+        assert Foo.member_schema == {"spam": Integer, "eggs": Unicode}
+        assert registry.of(Form, {"spam": Integer, "eggs": Unicode}) is Foo
+        assert registry.of(Form, {"spam": Integer}) is not Foo
+        assert registry.of(List, Integer) is registry.of(List, Integer)
+        assert registry.hits == 2
+        assert registry.misses == 3
+        assert len(registry) == 3
+
+    def test_of_order(self):
+        registry = SchemaRegistry()
+        Foo = registry.of(Form, [("spam", Integer), ("eggs", Unicode)])
+        Bar = registry.of(
+            Form, OrderedDict([("eggs", Unicode), ("spam", Integer)])
+        )
+        assert list(Foo.member_schema) == ["spam", "eggs"]
+        assert list(Bar.member_schema) == ["eggs", "spam"]
+
+    def test_of_iterator(self):
+        registry = SchemaRegistry()
+        Foo = registry.of(Form, ((key, Integer) for key in ["spam", "eggs"]))
+        assert list(Foo.member_schema) == ["spam", "eggs"]
+        assert registry.of(
+            Form, ((key, Integer) for key in ["spam", "eggs"])
+        ) is Foo
+
+    def test_using(self):
+        registry = SchemaRegistry()
+        Foo = registry.using(Integer, default=1)
+        assert Foo.default == 1
+        assert registry.using(Integer, default=1) is Foo
+        assert registry.using(Integer, default=2) is not Foo
+
+    def test_eviction(self):
+        registry = SchemaRegistry(maxsize=2)
+        Foo = registry.using(Integer, default=1)
+        Bar = registry.using(Integer, default=2)
+        assert registry.using(Integer, default=1) is Foo
+        registry.using(Integer, default=3)
+        assert registry.evictions == 1
+        assert registry.using(Integer, default=1) is Foo
+        assert registry.using(Integer, default=2) is not Bar
+        assert len(registry) == 2
+
+    def test_evicted_are_collected(self):
+        registry = SchemaRegistry(maxsize=1)
+        reference = weakref.ref(registry.of(Form, {"spam": Integer}))
+        registry.of(Form, {"eggs": Integer})
+        gc.collect()
+        assert reference() is None
+
+    def test_clear(self):
+        registry = SchemaRegistry()
+        registry.using(Integer, default=1)
+        registry.using(Integer, default=1)
+        registry.clear()
+        assert len(registry) == 0
+        assert registry.hits == registry.misses == registry.evictions == 0
+
+
+def is_valid(element, context):
+    return True
+
+
+def create_form():
+    class Foo(Form):
+        spam = Integer.using(default=1)
+        eggs = Unicode.validated_by([ShorterThan(10)])
+        items = List.of(Integer)
+
+        def validate_spam(self, element, context):
+            return True
+    return Foo
+
+
+class TestDescribe(object):
+    def test_importable(self):
+        assert _describe(Integer) == (
+            "reference", "relief.schema.scalars", "Integer"
+        )
+        assert _describe(Integer) == _describe(Integer)
+        assert _describe(Integer) != _describe(Unicode)
+
+    def test_using(self):
+        assert (
+            _describe(Integer.using(default=1)) ==
+            _describe(Integer.using(default=1))
+        )
+        assert (
+            _describe(Integer.using(default=1)) !=
+            _describe(Integer.using(default=2))
+        )
+        assert _describe(Integer.using(default=1)) != _describe(Integer)
+
+    def test_of(self):
+        assert _describe(List.of(Integer)) == _describe(List.of(Integer))
+        assert _describe(List.of(Integer)) != _describe(List.of(Unicode))
+        assert (
+            _describe(Form.of({"foo": Integer, "bar": Unicode})) ==
+            _describe(Form.of({"foo": Integer, "bar": Unicode}))
+        )
+        assert (
+            _describe(Form.of({"foo": Integer})) !=
+            _describe(Form.of({"bar": Integer}))
+        )
+
+    def test_validated_by(self):
+        assert (
+            _describe(Unicode.validated_by([ShorterThan(10)])) ==
+            _describe(Unicode.validated_by([ShorterThan(10)]))
+        )
+        assert (
+            _describe(Unicode.validated_by([ShorterThan(10)])) !=
+            _describe(Unicode.validated_by([ShorterThan(11)]))
+        )
+        assert (
+            _describe(Unicode.validated_by([is_valid])) ==
+            _describe(Unicode.validated_by([is_valid]))
+        )
+
+    def test_declarative_form(self):
+        assert _describe(create_form()) == _describe(create_form())
+
+    def test_properties(self):
+        assert (
+            _describe(Dict.of(Unicode, Integer).with_properties(foo=1)) !=
+            _describe(Dict.of(Unicode, Integer).with_properties(foo=2))
+        )
+
+    def test_undescribable(self):
+        with pytest.raises(TypeError):
+            _describe(object())
@@ -7,13 +7,17 @@
     :license: BSD, see LICENSE.rst for details
 """
 import sys
+import uuid
+import decimal
+import datetime
 
 import pytest
 
 from relief import (
-    Boolean, Integer, Float, Complex, Unicode, Bytes, Unspecified, 
-    NotUnserializable
+    Boolean, Integer, Float, Complex, Decimal, Unicode, Bytes, Date, DateTime,
+    Time, UUID, Enum, Unspecified, NotUnserializable
 )
+from relief.validation import GreaterThan, pure
 
 from tests.schema.conftest import ElementTest
 
@@ -131,13 +135,28 @@ class TestInteger(ScalarTest):
 
     @pytest.mark.parametrize(("raw_value", "value"), [
         (b"1", 1),
-        (b"foo", NotUnserializable)
+        (b" 12 ", 12),
+        (b"foo", NotUnserializable),
+        (b"\xc3\xc3", NotUnserializable),
+        (
+            u"\u0661".encode("utf-8"),
+            1 if sys.version_info >= (3, 0) else NotUnserializable
+        )
     ])
     def test_value_bytes(self, raw_value, value):
         integer = Integer(raw_value)
         assert integer.raw_value == raw_value
         assert integer.value == value
 
+    def test_value_bool(self):
+        integer = Integer(True)
+        assert integer.value is True
+
+    def test_set_strict_bytes(self):
+        integer = Integer.using(strict=True)(b"1")
+        assert integer.raw_value == b"1"
+        assert integer.value is NotUnserializable
+
 
 class TestFloat(ScalarTest):
     @pytest.fixture
@@ -167,7 +186,9 @@ class TestFloat(ScalarTest):
 
     @pytest.mark.parametrize(("raw_value", "value"), [
         (b"1.0", 1.0),
-        (b"foo", NotUnserializable)
+        (b"1e3", 1000.0),
+        (b"foo", NotUnserializable),
+        (b"\xc3\xc3", NotUnserializable)
     ])
     def test_value_bytes(self, raw_value, value):
         float = Float(raw_value)
@@ -203,7 +224,9 @@ class TestComplex(ScalarTest):
 
     @pytest.mark.parametrize(("raw_value", "value"), [
         (b"1j", 1j),
-        (b"foo", NotUnserializable)
+        (b"1+2j", 1 + 2j),
+        (b"foo", NotUnserializable),
+        (b"\xc3\xc3", NotUnserializable)
     ])
     def test_value_bytes(self, raw_value, value):
         complex = Complex(raw_value)
@@ -211,6 +234,154 @@ class TestComplex(ScalarTest):
         assert complex.value == value
 
 
+class TestDecimal(ScalarTest):
+    @pytest.fixture
+    def element_cls(self):
+        return Decimal
+
+    @pytest.fixture
+    def possible_value(self):
+        return decimal.Decimal("1.50")
+
+    @pytest.fixture
+    def possible_raw_value(self):
+        return u"1.50"
+
+    @pytest.fixture
+    def invalid_value(self):
+        return u"asd"
+
+    @pytest.mark.parametrize(("raw_value", "value"), [
+        (u"1.50", decimal.Decimal("1.50")),
+        (u"foo", NotUnserializable)
+    ])
+    def test_value_unicode(self, raw_value, value):
+        element = Decimal(raw_value)
+        assert element.raw_value == raw_value
+        assert element.value == value
+
+    @pytest.mark.parametrize(("raw_value", "value"), [
+        (b"1.50", decimal.Decimal("1.50")),
+        (b"foo", NotUnserializable),
+        (b"\xc3\xc3", NotUnserializable)
+    ])
+    def test_value_bytes(self, raw_value, value):
+        element = Decimal(raw_value)
+        assert element.raw_value == raw_value
+        assert element.value == value
+
+    def test_context(self):
+        element = Decimal.using(context=decimal.Context(prec=3))(u"1.2345")
+        assert element.value == decimal.Decimal("1.23")
+
+
+class ParsedTest(ScalarTest):
+    @pytest.fixture
+    def invalid_value(self):
+        return u"asd"
+
+    def test_value_unicode(self, element_cls, possible_value, possible_raw_value):
+        element = element_cls(possible_raw_value)
+        assert element.raw_value == possible_raw_value
+        assert element.value == possible_value
+
+    def test_value_bytes(self, element_cls, possible_value, possible_raw_value):
+        raw_value = possible_raw_value.encode("ascii")
+        element = element_cls(raw_value)
+        assert element.raw_value == raw_value
+        assert element.value == possible_value
+
+    @pytest.mark.parametrize("raw_value", [
+        u"foo", b"foo", b"\xc3\xc3", 1
+    ])
+    def test_value_invalid(self, element_cls, raw_value):
+        element = element_cls(raw_value)
+        assert element.raw_value == raw_value
+        assert element.value is NotUnserializable
+
+
+class TestDate(ParsedTest):
+    @pytest.fixture
+    def element_cls(self):
+        return Date
+
+    @pytest.fixture
+    def possible_value(self):
+        return datetime.date(2013, 10, 19)
+
+    @pytest.fixture
+    def possible_raw_value(self):
+        return u"2013-10-19"
+
+    def test_value_datetime(self):
+        element = Date(datetime.datetime(2013, 10, 19))
+        assert element.value is NotUnserializable
+
+
+class TestDateTime(ParsedTest):
+    @pytest.fixture
+    def element_cls(self):
+        return DateTime
+
+    @pytest.fixture
+    def possible_value(self):
+        return datetime.datetime(2013, 10, 19, 12, 30, 15, 500)
+
+    @pytest.fixture
+    def possible_raw_value(self):
+        return u"2013-10-19T12:30:15.000500"
+
+    @pytest.mark.parametrize(("raw_value", "offset"), [
+        (u"2013-10-19T12:00:00+01:00", datetime.timedelta(hours=1)),
+        (u"2013-10-19 12:00-05:30", -datetime.timedelta(hours=5, minutes=30)),
+        (u"2013-10-19T12:00:00Z", datetime.timedelta(0))
+    ])
+    def test_value_utc_offset(self, raw_value, offset):
+        element = DateTime(raw_value)
+        assert element.value.replace(tzinfo=None) == datetime.datetime(
+            2013, 10, 19, 12
+        )
+        assert element.value.utcoffset() == offset
+
+
+class TestTime(ParsedTest):
+    @pytest.fixture
+    def element_cls(self):
+        return Time
+
+    @pytest.fixture
+    def possible_value(self):
+        return datetime.time(12, 30, 15)
+
+    @pytest.fixture
+    def possible_raw_value(self):
+        return u"12:30:15"
+
+    @pytest.mark.parametrize(("raw_value", "offset"), [
+        (u"12:30:00+00:00", datetime.timedelta(0)),
+        (u"12:30-01:00", -datetime.timedelta(hours=1)),
+        (u"12:30Z", datetime.timedelta(0))
+    ])
+    def test_value_utc_offset(self, raw_value, offset):
+        element = Time(raw_value)
+        assert element.value.replace(tzinfo=None) == datetime.time(12, 30)
+        assert element.value.utcoffset() == offset
+
+
+class TestUUID(ParsedTest):
+    @pytest.fixture
+    def element_cls(self):
+        return UUID
+
+    @pytest.fixture
+    def possible_value(self):
+        return uuid.UUID("12345678-1234-5678-1234-567812345678")
+
+    @pytest.fixture
+    def possible_raw_value(self):
+        return u"12345678-1234-5678-1234-567812345678"
+
+
 class TestUnicode(ScalarTest):
     @pytest.fixture
     def element_cls(self):
@@ -283,3 +454,158 @@ class TestBytes(ScalarTest):
             bytes = Bytes(1)
             assert bytes.raw_value == 1
             assert bytes.value == b"1"
+
+
+class TestEnum(ScalarTest):
+    @pytest.fixture
+    def element_cls(self):
+        return Enum.of({u"active": 1, u"inactive": 0})
+
+    @pytest.fixture
+    def possible_value(self):
+        return 1
+
+    @pytest.fixture
+    def possible_raw_value(self):
+        return u"active"
+
+    @pytest.fixture
+    def invalid_value(self):
+        return u"asd"
+
+    def test_of_required(self):
+        with pytest.raises(TypeError):
+            Enum()
+
+    @pytest.mark.parametrize(("raw_value", "value"), [
+        (u"active", 1),
+        (b"inactive", 0),
+        (1, 1),
+        (u"spam", NotUnserializable),
+        ([], NotUnserializable)
+    ])
+    def test_value(self, element_cls, raw_value, value):
+        element = element_cls(raw_value)
+        assert element.raw_value == raw_value
+        assert element.value == value
+
+    @pytest.mark.parametrize("strict", [False, True])
+    def test_value_type(self, strict):
+        element_cls = Enum.of({1: 1, 0: 0}).using(strict=strict)
+        assert element_cls(1).value == 1
+        assert element_cls(True).value is NotUnserializable
+        assert element_cls(False).value is NotUnserializable
+        assert element_cls(1.0).value is NotUnserializable
+
+    def test_raw_value_type(self):
+        element_cls = Enum.of({1: u"one"})
+        assert element_cls(1).value == u"one"
+        assert element_cls(u"1").value == u"one"
+        assert element_cls(True).value is NotUnserializable
+        assert element_cls(1.0).value is NotUnserializable
+
+    def test_value_is_canonical(self):
+        element_cls = Enum.of({u"active": u"ACTIVE"})
+        first = element_cls(u"active").value
+        second = element_cls(b"active").value
+        assert first == u"ACTIVE"
+        assert first is second
+
+    def test_enum(self):
+        enum = pytest.importorskip("enum")
+
+        class Status(enum.Enum):
+            active = u"a"
+            inactive = u"i"
+
+        class Level(enum.IntEnum):
+            low = 1
+            high = 2
+
+        element_cls = Enum.of(Status)
+        for raw_value in [u"a", b"a", u"active", b"active", Status.active]:
+            assert element_cls(raw_value).value is Status.active
+        assert element_cls(u"spam").value is NotUnserializable
+
+        element_cls = Enum.of(Level)
+        for raw_value in [2, u"2", b"2", u"high", Level.high]:
+            assert element_cls(raw_value).value is Level.high
+
+        element_cls = Enum.of(Status).using(strict=True)
+        assert element_cls(Status.active).value is Status.active
+        assert element_cls(u"a").value is NotUnserializable
+
+
+class TestMemoize(object):
+    def test_unserialize(self):
+        unserialized = []
+
+        class CountingInteger(Integer):
+            memoize = 2
+
+            def unserialize(self, raw_value):
+                unserialized.append(raw_value)
+                return super(CountingInteger, self).unserialize(raw_value)
+
+        for raw_value in [b"1", b"1", u"1", b"2", b"1", [1]]:
+            element = CountingInteger(raw_value)
+        assert element.value is NotUnserializable
+        assert CountingInteger(b"2").value == 2
+        # b"1" is evicted by b"2", because only two results are kept.
+        assert unserialized == [b"1", u"1", b"2", b"1", [1]]
+        info = CountingInteger.memo_info()
+        assert info.hits == 2
+        assert info.misses == 5
+        assert info.maxsize == 2
+        assert info.size == 2
+        assert info.hit_rate == 2 / 7.0
+
+        CountingInteger.clear_memo()
+        assert CountingInteger.memo_info() == (0, 0, 2, 0)
+
+    def test_validate(self):
+        validated = []
+
+        @pure
+        def is_positive(element, context):
+            validated.append(element.value)
+            if element.value > 0:
+                return True
+            element.errors.append(u"Must be positive.")
+            return False
+
+        Positive = Integer.using(memoize=10).validated_by([is_positive])
+        for raw_value in [u"1", u"1", u"-1", u"-1"]:
+            element = Positive(raw_value)
+            errors = []
+            assert element.validate(errors=errors) == (raw_value == u"1")
+        assert element.errors == [u"Must be positive."]
+        assert errors == [((), u"Must be positive.")]
+        assert validated == [1, -1]
+
+        element.set_from_native(-1)
+        assert not element.validate()
+        assert validated == [1, -1, -1]
+
+    def test_validate_impure(self):
+        validated = []
+
+        def is_positive(element, context):
+            validated.append(element.value)
+            return element.value > 0
+
+        Positive = Integer.using(memoize=10).validated_by([
+            GreaterThan(0), is_positive
+        ])
+        assert Positive(u"1").validate()
+        assert Positive(u"1").validate()
+        assert validated == [1, 1]
+
+    def test_clones(self):
+        Memoized = Integer.using(memoize=10)
+        Memoized(u"1")
+        Clone = Memoized.validated_by([GreaterThan(0)])
+        Clone(u"1")
+        assert Memoized.memo_info().misses == 1
+        assert Clone.memo_info().misses == 1
+        assert Integer.memo_info().size == 0
@@ -53,6 +53,34 @@ class SequenceTest(ElementTest):
             assert element.count(value) == count
         assert element.count(3) == 0
 
+    def test_index_range(self, element_cls, possible_value):
+        element = element_cls(possible_value)
+        for i, value in enumerate(possible_value):
+            assert element.index(value, i) == i
+            assert element.index(value, i, i + 1) == i
+            assert element.index(value, i - len(possible_value)) == i
+            with pytest.raises(ValueError):
+                element.index(value, i, i)
+
+    def test_indexed(self, element_cls, possible_value):
+        element = element_cls.using(indexed=True)(possible_value)
+        for i, value in enumerate(possible_value):
+            assert value in element
+            assert element.index(value) == possible_value.index(value)
+            assert element.index(value, i) == i
+            assert element.count(value) == possible_value.count(value)
+        assert 3 not in element
+        assert element.count(3) == 0
+        with pytest.raises(ValueError):
+            element.index(3)
+        assert [] not in element
+
+        element.set_from_raw([3] * len(possible_value))
+        assert 3 in element
+        assert element.count(3) == len(possible_value)
+        element.set_from_native(possible_value)
+        assert 3 not in element
+
     def test_validate_empty(self, element_cls):
         element = element_cls()
         assert not element.validate()
@@ -92,6 +120,21 @@ class SequenceTest(ElementTest):
         assert element.is_valid
         assert is_recursive[0]
 
+    def test_validate_member_errors(self, element_cls, possible_value):
+        element = element_cls(possible_value)
+        element[1].validators = [lambda element, context: False]
+        element[1].errors.append(u"foo")
+        errors = []
+        assert not element.validate(errors=errors)
+        assert errors == []
+
+        def invalid(element, context):
+            element.errors.append(u"bar")
+            return False
+        element[1].validators = [invalid]
+        assert not element.validate(errors=errors)
+        assert errors == [((1, ), u"bar")]
+
 
 class TestTuple(SequenceTest):
     @pytest.fixture
@@ -154,6 +197,42 @@ class TestList(SequenceTest):
             return list(request.param)
         return request.param
 
+    def test_validate_batch(self):
+        batches = []
+
+        class NotEmpty(object):
+            def __call__(self, element, context):
+                return self.validate_batch([element], context)[0]
+
+            def validate_batch(self, elements, context):
+                batches.append([element.value for element in elements])
+                results = []
+                for element in elements:
+                    results.append(bool(element.value))
+                    if not element.value:
+                        element.errors.append(u"empty")
+                return results
+
+        def not_one(element, context):
+            if element.value == 1:
+                element.errors.append(u"one")
+                return False
+            return True
+        Schema = List.of(Integer.validated_by([NotEmpty(), not_one]))
+        element = Schema([1, 0, 2, 1])
+        errors = []
+        assert not element.validate(errors=errors)
+        assert batches == [[1, 0, 2, 1]]
+        assert [child.is_valid for child in element] == [False, False, True, False]
+        assert errors == [((0, ), u"one"), ((1, ), u"empty"), ((3, ), u"one")]
+        assert element[0].errors == [u"one"]
+
+        del batches[:]
+        element = Schema([2, 3])
+        assert element.validate()
+        assert batches == [[2, 3]]
+        assert all(child.is_valid for child in element)
+
     def test_set_tuple(self):
         element = self.element_cls()((1, 2, 3))
         assert element.raw_value == (1, 2, 3)
@@ -169,6 +248,20 @@ class TestList(SequenceTest):
         assert element.raw_value == (1, 2, 3)
         assert element.value is NotUnserializable
 
+    def test_indexed_unhashable(self):
+        element = List.of(List.of(Integer)).using(indexed=True)(
+            [[1], [2], [1]]
+        )
+        assert [1] in element
+        assert element.index([1], 1) == 2
+        assert element.count([1]) == 2
+
+        element = Tuple.of(Integer, List.of(Integer)).using(indexed=True)(
+            (1, [1])
+        )
+        assert 1 in element
+        assert element.index([1]) == 1
+
     def test_setitem(self):
         element = List.of(Integer)()
         with pytest.raises(TypeError):
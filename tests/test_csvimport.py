@@ -0,0 +1,144 @@
+# coding: utf-8
+"""
+    tests.test_csvimport
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import io
+
+import pytest
+
+from relief import (
+    Form, Integer, Unicode, Unspecified, NotUnserializable, ValidationContext
+)
+from relief.validation import GreaterThan, LongerThan
+from relief.csvimport import CSVImporter, import_csv
+
+
+Person = Form.of([
+    ("name", Unicode.validated_by([LongerThan(0)])),
+    ("age", Integer.validated_by([GreaterThan(0)]))
+])
+
+
+def read(schema, content, **options):
+    return [
+        (row.line, row.element.value, row.is_valid, row.errors)
+        for row in import_csv(schema, io.StringIO(content), **options)
+    ]
+
+
+def test_import_csv():
+    assert read(Person, (
+        u"name,age\r\n"
+        u"Spam,1\r\n"
+        u"\r\n"
+        u'"Eggs\nand Ham",2\r\n'
+        u"Bacon,0\r\n"
+    )) == [
+        (2, {"name": u"Spam", "age": 1}, True, []),
+        (4, {"name": u"Eggs\nand Ham", "age": 2}, True, []),
+        (6, {"name": u"Bacon", "age": 0}, False, [
+            (("age", ), u"Must be greater than 0.")
+        ])
+    ]
+    assert read(Person, u"") == []
+    assert read(Person, u"name,age\r\n") == []
+
+
+def test_import_csv_reuse():
+    content = u"name,age\r\nSpam,0\r\nEggs,2\r\n"
+    rows = list(import_csv(Person, io.StringIO(content), reuse=False))
+    assert rows[0].element is not rows[1].element
+    assert rows[0].element.value == {"name": u"Spam", "age": 0}
+    assert rows[0].element["age"].errors == [u"Must be greater than 0."]
+
+    rows = list(import_csv(Person, io.StringIO(content)))
+    assert rows[0].element is rows[1].element
+    # Errors of previous rows are not kept.
+    assert rows[1].element["age"].errors == []
+    assert rows[1].element.value == {"name": u"Eggs", "age": 2}
+
+
+def test_import_csv_without_validation():
+    assert read(Person, u"name,age\r\nSpam,0\r\n", validate=False) == [
+        (2, {"name": u"Spam", "age": 0}, None, [])
+    ]
+
+
+def test_import_csv_dialect():
+    assert read(Person, u"name;age\nSpam;1\n", delimiter=";") == [
+        (2, {"name": u"Spam", "age": 1}, True, [])
+    ]
+
+
+def test_header():
+    importer = CSVImporter(Person, [u"id", u"years", u"name", u"note"], {
+        u"years": u"age"
+    })
+    assert importer.indices == [1, 2]
+    assert importer.names == [u"age", u"name"]
+    row = importer.import_row([u"1", u"2", u"Spam", u"..."], 2)
+    assert row.line == 2
+    assert row.element.value == {"name": u"Spam", "age": 2}
+    assert row.element.raw_value == {"name": u"Spam", "age": u"2"}
+    assert row.is_valid
+
+    with pytest.raises(ValueError):
+        CSVImporter(Person, [u"name"])
+    with pytest.raises(ValueError):
+        CSVImporter(Person, [u"name", u"age", u"years"], {u"years": u"age"})
+
+
+def test_header_sparse():
+    SparsePerson = Form.of([
+        ("name", Unicode), ("age", Integer.using(default=1))
+    ]).using(sparse=True)
+    importer = CSVImporter(SparsePerson, [u"name"])
+    row = importer.import_row([u"Spam"])
+    assert row.element.value == {"name": u"Spam", "age": 1}
+    assert row.is_valid
+
+
+@pytest.mark.parametrize("reuse", [False, True])
+def test_short_rows_sparse(reuse):
+    SparsePerson = Form.of([
+        ("name", Unicode), ("age", Integer.using(default=18))
+    ]).using(sparse=True)
+    content = u"name,age\r\na,1\r\nb\r\nc\r\n"
+    assert read(SparsePerson, content, reuse=reuse) == [
+        (2, {"name": u"a", "age": 1}, True, []),
+        (3, {"name": u"b", "age": 18}, True, []),
+        (4, {"name": u"c", "age": 18}, True, [])
+    ]
+
+
+@pytest.mark.parametrize("reuse", [False, True])
+def test_row_length(reuse):
+    importer = CSVImporter(Person, [u"name", u"age"], reuse=reuse)
+    row = importer.import_row([u"Spam", u"1", u"ignored"])
+    assert row.element.value == {"name": u"Spam", "age": 1}
+
+    row = importer.import_row([u"Spam"])
+    assert row.element.value is NotUnserializable
+    assert row.element["age"].value is Unspecified
+    assert row.element.raw_value == {"name": u"Spam"}
+    assert not row.is_valid
+
+
+def test_context():
+    calls = []
+
+    def validate(element, context):
+        calls.append(context)
+        return True
+
+    context = ValidationContext()
+    importer = CSVImporter(
+        Person.validated_by([validate]), [u"name", u"age"], context=context
+    )
+    importer.import_row([u"Spam", u"1"])
+    importer.import_row([u"Eggs", u"2"])
+    assert calls == [context, context]
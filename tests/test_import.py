@@ -0,0 +1,102 @@
+# coding: utf-8
+"""
+    tests.test_import
+    ~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import os
+import sys
+import subprocess
+
+import pytest
+
+
+#: Maximum time in seconds importing :mod:`relief` may take.
+IMPORT_BUDGET = 0.01
+
+#: Maximum time in seconds importing :mod:`relief` and using all names it
+#: provides may take.
+FULL_IMPORT_BUDGET = 0.1
+
+lazy_imports = pytest.mark.skipif(
+    sys.version_info < (3, 7),
+    reason="modules can only define __getattr__ on 3.7 and later"
+)
+
+#: The budgets depend on the machine, so they are only checked if the
+#: ``RELIEF_BENCHMARKS`` environment variable is set.
+benchmark = pytest.mark.skipif(
+    '"RELIEF_BENCHMARKS" not in os.environ',
+    reason="set RELIEF_BENCHMARKS to check import time budgets"
+)
+
+
+def run(code):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [root] + [path for path in [os.environ.get("PYTHONPATH")] if path]
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE, env=environment
+    )
+    output = process.communicate()[0]
+    assert process.returncode == 0
+    return output.decode("ascii").strip()
+
+
+def measure(code):
+    return min(float(run(
+        "from timeit import default_timer\n"
+        "start = default_timer()\n"
+        "%s\n"
+        "print(default_timer() - start)" % code
+    )) for _ in range(3))
+
+
+@lazy_imports
+def test_lazy_import():
+    modules = run(
+        "import sys, relief\n"
+        "relief.Integer\n"
+        "print(' '.join(sorted(sys.modules)))"
+    ).split()
+    assert "relief.schema.scalars" in modules
+    for module in ["relief.schema.mappings", "relief.schema.sequences",
+                   "relief.validation", "decimal", "datetime", "uuid"]:
+        assert module not in modules
+
+
+def test_deferred_imports():
+    import relief
+    assert relief.UUID(u"12345678-1234-5678-1234-567812345678").value.int == (
+        0x12345678123456781234567812345678
+    )
+    assert relief.Decimal(b"1.5").value * 2 == 3
+    assert relief.Date(u"2013-10-19").value.year == 2013
+    assert relief.Date.native_type.__name__ == "date"
+    assert relief.DateTime(u"2013-10-19T12:00").value.hour == 12
+    assert relief.Time(u"12:30").value.minute == 30
+
+
+def test_dir():
+    import relief
+    assert set(relief.__all__) <= set(dir(relief))
+
+
+@benchmark
+@lazy_imports
+def test_import_budget():
+    assert measure("import relief") < IMPORT_BUDGET
+
+
+@benchmark
+def test_full_import_budget():
+    assert measure(
+        "import relief\n"
+        "for name in relief.__all__:\n"
+        "    getattr(relief, name)"
+    ) < FULL_IMPORT_BUDGET
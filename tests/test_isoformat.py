@@ -0,0 +1,59 @@
+# coding: utf-8
+"""
+    tests.test_isoformat
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import datetime
+
+import pytest
+
+from relief import _isoformat
+
+
+UTC = _isoformat.timezone(datetime.timedelta(0))
+CET = _isoformat.timezone(datetime.timedelta(hours=1))
+
+
+# The strptime() based implementations are used before 3.7, they are tested
+# here on every version.
+@pytest.mark.parametrize(("string", "expected"), [
+    (u"2013-10-19", datetime.datetime(2013, 10, 19)),
+    (u"2013-10-19T12", datetime.datetime(2013, 10, 19, 12)),
+    (u"2013-10-19 12:30", datetime.datetime(2013, 10, 19, 12, 30)),
+    (u"2013-10-19T12:30:15.000500",
+     datetime.datetime(2013, 10, 19, 12, 30, 15, 500)),
+    (u"2013-10-19T12:00:00+01:00",
+     datetime.datetime(2013, 10, 19, 12, tzinfo=CET)),
+    (u"2013-10-19T12:00:00Z", datetime.datetime(2013, 10, 19, 12, tzinfo=UTC))
+])
+def test_strptime_datetime_fromisoformat(string, expected):
+    result = _isoformat._strptime_datetime_fromisoformat(string)
+    assert result == expected
+    assert result.utcoffset() == expected.utcoffset()
+    assert _isoformat.datetime_fromisoformat(string) == result
+
+
+@pytest.mark.parametrize(("string", "expected"), [
+    (u"12", datetime.time(12)),
+    (u"12:30:15.000500", datetime.time(12, 30, 15, 500)),
+    (u"12:30:00+00:00", datetime.time(12, 30, tzinfo=UTC)),
+    (u"12:30Z", datetime.time(12, 30, tzinfo=UTC)),
+    (u"12:30+01:00", datetime.time(12, 30, tzinfo=CET))
+])
+def test_strptime_time_fromisoformat(string, expected):
+    result = _isoformat._strptime_time_fromisoformat(string)
+    assert result == expected
+    assert result.utcoffset() == expected.utcoffset()
+    assert _isoformat.time_fromisoformat(string) == result
+
+
+@pytest.mark.parametrize("string", [
+    u"2013-10-19+01:00", u"2013-10-19T12:00+1:00", u"2013-10-19T12:00+24:00",
+    u"2013-10-19T12:00+ab:cd", u"19.10.2013"
+])
+def test_strptime_datetime_fromisoformat_invalid(string):
+    with pytest.raises(ValueError):
+        _isoformat._strptime_datetime_fromisoformat(string)
@@ -0,0 +1,200 @@
+# coding: utf-8
+"""
+    tests.test_multipart
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import io
+from tempfile import SpooledTemporaryFile
+
+import pytest
+
+from relief import (
+    Form, List, Maybe, Integer, Unicode, Bytes, BytesFile, NotUnserializable
+)
+from relief import multipart
+from relief.multipart import MultipartDecoder, decode, get_boundary
+
+
+Upload = Form.of([
+    ("title", Unicode),
+    ("count", Integer),
+    ("tags", List.of(Unicode)),
+    ("attachment", Maybe.of(BytesFile))
+])
+
+
+def make_body(parts, boundary=b"boundary"):
+    body = []
+    for name, content, filename in parts:
+        disposition = b'Content-Disposition: form-data; name="' + name + b'"'
+        if filename is not None:
+            disposition += b'; filename="' + filename + b'"'
+        body.append(b"--" + boundary + b"\r\n" + disposition + b"\r\n\r\n")
+        body.append(content + b"\r\n")
+    body.append(b"--" + boundary + b"--\r\n")
+    return b"".join(body)
+
+
+BODY = make_body([
+    (b"title", u"hëllö".encode("utf-8"), None),
+    (b"count", b"3", None),
+    (b"tags", b"a", None),
+    (b"unknown", b"ignored", None),
+    (b"tags", b"b", None),
+    (b"attachment", b"\r\n--boundar\r\n" * 100, b"spam.bin")
+])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1024 * 1024])
+def test_decode(chunk_size):
+    upload = decode(
+        Upload(), io.BytesIO(BODY), b"boundary", chunk_size=chunk_size,
+        spool_size=64
+    )
+    assert upload.title.value == u"hëllö"
+    assert upload.count.value == 3
+    assert upload.tags.value == [u"a", u"b"]
+    assert upload.attachment.value.read() == b"\r\n--boundar\r\n" * 100
+    assert upload.value is not NotUnserializable
+    assert upload.validate()
+
+
+def test_decode_spools(monkeypatch):
+    class File(SpooledTemporaryFile):
+        rolled_over = False
+
+        def rollover(self):
+            self.rolled_over = True
+            SpooledTemporaryFile.rollover(self)
+
+    monkeypatch.setattr(multipart, "SpooledTemporaryFile", File)
+    decoder = MultipartDecoder(Upload(), u"boundary", spool_size=64)
+    decoder.feed(BODY)
+    upload = decoder.close()
+    assert upload.attachment.value.source.rolled_over
+    upload = decode(Upload(), io.BytesIO(BODY), b"boundary")
+    assert not upload.attachment.value.source.rolled_over
+
+
+def test_decode_preamble_and_epilogue():
+    body = b"preamble\r\n" + make_body([(b"title", b"foo", None)]) + b"epilogue"
+    upload = decode(Upload.using(sparse=True)(), io.BytesIO(body), b"boundary")
+    assert upload.title.value == u"foo"
+    assert upload.count.value is not NotUnserializable
+
+
+def test_decode_missing_members():
+    upload = decode(
+        Upload(), io.BytesIO(make_body([(b"title", b"foo", None)])),
+        b"boundary"
+    )
+    assert upload.title.value == u"foo"
+    assert upload.value is NotUnserializable
+
+
+def test_decode_max_field_size():
+    with pytest.raises(ValueError):
+        decode(Upload(), io.BytesIO(BODY), b"boundary", max_field_size=1)
+    # File parts are not limited.
+    body = make_body([(b"attachment", b"x" * 100, b"spam.bin")])
+    upload = decode(
+        Upload.using(sparse=True)(), io.BytesIO(body), b"boundary",
+        max_field_size=1
+    )
+    assert upload.attachment.value.read() == b"x" * 100
+
+
+def test_decode_max_parts():
+    body = make_body([(b"tags", b"a", None)] * 3)
+    with pytest.raises(ValueError):
+        decode(
+            Upload.using(sparse=True)(), io.BytesIO(body), b"boundary",
+            max_parts=2
+        )
+    upload = decode(
+        Upload.using(sparse=True)(), io.BytesIO(body), b"boundary",
+        max_parts=3
+    )
+    assert upload.tags.value == [u"a"] * 3
+    # Skipped parts are counted as well.
+    body = make_body([(b"unknown", b"a", None)] * 3)
+    with pytest.raises(ValueError):
+        decode(Upload(), io.BytesIO(body), b"boundary", max_parts=2)
+
+
+def test_decode_max_header_size():
+    with pytest.raises(ValueError):
+        decode(Upload(), io.BytesIO(BODY), b"boundary", max_header_size=8)
+
+
+@pytest.mark.parametrize("body", [
+    BODY[:-10],
+    b"--boundary\r\n\r\n",
+    b"",
+])
+def test_decode_incomplete(body):
+    with pytest.raises(ValueError):
+        decode(Upload(), io.BytesIO(body), b"boundary")
+
+
+def test_decode_invalid_delimiter():
+    with pytest.raises(ValueError):
+        decode(Upload(), io.BytesIO(b"--boundaryspam\r\n"), b"boundary")
+
+
+def test_decode_bytes():
+    Attachment = Form.of({"content": Bytes})
+    body = make_body([(b"content", b"foo", b"spam.bin")])
+    attachment = decode(Attachment(), io.BytesIO(body), b"boundary")
+    assert attachment.content.value == b"foo"
+
+
+def test_decode_charset():
+    body = (
+        b"--boundary\r\n"
+        b'Content-Disposition: form-data; name="title"\r\n'
+        b"Content-Type: text/plain; charset=latin-1\r\n\r\n" +
+        u"hëllö".encode("latin-1") + b"\r\n"
+        b"--boundary--\r\n"
+    )
+    upload = decode(Upload.using(sparse=True)(), io.BytesIO(body), b"boundary")
+    assert upload.title.value == u"hëllö"
+
+    body = make_body([(b"title", u"hëllö".encode("latin-1"), None)])
+    upload = decode(
+        Upload.using(sparse=True)(), io.BytesIO(body), b"boundary",
+        encoding="latin-1"
+    )
+    assert upload.title.value == u"hëllö"
+    upload = decode(Upload.using(sparse=True)(), io.BytesIO(body), b"boundary")
+    assert upload.title.value is NotUnserializable
+
+
+def test_decode_lazy():
+    body = make_body([(b"title", b"foo", None)])
+    upload = decode(
+        Upload.using(lazy=True, sparse=True)(), io.BytesIO(body), b"boundary"
+    )
+    assert upload.title.value == u"foo"
+    assert upload.tags.value is not NotUnserializable
+
+
+@pytest.mark.parametrize(("content_type", "boundary"), [
+    ("multipart/form-data; boundary=foo", "foo"),
+    ('Multipart/Form-Data; charset=utf-8; boundary="f\\"o o"', 'f"o o'),
+])
+def test_get_boundary(content_type, boundary):
+    assert get_boundary(content_type) == boundary
+
+
+@pytest.mark.parametrize("content_type", [
+    "multipart/form-data",
+    "multipart/form-data; boundary=",
+    "application/x-www-form-urlencoded; boundary=foo"
+])
+def test_get_boundary_invalid(content_type):
+    with pytest.raises(ValueError):
+        get_boundary(content_type)
@@ -0,0 +1,153 @@
+# coding: utf-8
+"""
+    tests.test_urlencoded
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2013 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import pytest
+
+from relief import (
+    Form, List, Dict, Maybe, Integer, Unicode, Unspecified, NotUnserializable
+)
+from relief import urlencoded
+from relief.urlencoded import decode, parse
+
+
+Item = Form.of([("name", Unicode), ("price", Integer)])
+Order = Form.of([
+    ("number", Integer),
+    ("items", List.of(Item)),
+    ("tags", List.of(Unicode)),
+    ("attributes", Dict.of(Unicode, Integer)),
+    ("counts", Dict.of(Unicode, Integer).using(compact=True)),
+    ("note", Maybe.of(Unicode)),
+    ("shipping", Maybe.of(Form.of([("address", Unicode)])))
+])
+
+VALUE = {
+    "number": 1,
+    "items": [{"name": u"Spam", "price": 2}, {"name": u"Eggs", "price": 3}],
+    "tags": [u"a", u"b"],
+    "attributes": {u"x": 1},
+    "counts": {u"y": 2},
+    "note": u"hëllö wörld",
+    "shipping": {"address": u"Spam Street"}
+}
+
+
+def test_parse():
+    assert list(parse(b"a=1&b=%C3%A4+b&&c&d=")) == [
+        (u"a", u"1"), (u"b", u"ä b"), (u"c", u""), (u"d", u"")
+    ]
+    assert list(parse(u"ä=ö")) == [(u"ä", u"ö")]
+    with pytest.raises(UnicodeDecodeError):
+        list(parse(b"a=%FF"))
+
+
+def test_decode_urlencoded():
+    order = decode(Order(), (
+        b"number=1&items-1.name=Eggs&items-1.price=3&items-0.name=Spam&"
+        b"items-0.price=2&tags=a&tags=b&attributes.x=1&counts.y=2&"
+        b"note=h%C3%ABll%C3%B6+w%C3%B6rld&shipping.address=Spam+Street"
+    ))
+    assert order.value == VALUE
+    assert order.validate()
+    assert order["items"][1]["price"].raw_value == u"3"
+    # Containers get their raw value from their value.
+    assert order.raw_value == VALUE
+
+
+@pytest.mark.parametrize("data", [
+    {
+        "number": "1", "items.0.name": "Spam", "items.0.price": "2",
+        "items.1.name": "Eggs", "items.1.price": "3", "tags": ["a", "b"],
+        "attributes.x": "1", "counts.y": "2", "note": u"hëllö wörld",
+        "shipping.address": "Spam Street"
+    },
+    [
+        ("number", "1"), ("items-0.name", "Spam"), ("items-0.price", "2"),
+        ("items-1.name", "Eggs"), ("items-1.price", "3"), ("tags", "a"),
+        ("tags", "b"), ("attributes.x", "1"), ("counts.y", "2"),
+        ("note", u"hëllö wörld"), ("shipping.address", "Spam Street")
+    ]
+])
+def test_decode_pairs(data):
+    assert decode(Order(), data).value == VALUE
+
+
+def test_decode_multidict():
+    class MultiDict(dict):
+        def lists(self):
+            return self.items()
+
+    data = MultiDict(
+        number=["1"], tags=["a", "b"], **{"items-0.name": ["Spam"]}
+    )
+    order = decode(Order.using(sparse=True)(), data)
+    assert order.number.value == 1
+    assert order.tags.value == [u"a", u"b"]
+    assert [item["name"].raw_value for item in order["items"]] == [u"Spam"]
+
+
+def test_decode_sets_elements():
+    class RoutedOrder(Order.using(sparse=True)):
+        def set_from_raw(self, raw_value):
+            # Only called by the constructor.
+            assert raw_value is Unspecified
+            super(RoutedOrder, self).set_from_raw(raw_value)
+
+    order = decode(RoutedOrder(), [("number", "1"), ("items-0.price", "2")])
+    assert order.number.value == 1
+    assert order["items"][0]["price"].value == 2
+
+
+def test_decode_ignores_unknown_keys():
+    order = decode(Order.using(sparse=True)(), [
+        ("spam", "1"), ("items-0.spam", "1"), ("items.spam", "1"),
+        ("number.spam", "1"), ("items", "1"), ("number", "1")
+    ])
+    assert order.number.value == 1
+    assert order["items"].value is Unspecified
+
+
+def test_decode_incomplete():
+    order = decode(Order(), [("number", "1")])
+    assert order.value is NotUnserializable
+    order = decode(Order.using(sparse=True)(), [("number", "1")])
+    assert order.number.value == 1
+
+
+def test_decode_separators():
+    order = decode(
+        Order.using(sparse=True)(),
+        [("items_0/name", "Spam"), ("items_0/price", "2")],
+        separator=u"/", index_separator=u"_"
+    )
+    assert order["items"].value == [{"name": u"Spam", "price": 2}]
+
+
+def test_decode_nested_lists():
+    Matrix = Form.of({"rows": List.of(List.of(Integer))})
+    matrix = decode(Matrix(), [
+        ("rows-0-0", "1"), ("rows-0-1", "2"), ("rows-1", "3"), ("rows-1", "4")
+    ])
+    assert matrix.value == {"rows": [[1, 2], [3, 4]]}
+
+
+@pytest.mark.parametrize("cache_size", [urlencoded._CACHE_SIZE, 1])
+def test_decode_repeated(monkeypatch, cache_size):
+    monkeypatch.setattr(urlencoded, "_CACHE_SIZE", cache_size)
+    SparseOrder = Order.using(sparse=True)
+    for _ in range(2):
+        order = decode(SparseOrder(), [
+            ("items-0.name", "Spam"), ("items.0.price", "2"),
+            ("items-1.name", "Eggs"), ("items-0.spam", "1"), ("tags", "a")
+        ])
+        assert [item["name"].value for item in order["items"]] == [
+            u"Spam", u"Eggs"
+        ]
+        assert order["items"][0]["price"].raw_value == u"2"
+        assert order["items"][1]["price"].value is Unspecified
+        assert order.tags.value == [u"a"]
@@ -11,7 +11,10 @@ import inspect
 
 import pytest
 
-from relief.utils import class_cloner, InheritingDictDescriptor
+from relief.utils import (
+    class_cloner, hidden_attribute, imported_attribute,
+    InheritingDictDescriptor
+)
 
 
 
@@ -45,6 +48,56 @@ class TestClassCloner(object):
     def test_called_with_clone(self):
         assert self.Foo.method() is not self.Foo
 
+    def test_recipe(self):
+        clone = self.Foo.method()
+        assert clone._recipe == (self.Foo, "method", (), {})
+
+        class Bar(object):
+            @class_cloner
+            def method(cls, *args, **kwargs):
+                return cls
+        clone = Bar.method(iter([1, 2]), foo=3)
+        assert clone._recipe == (Bar, "method", ([1, 2], ), {"foo": 3})
+
+
+class TestHiddenAttribute(object):
+    class Foo(list):
+        append = hidden_attribute('append')
+
+        def add(self, item):
+            super(TestHiddenAttribute.Foo, self).append(item)
+
+    def test_instance_access(self):
+        foo = self.Foo()
+        assert not hasattr(foo, 'append')
+        with pytest.raises(AttributeError):
+            foo.append
+
+    def test_super_access(self):
+        foo = self.Foo()
+        foo.add(1)
+        assert foo == [1]
+
+    def test_class_access(self):
+        assert isinstance(self.Foo.append, hidden_attribute)
+
+
+def test_imported_attribute():
+    import textwrap
+
+    class Foo(object):
+        dedent = imported_attribute("textwrap", "dedent")
+        wrapper = imported_attribute("textwrap", "TextWrapper")
+
+    class Bar(Foo):
+        pass
+
+    assert Bar().dedent(" spam") == "spam"
+    assert Foo.__dict__["dedent"].__func__ is textwrap.dedent
+    assert "dedent" not in Bar.__dict__
+    assert Foo.wrapper is textwrap.TextWrapper
+    assert Foo.__dict__["wrapper"] is textwrap.TextWrapper
+
 
 class TestInheritingDictDescriptor(object):
     def test_class_attribute_access(self):
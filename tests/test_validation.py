@@ -9,8 +9,10 @@
 from relief.validation import (
     Present, Converted, IsTrue, IsFalse, ShorterThan, LongerThan,
     LengthWithinRange, ContainedIn, LessThan, GreaterThan, WithinRange,
-    ItemsEqual, AttributesEqual, ProbablyAnEmailAddress, MatchesRegex, IsURL
+    ItemsEqual, AttributesEqual, ProbablyAnEmailAddress, MatchesRegex, IsURL,
+    pure
 )
+from relief import Unspecified, NotUnserializable
 from relief.schema.scalars import Unicode, Integer
 from relief.schema.mappings import Dict, Form
 
@@ -220,6 +222,28 @@ def test_items_equal():
     assert dict.errors == [u"Spam and Eggs must be equal."]
 
 
+def test_items_equal_ignores_other_items():
+    validator = ItemsEqual((u"Spam", "spam"), (u"Eggs", "eggs"))
+    Schema = Form.of({"spam": Unicode, "eggs": Unicode, "other": Integer})
+    form = Schema({"spam": u"foo", "eggs": u"foo", "other": u"bar"})
+    assert validator(form, {})
+
+    form = Schema({"spam": u"foo", "eggs": Unspecified, "other": 1})
+    assert not validator(form, {})
+
+    form = Schema({"spam": u"foo", "eggs": u"foo", "other": 1})
+    form.set_from_raw("foo")
+    assert not validator(form, {})
+
+    Schema = Dict.of(Unicode, Integer)
+    element = Schema({u"spam": 1, u"eggs": 1, u"other": u"bar"})
+    assert element.value is NotUnserializable
+    assert validator(element, {})
+
+    element = Schema({u"spam": 1})
+    assert not validator(element, {})
+
+
 def test_attributes_equal():
     Validated = Form.of({"spam": Unicode, "eggs": Unicode}).validated_by(
         [AttributesEqual((u"Spam", "spam"), (u"Eggs", "eggs"))]
@@ -240,6 +264,11 @@ def test_attributes_equal():
     assert not form.validate()
     assert form.errors == [u"Spam and Eggs must be equal."]
 
+    validator = AttributesEqual((u"Spam", "spam"), (u"Eggs", "eggs"))
+    Schema = Form.of({"spam": Unicode, "eggs": Unicode, "other": Integer})
+    form = Schema({"spam": u"foo", "eggs": u"foo", "other": u"bar"})
+    assert validator(form, {})
+
 
 def test_probably_an_email_address():
     Validated = Unicode.validated_by([ProbablyAnEmailAddress()])
@@ -291,3 +320,42 @@ def test_is_url():
     element = Validated()
     assert not element.validate()
     assert element.errors == ['Must be a URL.']
+
+
+def test_validate_batch():
+    values = [
+        u"", u"a", u"abc", u"foo@example.com", u"foo@example", u"example.com",
+        u"http://example.com/", u"http://", Unspecified, NotUnserializable
+    ]
+    for validator in [
+        ShorterThan(3), LongerThan(1), LengthWithinRange(1, 4),
+        ProbablyAnEmailAddress(), MatchesRegex(u"[a-z]+$"), IsURL()
+    ]:
+        Validated = Unicode.validated_by([validator])
+        expected = []
+        elements = []
+        for value in values:
+            element = Validated()
+            element.set_from_native(value)
+            expected.append((validator(element, {}), element.errors))
+            element = Validated()
+            element.set_from_native(value)
+            elements.append(element)
+        results = validator.validate_batch(elements, {})
+        assert list(zip(results, [e.errors for e in elements])) == expected
+
+
+def test_pure():
+    for validator in [
+        Present, Converted, IsTrue, IsFalse, ShorterThan, LongerThan,
+        LengthWithinRange, ContainedIn, LessThan, GreaterThan, WithinRange,
+        ProbablyAnEmailAddress, MatchesRegex, IsURL
+    ]:
+        assert validator.pure
+    assert not ItemsEqual.pure
+    assert not AttributesEqual.pure
+
+    def validator(element, context):
+        return True
+    assert pure(validator) is validator
+    assert validator.pure